@@ -0,0 +1,117 @@
+"""
+Channel list read path: ORM hydration versus plain column rows mapped to DTOs.
+
+Needs the Postgres from `.env` migrated to head, seeded rows are rolled back.
+Run from the repository root: `python -m benchmarks.channel_reads`
+"""
+import asyncio
+import time
+
+from typing import Awaitable, Callable
+from uuid import UUID, uuid4
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import contains_eager
+
+from src.infra.converters.channels import convert_channel_dto_to_entity, convert_channel_model_to_entity
+from src.infra.database import DatabaseManager
+from src.infra.dto.channels import ChannelDTO
+from src.infra.filters.channels import GetAllChannelsInfraFilters
+from src.infra.models.channels import ChannelMembersModel, ChannelModel
+from src.infra.repositories.channels import ChannelRepository
+from src.settings.config import settings
+
+
+CHANNELS = 2_000
+ROUNDS = 20
+
+
+async def seed(connection: AsyncConnection) -> UUID:
+    """:return: oid of a profile that is a member of `CHANNELS` channels"""
+    profile_id, credentials_id = uuid4(), uuid4()
+    await connection.execute(
+        text("INSERT INTO credentials (oid, username, email, password) VALUES (:oid, :name, :email, 'hash')"),
+        {"oid": credentials_id, "name": f"bench_{profile_id}", "email": f"bench_{profile_id}@test.com"},
+    )
+    await connection.execute(
+        text("INSERT INTO profiles (oid, display_name, avatar, credentials_id) VALUES (:oid, 'bench', 'a', :credentials)"),
+        {"oid": profile_id, "credentials": credentials_id},
+    )
+    await connection.execute(text(
+        """
+        WITH channels AS (
+            INSERT INTO channels (oid, name, description, is_deleted, member_count)
+            SELECT gen_random_uuid(), 'bench ' || number, 'description', false, 1
+            FROM generate_series(1, :channels) AS number
+            RETURNING oid
+        )
+        INSERT INTO channel_members (oid, profile_id, channel_id, is_connected)
+        SELECT gen_random_uuid(), :profile, oid, true FROM channels
+        """
+    ), {"channels": CHANNELS, "profile": profile_id})
+    return profile_id
+
+
+async def orm_page(connection: AsyncConnection, profile_id: UUID) -> list:
+    """Previous read path: channel models with eagerly loaded memberships, converted to entities."""
+    stmt = (
+        select(ChannelModel)
+        .join(ChannelMembersModel, ChannelModel.profiles)
+        .where(
+            ChannelMembersModel.profile_id == profile_id,
+            ChannelMembersModel.is_connected == True,
+            ChannelModel.is_deleted == False,
+        )
+        .options(contains_eager(ChannelModel.profiles))
+        .order_by(ChannelMembersModel.created_at, ChannelMembersModel.oid)
+        .limit(CHANNELS)
+    )
+    async with AsyncSession(bind=connection) as session:
+        result = await session.execute(stmt)
+        return [convert_channel_model_to_entity(model) for model in result.unique().scalars().all()]
+
+
+async def core_page(connection: AsyncConnection, profile_id: UUID) -> list:
+    """Current read path of `ChannelRepository.get_all_channels`: column rows mapped to DTOs, then entities."""
+    stmt, _ = ChannelRepository._channels_stmt(
+        filters=GetAllChannelsInfraFilters(limit=CHANNELS, with_count=False),
+        profile_id=profile_id,
+    )
+    channel_columns = len(ChannelRepository._channel_columns)
+    result = await connection.execute(stmt)
+    return [convert_channel_dto_to_entity(ChannelDTO(*row[:channel_columns])) for row in result]
+
+
+async def measure(
+    name: str,
+    page: Callable[[AsyncConnection, UUID], Awaitable[list]],
+    connection: AsyncConnection,
+    profile_id: UUID,
+) -> None:
+    await page(connection, profile_id)
+
+    started_at = time.perf_counter()
+    rows = 0
+    for _ in range(ROUNDS):
+        rows += len(await page(connection, profile_id))
+    elapsed = time.perf_counter() - started_at
+
+    print(f"{name:<40} {rows / elapsed:>12,.0f} rows/s {elapsed / ROUNDS * 1000:>10.2f} ms/page")
+
+
+async def main() -> None:
+    database = DatabaseManager(settings())
+    async with database.engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            profile_id = await seed(connection)
+            await measure("ORM models + contains_eager", orm_page, connection, profile_id)
+            await measure("Core rows -> DTO", core_page, connection, profile_id)
+        finally:
+            await transaction.rollback()
+    await database.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
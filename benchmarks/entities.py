@@ -0,0 +1,104 @@
+"""
+Converting channel members read from the database into entities:
+validating `__dict__` dataclasses (previous layout) versus trusted slotted ones.
+
+Run from the repository root: `python -m benchmarks.entities`
+"""
+import gc
+import timeit
+import tracemalloc
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+from uuid import UUID, uuid4
+
+from src.domain.values.users import Email, Username
+from src.infra.converters.users import convert_channel_member_to_entity
+from src.infra.dto.channels import ChannelMemberDTO
+
+
+MEMBERS = 10_000
+ROUNDS = 20
+
+
+# NOTE: the previous layout of values and entities, kept here only to compare against
+@dataclass(frozen=True)
+class DictValue:
+    value: str
+
+
+@dataclass(eq=False)
+class DictCredentials:
+    username: DictValue
+    email: DictValue
+    password: None
+    oid: UUID = field(default_factory=uuid4, kw_only=True)
+
+
+@dataclass(eq=False)
+class DictProfile:
+    display_name: DictValue
+    avatar: str
+    credentials: DictCredentials
+    oid: UUID = field(default_factory=uuid4, kw_only=True)
+
+
+def validated(value_type: type, value: str) -> DictValue:
+    instance = DictValue(value)
+    value_type._validate(instance)
+    return instance
+
+
+def convert_with_validation(member: ChannelMemberDTO) -> DictProfile:
+    return DictProfile(
+        oid=member.oid,
+        display_name=validated(Username, member.display_name),
+        credentials=DictCredentials(
+            oid=member.credentials_oid,
+            username=validated(Username, member.username),
+            email=validated(Email, member.email),
+            password=None,
+        ),
+        avatar=member.avatar,
+    )
+
+
+def retained_bytes(convert: Callable, members: list[ChannelMemberDTO]) -> int:
+    """:return: bytes kept alive by the converted entities"""
+    gc.collect()
+    tracemalloc.start()
+    entities = [convert(member) for member in members]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entities
+    return size
+
+
+def main() -> None:
+    now = datetime.now(timezone.utc)
+    members = [
+        ChannelMemberDTO(
+            oid=uuid4(),
+            display_name=f"member_{number}",
+            avatar="avatar.png",
+            credentials_oid=uuid4(),
+            username=f"member_{number}",
+            email=f"member_{number}@mail.com",
+            joined_at=now,
+            membership_oid=uuid4(),
+        )
+        for number in range(MEMBERS)
+    ]
+
+    for name, convert in (
+        ("validated __dict__ entities", convert_with_validation),
+        ("trusted slotted entities", convert_channel_member_to_entity),
+    ):
+        seconds = timeit.timeit(lambda: [convert(member) for member in members], number=ROUNDS) / ROUNDS
+        size = retained_bytes(convert, members)
+        print(f"{name:<30} {seconds * 1000:>8.2f} ms / {MEMBERS} members {size / 1024:>10.0f} KiB retained")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Per-request mediator overhead: rebuilding the mediator on every request versus resolving the process-wide one.
+
+Run from the repository root: `python -m benchmarks.mediator`
+"""
+import asyncio
+import timeit
+
+from dataclasses import dataclass
+
+from src.logic.commands.base import BaseCommand, CommandHandler
+from src.logic.init.container import _build_mediator, init_container, init_mediator
+from src.logic.init.mediator import Mediator
+
+
+ROUNDS = 10_000
+
+
+@dataclass(frozen=True)
+class NoopCommand(BaseCommand):
+    ...
+
+
+@dataclass(frozen=True)
+class NoopCommandHandler(CommandHandler[NoopCommand, None]):
+    async def handle(self, command: NoopCommand) -> None:
+        return None
+
+
+def report(name: str, seconds: float, rounds: int = ROUNDS) -> None:
+    print(f"{name:<40} {seconds / rounds * 1_000_000:>10.2f} us/op")
+
+
+def main() -> None:
+    container = init_container()
+    init_mediator()
+
+    # Before: a transient registration rebuilt every handler on each `container.resolve(Mediator)`
+    report("rebuild mediator per resolve", timeit.timeit(lambda: _build_mediator(container), number=ROUNDS))
+    report("container.resolve(Mediator) singleton", timeit.timeit(lambda: container.resolve(Mediator), number=ROUNDS))
+    report("init_mediator()", timeit.timeit(init_mediator, number=ROUNDS))
+
+    mediator = Mediator()
+    mediator.register_command(command=NoopCommand, command_handlers=[NoopCommandHandler()])
+    mediator.freeze()
+    command = NoopCommand()
+
+    async def dispatch() -> None:
+        for _ in range(ROUNDS):
+            await mediator.handle_command(command)
+
+    loop = asyncio.new_event_loop()
+    report("handle_command dispatch", timeit.timeit(lambda: loop.run_until_complete(dispatch()), number=1))
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Encoding large list responses: schemas returned for FastAPI to validate again and pass through
+`jsonable_encoder` (previous handlers), schemas validated once and serialized by pydantic-core in
+`SchemaJSONResponse`, and payloads of trusted entities serialized by precompiled adapters without validation.
+
+Run from the repository root: `python -m benchmarks.responses`
+"""
+import asyncio
+import gc
+import statistics
+import time
+
+from datetime import datetime, timezone
+from typing import Iterable
+from uuid import uuid4
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.application.api.channels.schemas import GetAllChannelMembersResponse, GetAllChannelsResponseSchema
+from src.application.api.responses import SchemaJSONResponse
+from src.application.api.schemas import BaseResponseSchema
+from src.domain.entities.channels import Channel
+from src.infra.converters.channels import convert_channel_dto_to_entity
+from src.infra.converters.users import convert_channel_member_to_entity
+from src.infra.dto.channels import ChannelDTO, ChannelMemberDTO
+
+
+CHANNELS = 1_000
+MEMBERS = 5_000
+REQUESTS = 200
+
+
+# NOTE: the previous channels page schema with untyped items, kept here only to compare against
+class DictChannelsResponseSchema(BaseResponseSchema):
+    count: int | None
+    offset: int
+    limit: int
+    has_more: bool
+    next_cursor: str | None
+    items: list[dict]
+
+    @classmethod
+    def from_entity(cls, entities: Iterable[Channel]) -> "DictChannelsResponseSchema":
+        return cls(
+            count=CHANNELS,
+            offset=0,
+            limit=CHANNELS,
+            has_more=False,
+            next_cursor=None,
+            items=[
+                {
+                    "oid": entity.oid,
+                    "name": entity.name.as_generic_type(),
+                    "description": entity.description,
+                    "avatar": entity.avatar,
+                    "member_count": entity.member_count,
+                } for entity in entities
+            ],
+        )
+
+
+def build_app() -> FastAPI:
+    now = datetime.now(timezone.utc)
+    channels = [
+        convert_channel_dto_to_entity(ChannelDTO(uuid4(), f"channel {number}", "description", None, False, number))
+        for number in range(CHANNELS)
+    ]
+    members = [
+        convert_channel_member_to_entity(ChannelMemberDTO(
+            uuid4(), f"member_{number}", "avatar.png", uuid4(), f"member_{number}",
+            f"member_{number}@mail.com", now, uuid4(),
+        ))
+        for number in range(MEMBERS)
+    ]
+    app = FastAPI()
+
+    @app.get("/legacy/channels")
+    async def legacy_channels() -> DictChannelsResponseSchema:
+        return DictChannelsResponseSchema.from_entity(channels)
+
+    @app.get("/legacy/members")
+    async def legacy_members() -> GetAllChannelMembersResponse:
+        return GetAllChannelMembersResponse.from_entity(members)
+
+    @app.get("/validated/channels", response_model=GetAllChannelsResponseSchema, response_class=SchemaJSONResponse)
+    async def validated_channels() -> SchemaJSONResponse:
+        return SchemaJSONResponse(GetAllChannelsResponseSchema.from_entity(
+            count=CHANNELS, entities=channels, limit=CHANNELS, offset=0, next_cursor=None,
+        ))
+
+    @app.get("/validated/members", response_model=GetAllChannelMembersResponse, response_class=SchemaJSONResponse)
+    async def validated_members() -> SchemaJSONResponse:
+        return SchemaJSONResponse(GetAllChannelMembersResponse.from_entity(members))
+
+    @app.get("/channels", response_model=GetAllChannelsResponseSchema, response_class=SchemaJSONResponse)
+    async def get_channels() -> SchemaJSONResponse:
+        return SchemaJSONResponse(GetAllChannelsResponseSchema.serialize_entity(
+            count=CHANNELS, entities=channels, limit=CHANNELS, offset=0, next_cursor=None,
+        ))
+
+    @app.get("/members", response_model=GetAllChannelMembersResponse, response_class=SchemaJSONResponse)
+    async def get_members() -> SchemaJSONResponse:
+        return SchemaJSONResponse(GetAllChannelMembersResponse.serialize_entity(members))
+
+    return app
+
+
+async def measure(client: AsyncClient, name: str, path: str) -> None:
+    await client.get(path)
+
+    latencies = []
+    for _ in range(REQUESTS):
+        started_at = time.perf_counter()
+        response = await client.get(path)
+        latencies.append((time.perf_counter() - started_at) * 1000)
+        response.raise_for_status()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"{name:<50} p50 {percentiles[49]:>8.2f} ms   p99 {percentiles[98]:>8.2f} ms")
+
+
+async def main() -> None:
+    app = build_app()
+    # NOTE: fixtures live for the whole run, frozen so full collections do not walk them on every percentile
+    gc.collect()
+    gc.freeze()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        await measure(client, f"{CHANNELS} channels, validated again + encoder", "/legacy/channels")
+        await measure(client, f"{CHANNELS} channels, validated + SchemaJSONResponse", "/validated/channels")
+        await measure(client, f"{CHANNELS} channels, adapter + SchemaJSONResponse", "/channels")
+        await measure(client, f"{MEMBERS} members, validated again + encoder", "/legacy/members")
+        await measure(client, f"{MEMBERS} members, validated + SchemaJSONResponse", "/validated/members")
+        await measure(client, f"{MEMBERS} members, adapter + SchemaJSONResponse", "/members")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,6 +2,9 @@ from fastapi import FastAPI
 
 from src.application.api.auth.handlers import router as auth_router
 from src.application.api.channels.handlers import router as channel_router
+from src.application.api.lifespan import lifespan
+from src.application.api.metrics.handlers import router as metrics_router
+from src.application.api.timing import ServerTimingMiddleware, setup_access_log
 from src.settings.config import settings
 
 
@@ -13,9 +16,20 @@ def create_app() -> FastAPI:
 		docs_url="/api/docs",
 		debug=settings().DEBUG,
 		port=settings().API_PORT,
+		lifespan=lifespan,
 	)
 
 	app.include_router(router=auth_router, prefix="/api/v1")
 	app.include_router(router=channel_router, prefix="/api/v1")
+	# NOTE: scraped at the conventional path, outside of the versioned API
+	app.include_router(router=metrics_router)
+
+	if settings().ACCESS_LOG:
+		setup_access_log()
+	app.add_middleware(
+		ServerTimingMiddleware,
+		send_header=settings().SERVER_TIMING_HEADER,
+		log_access=settings().ACCESS_LOG,
+	)
 
 	return app
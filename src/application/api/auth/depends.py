@@ -1,10 +1,10 @@
-from typing import Container
 from fastapi import Depends, status, HTTPException, Request
 
+from src.application.api.depends import get_mediator
 from src.domain.entities.users import Profile
 from src.domain.exceptions.base import ApplicationException
+from src.infra.metrics.timing import span
 from src.logic.commands.auth import ExtractProfileFromJWTTokenCommand
-from src.logic.init.container import init_container
 from src.logic.init.mediator import Mediator
 
 
@@ -17,12 +17,11 @@ async def get_auth_token(request: Request) -> str:
 
 async def get_current_user(
 	token: str = Depends(get_auth_token),
-	container: Container = Depends(init_container),
+	mediator: Mediator = Depends(get_mediator),
 ) -> Profile:
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
-        profile, *_ = await mediator.handle_command(ExtractProfileFromJWTTokenCommand(token=token))
+        with span("auth"):
+            profile, *_ = await mediator.handle_command(ExtractProfileFromJWTTokenCommand(token=token))
     except ApplicationException:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error": "invalid credentials"})
     return profile
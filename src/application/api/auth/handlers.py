@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
-from punq import Container
 
 from src.application.api.auth.schemas import (
 	LoginRequestSchema,
@@ -8,10 +7,11 @@ from src.application.api.auth.schemas import (
 	RegisterResponseSchema,
 	RegisterRequestSchema,
 )
+from src.application.api.depends import get_mediator
 from src.application.api.schemas import ErrorSchema
 from src.domain.exceptions.base import ApplicationException
+from src.infra.exceptions.services import PasswordServiceOverloadedException
 from src.logic.commands.auth import LoginCommand, RefreshTokensCommand, RegisterCommand
-from src.logic.init.container import init_container
 from src.logic.init.mediator import Mediator
 
 
@@ -24,15 +24,14 @@ router = APIRouter(tags=["Auth"])
     description="Create a new user",
     responses={
         status.HTTP_201_CREATED: {"model": RegisterResponseSchema},
-        status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema}
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ErrorSchema},
     },
 )
 async def register(
         schema: RegisterRequestSchema,
-        container: Container = Depends(init_container),
+        mediator: Mediator = Depends(get_mediator),
 ) -> RegisterResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         profile, *_ = await mediator.handle_command(RegisterCommand(
             display_name=schema.display_name,
@@ -41,6 +40,8 @@ async def register(
             password=schema.password,
             avatar=schema.avatar,
         ))
+    except PasswordServiceOverloadedException as exception:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail={"error": exception.message})
     except ApplicationException as exception:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error": exception.message})
     return RegisterResponseSchema.from_entity(profile)
@@ -52,16 +53,15 @@ async def register(
     description="Login exists user",
     responses={
         status.HTTP_200_OK: {"model": LoginResponseSchema},
-        status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema}
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ErrorSchema},
     },
 )
 async def login(
     schema: LoginRequestSchema,
     response: Response,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ) -> LoginResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
-
     try: 
         is_email = schema.is_email()
 
@@ -77,6 +77,8 @@ async def login(
             max_age=auth_data.refresh_expires.seconds,
             httponly=True,
         )
+    except PasswordServiceOverloadedException as exception:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail={"error": exception.message})
     except ApplicationException:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error": "invalid credentials"})
     return LoginResponseSchema.from_entity(auth_data)
@@ -94,10 +96,8 @@ async def login(
 async def refresh(
     request: Request,
     response: Response,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ) -> RefreshResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         refresh = request.cookies.pop("refresh_token")
         if not refresh:
@@ -0,0 +1,43 @@
+import csv
+import io
+
+from typing import AsyncIterator
+
+from src.application.api.channels.schemas import ChannelMemberSchema
+from src.domain.entities.users import Profile
+
+
+# Rows joined into one body chunk, so the response isn't sent as one ASGI message per member
+EXPORT_CHUNK_SIZE = 500
+
+MEMBERS_CSV_FIELDS = tuple(ChannelMemberSchema.model_fields)
+
+
+async def members_to_ndjson(members: AsyncIterator[Profile]) -> AsyncIterator[str]:
+    """Encode members as JSON lines, chunk by chunk while they are fetched."""
+    chunk: list[str] = []
+    async for member in members:
+        chunk.append(ChannelMemberSchema.from_entity(member).model_dump_json())
+        chunk.append("\n")
+        if len(chunk) >= EXPORT_CHUNK_SIZE * 2:
+            yield "".join(chunk)
+            chunk.clear()
+    if chunk:
+        yield "".join(chunk)
+
+
+async def members_to_csv(members: AsyncIterator[Profile]) -> AsyncIterator[str]:
+    """Encode members as CSV with a header row, chunk by chunk while they are fetched."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=MEMBERS_CSV_FIELDS)
+    writer.writeheader()
+
+    rows = 0
+    async for member in members:
+        writer.writerow(ChannelMemberSchema.from_entity(member).model_dump())
+        rows += 1
+        if rows % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -1,19 +1,24 @@
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from punq import Container
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 
 from src.application.api.auth.depends import get_current_user
+from src.application.api.channels.exports import members_to_csv, members_to_ndjson
 from src.application.api.channels.schemas import ConnectToChannelResponseSchema, CreateChannelRequestSchema, \
     CreateChannelResponseSchema, GetAllChannelMembersResponse, GetAllChannelsFilters, GetAllChannelsResponseSchema, \
-    GetChannelByOidResponseSchema, UpdateChannelRequestSchema, UpdateChannelResponseSchema
+    GetChannelByOidResponseSchema, GetChannelMembersFilters, UpdateChannelRequestSchema, UpdateChannelResponseSchema
+from src.application.api.depends import get_mediator
+from src.application.api.responses import SchemaJSONResponse, conditional_headers, etag_matches, make_etag, \
+    not_modified
 from src.application.api.schemas import ErrorSchema
 from src.domain.exceptions.base import ApplicationException
 from src.logic.commands.channels import ConnectToChannelCommand, CreateChannelCommand, DeleteChannelCommand, \
     DisconnectFromChannelCommand, UpdateChannelCommand
-from src.logic.init.container import init_container
 from src.logic.init.mediator import Mediator
-from src.logic.queries.channels import GetAllChannelMembersQuery, GetAllChannelsQuery, GetChannelByOidQuery
+from src.logic.queries.channels import GetAllChannelMembersQuery, GetAllChannelsQuery, GetChannelByOidQuery, \
+    GetChannelVersionQuery, StreamChannelMembersQuery
 
 
 router = APIRouter(tags=["Channels"])
@@ -23,6 +28,8 @@ router = APIRouter(tags=["Channels"])
     path='/channels',
     status_code=status.HTTP_200_OK,
     description="Get all channels",
+    response_model=GetAllChannelsResponseSchema,
+    response_class=SchemaJSONResponse,
     responses={
         status.HTTP_200_OK: {"model": GetAllChannelsResponseSchema},
         status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
@@ -31,23 +38,22 @@ router = APIRouter(tags=["Channels"])
 async def get_all_channels(
     filters: GetAllChannelsFilters = Depends(),
     profile = Depends(get_current_user),
-    container: Container = Depends(init_container),
-) -> GetAllChannelsResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
-
+    mediator: Mediator = Depends(get_mediator),
+) -> SchemaJSONResponse:
     try:
-        channels, total_count = await mediator.handle_query(GetAllChannelsQuery(
-            filters=filters,
+        channels, total_count, next_cursor = await mediator.handle_query(GetAllChannelsQuery(
+            filters=filters.to_infra(),
             profile_id=profile.oid,
         ))
     except ApplicationException as exception:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error": exception.message})
-    return GetAllChannelsResponseSchema.from_entity(
+    return SchemaJSONResponse(GetAllChannelsResponseSchema.serialize_entity(
         count=total_count,
         entities=channels,
         limit=filters.limit,
         offset=filters.offset,
-    )
+        next_cursor=next_cursor,
+    ))
 
 
 @router.post(
@@ -62,10 +68,8 @@ async def get_all_channels(
 async def create_channel(
     schema: CreateChannelRequestSchema,
     profile = Depends(get_current_user),
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ) -> CreateChannelResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         channel, *_ = await mediator.handle_command(CreateChannelCommand(
 			name=schema.name,
@@ -84,20 +88,29 @@ async def create_channel(
     description="Get channel by oid",
     responses={
         status.HTTP_200_OK: {"model": GetChannelByOidResponseSchema},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Channel is unchanged since the `If-None-Match` tag"},
         status.HTTP_404_NOT_FOUND: {"model": ErrorSchema},
     },
 )
 async def get_channel_by_oid(
     channel_id: UUID,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
     profile = Depends(get_current_user),
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ) -> GetChannelByOidResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
+    # NOTE: the version is read before the channel, a concurrent change can only make the tag older than the body
+    version = await mediator.handle_query(GetChannelVersionQuery(channel_id=channel_id, profile_id=profile.oid))
+    etag = make_etag(version.updated_at, version.member_count) if version else None
+    if etag and etag_matches(if_none_match, etag):
+        return not_modified(etag)
 
     try:
         channel = await mediator.handle_query(GetChannelByOidQuery(channel_id=channel_id, profile_id=profile.oid))
     except ApplicationException as exception:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail={"error": exception.message})
+    if etag:
+        response.headers.update(conditional_headers(etag))
     return GetChannelByOidResponseSchema.from_entity(channel)
 
 
@@ -114,10 +127,8 @@ async def update_channel(
     channel_id: UUID,
     schema: UpdateChannelRequestSchema,
     _ = Depends(get_current_user),  # FIXME: Its need for protect route. Change to more useful depends without user
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ) -> UpdateChannelResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         channel, *_ = await mediator.handle_command(UpdateChannelCommand(
             channel_id=channel_id,
@@ -139,10 +150,8 @@ async def update_channel(
 async def delete_channel(
     channel_id: UUID,
     _ = Depends(get_current_user),  # FIXME: Its need for protect route. Change to more useful depends without user
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ) -> None:
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         await mediator.handle_command(DeleteChannelCommand(channel_id=channel_id))
     except ApplicationException as exception:
@@ -161,10 +170,8 @@ async def delete_channel(
 async def connect_to_channel(
     channel_id: UUID,
     profile = Depends(get_current_user),
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ) -> ConnectToChannelResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         channel, *_ = await mediator.handle_command(ConnectToChannelCommand(
             channel_id=channel_id,
@@ -184,10 +191,8 @@ async def connect_to_channel(
 async def disconnect_from_channel(
     channel_id: UUID,
     profile = Depends(get_current_user),
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ) -> None:
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         await mediator.handle_command(DisconnectFromChannelCommand(channel_id=channel_id, profile_id=profile.oid))
     except ApplicationException as exception:
@@ -197,20 +202,71 @@ async def disconnect_from_channel(
 @router.get(
     path='/channels/{channel_id}/members',
     status_code=status.HTTP_200_OK,
-    description='Get all members of channel',
+    description='Get members of channel page by page',
+    response_model=GetAllChannelMembersResponse,
+    response_class=SchemaJSONResponse,
     responses={
         status.HTTP_200_OK: {"model": GetAllChannelMembersResponse},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Members page is unchanged since the `If-None-Match` tag"},
         status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
     },
 )
 async def get_all_channel_members(
     channel_id: UUID,
-    container: Container = Depends(init_container),
-) -> None:
-    mediator: Mediator = container.resolve(Mediator)
+    filters: GetChannelMembersFilters = Depends(),
+    if_none_match: str | None = Header(default=None),
+    profile = Depends(get_current_user),
+    mediator: Mediator = Depends(get_mediator),
+) -> Response:
+    # NOTE: profiles have no update path yet, so a page changes only with joins and leaves of the channel.
+    # Outsiders get no version, so no `304`, and are refused by the members query
+    version = await mediator.handle_query(GetChannelVersionQuery(channel_id=channel_id, profile_id=profile.oid))
+    etag = None
+    if version:
+        etag = make_etag(version.member_count, version.members_updated_at, filters.limit, filters.cursor)
+    if etag and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    try:
+        members, next_cursor = await mediator.handle_query(GetAllChannelMembersQuery(
+            channel_id=channel_id,
+            filters=filters.to_infra(),
+            profile_id=profile.oid,
+        ))
+    except ApplicationException as exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error": exception.message})
+    return SchemaJSONResponse(
+        GetAllChannelMembersResponse.serialize_entity(members, next_cursor=next_cursor),
+        headers=conditional_headers(etag) if etag else None,
+    )
 
+
+@router.get(
+    path='/channels/{channel_id}/members/export',
+    status_code=status.HTTP_200_OK,
+    description='Export all members of channel as NDJSON or CSV, streamed while they are fetched',
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"application/x-ndjson": {}, "text/csv": {}}},
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+    },
+)
+async def export_channel_members(
+    channel_id: UUID,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    profile = Depends(get_current_user),
+    mediator: Mediator = Depends(get_mediator),
+) -> StreamingResponse:
+    # NOTE: the stream holds a pooled connection until it ends, `MEMBERS_EXPORT_MAX_SECONDS` and
+    # `MEMBERS_EXPORT_IDLE_SECONDS` bound how long a slow or stalled client can keep it
     try:
-        members = await mediator.handle_query(GetAllChannelMembersQuery(channel_id=channel_id))
+        members = await mediator.handle_query(StreamChannelMembersQuery(channel_id=channel_id, profile_id=profile.oid))
     except ApplicationException as exception:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"error": exception.message})
-    return GetAllChannelMembersResponse.from_entity(members)
+    if format == "csv":
+        return StreamingResponse(
+            content=members_to_csv(members),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{channel_id}-members.csv"'},
+        )
+    return StreamingResponse(content=members_to_ndjson(members), media_type="application/x-ndjson")
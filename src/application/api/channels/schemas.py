@@ -1,42 +1,141 @@
 from typing import Iterable
+from uuid import UUID
+
+from pydantic import Field, TypeAdapter
+from typing_extensions import TypedDict
+
 from src.application.api.schemas import BaseRequestSchema, BaseResponseSchema
 from src.domain.entities.channels import Channel
 from src.domain.entities.users import Profile
-from src.infra.filters.channels import GetAllChannelsInfraFilters
+from src.infra.filters.channels import ChannelsCursor, GetAllChannelsInfraFilters, GetChannelMembersInfraFilters
+from src.infra.metrics.timing import span
 
 
 class GetAllChannelsFilters(BaseRequestSchema):
-    limit: int = 10
-    offset: int = 0
+    limit: int = Field(default=10, ge=1, le=100)
+    offset: int = Field(default=0, ge=0)
+    # NOTE: `next_cursor` of the previous page, takes precedence over `offset`
+    cursor: str | None = None
+    # NOTE: exact total is skipped when false, `has_more` still tells whether the next page exists
+    with_count: bool = True
 
     def to_infra(self) -> GetAllChannelsInfraFilters:
-        return GetAllChannelsInfraFilters(limit=self.limit, offset=self.offset)
+        """:raises InvalidCursorException: if the cursor is malformed"""
+        return GetAllChannelsInfraFilters(
+            limit=self.limit,
+            offset=self.offset,
+            cursor=ChannelsCursor.decode(self.cursor) if self.cursor else None,
+            with_count=self.with_count,
+        )
+
+
+# NOTE: payloads mirror the page schemas below. Their precompiled adapters serialize plain dicts built from trusted
+# entities without validating them, while the schemas keep documenting the responses in OpenAPI
+class ChannelItemPayload(TypedDict):
+    oid: UUID
+    name: str
+    description: str | None
+    avatar: str | None
+    member_count: int
+
+
+class ChannelsPagePayload(TypedDict):
+    count: int | None
+    offset: int
+    limit: int
+    has_more: bool
+    next_cursor: str | None
+    items: list[ChannelItemPayload]
+
+
+class ChannelMemberPayload(TypedDict):
+    oid: UUID
+    display_name: str
+    username: str
+    email: str
+    avatar: str | None
+
+
+class ChannelMembersPagePayload(TypedDict):
+    has_more: bool
+    next_cursor: str | None
+    members: list[ChannelMemberPayload]
+
+
+CHANNELS_PAGE_ADAPTER = TypeAdapter(ChannelsPagePayload)
+CHANNEL_MEMBERS_PAGE_ADAPTER = TypeAdapter(ChannelMembersPagePayload)
+
+
+class ChannelItemSchema(BaseResponseSchema):
+    oid: UUID
+    name: str
+    description: str | None
+    avatar: str | None
+    member_count: int
+
+    @staticmethod
+    def fields_from_entity(entity: Channel) -> ChannelItemPayload:
+        return {
+            "oid": entity.oid,
+            "name": entity.name.as_generic_type(),
+            "description": entity.description,
+            "avatar": entity.avatar,
+            "member_count": entity.member_count,
+        }
+
+    @classmethod
+    def from_entity(cls, entity: Channel) -> "ChannelItemSchema":
+        return cls(**cls.fields_from_entity(entity))
 
 
 class GetAllChannelsResponseSchema(BaseResponseSchema):
-    count: int
+    count: int | None
     offset: int
     limit: int
-    # FIXME: replace dict to Channel + fix problem with name field
-    items: list[dict]
+    has_more: bool
+    next_cursor: str | None
+    items: list[ChannelItemSchema]
+
+    @staticmethod
+    def payload_from_entity(
+        count: int | None,
+        limit: int,
+        offset: int,
+        entities: Iterable[Channel],
+        next_cursor: ChannelsCursor | None = None,
+    ) -> ChannelsPagePayload:
+        return {
+            "count": count,
+            "offset": offset,
+            "limit": limit,
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor.encode() if next_cursor else None,
+            "items": [ChannelItemSchema.fields_from_entity(entity) for entity in entities],
+        }
 
     @classmethod
     def from_entity(
-        cls, count: int, limit: int, offset: int, entities: Iterable[Channel],
+        cls,
+        count: int | None,
+        limit: int,
+        offset: int,
+        entities: Iterable[Channel],
+        next_cursor: ChannelsCursor | None = None,
     ) -> "GetAllChannelsResponseSchema":
-        return cls(
-            count=count,
-            offset=offset,
-            limit=limit,
-            items=[
-                {
-                    "oid": entity.oid,
-                    "name": entity.name.as_generic_type(),
-                    "description": entity.description,
-                    "avatar": entity.avatar,
-                } for entity in entities
-            ],
-        )
+        return cls(**cls.payload_from_entity(count, limit, offset, entities, next_cursor))
+
+    @classmethod
+    def serialize_entity(
+        cls,
+        count: int | None,
+        limit: int,
+        offset: int,
+        entities: Iterable[Channel],
+        next_cursor: ChannelsCursor | None = None,
+    ) -> bytes:
+        """:return: JSON of the page, as `from_entity` would render it, without validating it"""
+        with span("serialize"):
+            return CHANNELS_PAGE_ADAPTER.dump_json(cls.payload_from_entity(count, limit, offset, entities, next_cursor))
 
 
 class GetChannelByOidResponseSchema(BaseResponseSchema):
@@ -44,6 +143,7 @@ class GetChannelByOidResponseSchema(BaseResponseSchema):
     name: str
     description: str | None
     avatar: str | None
+    member_count: int
 
     @classmethod
     def from_entity(cls, entity: Channel) -> "GetChannelByOidResponseSchema":
@@ -52,6 +152,7 @@ class GetChannelByOidResponseSchema(BaseResponseSchema):
             name=entity.name.as_generic_type(),
             description=entity.description,
             avatar=entity.avatar,
+            member_count=entity.member_count,
 		)
 
 
@@ -115,19 +216,67 @@ class ConnectToChannelResponseSchema(BaseResponseSchema):
         )
 
 
+class GetChannelMembersFilters(BaseRequestSchema):
+    limit: int = Field(default=50, ge=1, le=500)
+    # NOTE: `next_cursor` of the previous page
+    cursor: str | None = None
+
+    def to_infra(self) -> GetChannelMembersInfraFilters:
+        """:raises InvalidCursorException: if the cursor is malformed"""
+        return GetChannelMembersInfraFilters(
+            limit=self.limit,
+            cursor=ChannelsCursor.decode(self.cursor) if self.cursor else None,
+        )
+
+
+class ChannelMemberSchema(BaseResponseSchema):
+    oid: UUID
+    display_name: str
+    username: str
+    email: str
+    avatar: str | None
+
+    @staticmethod
+    def fields_from_entity(entity: Profile) -> ChannelMemberPayload:
+        return {
+            "oid": entity.oid,
+            "display_name": entity.display_name.as_generic_type(),
+            "username": entity.credentials.username.as_generic_type(),
+            "email": entity.credentials.email.as_generic_type(),
+            "avatar": entity.avatar,
+        }
+
+    @classmethod
+    def from_entity(cls, entity: Profile) -> "ChannelMemberSchema":
+        return cls(**cls.fields_from_entity(entity))
+
+
 class GetAllChannelMembersResponse(BaseResponseSchema):
-    members: list[dict]
+    has_more: bool
+    next_cursor: str | None
+    members: list[ChannelMemberSchema]
+
+    @staticmethod
+    def payload_from_entity(
+        entities: Iterable[Profile],
+        next_cursor: ChannelsCursor | None = None,
+    ) -> ChannelMembersPagePayload:
+        return {
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor.encode() if next_cursor else None,
+            "members": [ChannelMemberSchema.fields_from_entity(entity) for entity in entities],
+        }
 
     @classmethod
-    def from_entity(cls, entities: Iterable[Profile]) -> "GetAllChannelMembersResponse":
-        return cls(
-            members=[
-                {
-                    'oid': entity.oid,
-                    'display_name': entity.display_name.as_generic_type(),
-                    'username': entity.credentials.username.as_generic_type(),
-                    'email': entity.credentials.email.as_generic_type(),
-                    'avatar': entity.avatar,
-                } for entity in entities
-            ],
-        )
+    def from_entity(
+        cls,
+        entities: Iterable[Profile],
+        next_cursor: ChannelsCursor | None = None,
+    ) -> "GetAllChannelMembersResponse":
+        return cls(**cls.payload_from_entity(entities, next_cursor))
+
+    @classmethod
+    def serialize_entity(cls, entities: Iterable[Profile], next_cursor: ChannelsCursor | None = None) -> bytes:
+        """:return: JSON of the page, as `from_entity` would render it, without validating it"""
+        with span("serialize"):
+            return CHANNEL_MEMBERS_PAGE_ADAPTER.dump_json(cls.payload_from_entity(entities, next_cursor))
@@ -0,0 +1,10 @@
+from src.logic.init.container import init_mediator
+from src.logic.init.mediator import Mediator
+
+
+async def get_mediator() -> Mediator:
+    """
+    Resolve the process-wide mediator.
+    Declared as a coroutine so FastAPI calls it inline instead of dispatching it to the threadpool.
+    """
+    return init_mediator()
@@ -0,0 +1,33 @@
+import asyncio
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+
+from src.infra.cache.users import CredentialsCache, ProfileCache
+from src.infra.database import DatabaseManager
+from src.infra.services.passwords import BasePasswordService
+from src.logic.init.container import init_container, init_mediator
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run background tasks of the process while it serves requests."""
+    container = init_container()
+    # NOTE: keeps in-process cache tiers consistent with invalidations made by other nodes
+    listeners = [
+        asyncio.create_task(container.resolve(cache).listen_for_invalidations())
+        for cache in (ProfileCache, CredentialsCache)
+    ]
+    try:
+        yield
+    finally:
+        for listener in listeners:
+            listener.cancel()
+        await asyncio.gather(*listeners, return_exceptions=True)
+        # NOTE: side effects of commands already handled are finished before the process exits
+        await init_mediator().wait_for_background()
+        # NOTE: after background commands, which may still use the database, pooled connections are closed cleanly
+        await container.resolve(DatabaseManager).engine.dispose()
+        container.resolve(BasePasswordService).shutdown()
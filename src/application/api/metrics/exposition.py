@@ -0,0 +1,144 @@
+from typing import Iterable
+
+from src.infra.cache.channels import ChannelPageCacheStats
+from src.infra.cache.lru import CacheStats
+from src.infra.cache.tiered import TieredCache
+from src.infra.database import PoolStats
+from src.logic.init.mediator import Mediator
+from src.logic.middlewares.metrics import MetricsMiddleware
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class MetricsWriter:
+    """Builds metrics in the Prometheus text exposition format."""
+    def __init__(self) -> None:
+        self.__lines: list[str] = []
+
+    def family(self, name: str, kind: str, description: str) -> None:
+        """Start metric family of `kind` counter, gauge or summary, its samples follow."""
+        self.__lines.append(f"# HELP {name} {description}")
+        self.__lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, metric: str, value: float, **labels: str) -> None:
+        if labels:
+            pairs = ",".join(f'{label}="{self.__escape(text)}"' for label, text in labels.items())
+            metric = f"{metric}{{{pairs}}}"
+        self.__lines.append(f"{metric} {value!r}" if isinstance(value, float) else f"{metric} {value}")
+
+    def render(self) -> str:
+        return "\n".join(self.__lines) + "\n"
+
+    @staticmethod
+    def __escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def write_mediator_metrics(writer: MetricsWriter, mediator: Mediator, middleware: MetricsMiddleware) -> None:
+    requests = [
+        (request_type.__name__, "command" if request_type in mediator.commands_map else "query", metrics)
+        for request_type, metrics in middleware.metrics.items()
+    ]
+
+    writer.family("mediator_request_duration_seconds", "summary", "Time of handling commands and queries.")
+    for name, kind, metrics in requests:
+        for quantile in QUANTILES:
+            writer.sample(
+                "mediator_request_duration_seconds",
+                metrics.latency.quantile(quantile),
+                kind=kind,
+                name=name,
+                quantile=str(quantile),
+            )
+        writer.sample("mediator_request_duration_seconds_sum", metrics.latency.sum, kind=kind, name=name)
+        writer.sample("mediator_request_duration_seconds_count", metrics.latency.count, kind=kind, name=name)
+
+    writer.family("mediator_request_errors_total", "counter", "Commands and queries failed, by exception.")
+    for name, kind, metrics in requests:
+        for error, count in metrics.errors.items():
+            writer.sample("mediator_request_errors_total", count, kind=kind, name=name, error=error)
+
+    writer.family("mediator_requests_in_flight", "gauge", "Commands and queries being handled.")
+    for name, kind, metrics in requests:
+        writer.sample("mediator_requests_in_flight", metrics.in_flight, kind=kind, name=name)
+
+    writer.family("mediator_db_statements_total", "counter", "Statements sent to the database by handlers.")
+    for name, kind, metrics in requests:
+        writer.sample("mediator_db_statements_total", metrics.statements, kind=kind, name=name)
+
+    writer.family("mediator_db_rows_total", "counter", "Rows returned or changed by statements of handlers.")
+    for name, kind, metrics in requests:
+        writer.sample("mediator_db_rows_total", metrics.rows, kind=kind, name=name)
+
+    writer.family(
+        "mediator_coalesced_queries_total",
+        "counter",
+        "Queries answered by a handler call of an equal query already in progress.",
+    )
+    for query_type, stats in mediator.coalescing_stats.items():
+        writer.sample("mediator_coalesced_queries_total", stats.collapsed, name=query_type.__name__)
+
+
+def write_pool_metrics(writer: MetricsWriter, stats: PoolStats) -> None:
+    gauges = (
+        ("db_pool_size", stats.size, "Connections the pool keeps open."),
+        ("db_pool_checked_in", stats.checked_in, "Idle connections in the pool."),
+        ("db_pool_checked_out", stats.checked_out, "Connections in use."),
+        ("db_pool_overflow", stats.overflow, "Connections open above the pool size."),
+        ("db_pool_max_wait_seconds", stats.max_wait_seconds, "Longest wait for a connection."),
+    )
+    counters = (
+        ("db_pool_checkouts_total", stats.checkouts, "Connections taken from the pool."),
+        ("db_pool_timeouts_total", stats.timeouts, "Checkouts that timed out waiting for a connection."),
+        ("db_pool_wait_seconds_total", stats.total_wait_seconds, "Time spent waiting for connections."),
+    )
+    for kind, metrics in (("gauge", gauges), ("counter", counters)):
+        for name, value, description in metrics:
+            writer.family(name, kind, description)
+            writer.sample(name, value)
+
+
+def write_cache_metrics(
+    writer: MetricsWriter,
+    token_cache_stats: CacheStats,
+    tiered_caches: Iterable[TieredCache],
+    page_cache_stats: ChannelPageCacheStats,
+) -> None:
+    # NOTE: rows of (cache, tier, counter, value), the tier is where the counted lookups were answered
+    rows = _local_cache_rows("tokens", token_cache_stats)
+    for cache in tiered_caches:
+        stats = cache.stats
+        rows += _local_cache_rows(cache.namespace, stats.local)
+        rows += [
+            (cache.namespace, "local", "collapsed", stats.collapsed),
+            (cache.namespace, "local", "invalidations", stats.invalidations),
+            (cache.namespace, "remote", "hits", stats.remote_hits),
+            (cache.namespace, "remote", "misses", stats.remote_misses),
+            (cache.namespace, "remote", "errors", stats.remote_errors),
+            (cache.namespace, "remote", "early_refreshes", stats.early_refreshes),
+            (cache.namespace, "remote", "loads", stats.loads),
+        ]
+    rows += [
+        ("channel_pages", "remote", "hits", page_cache_stats.hits),
+        ("channel_pages", "remote", "misses", page_cache_stats.misses),
+        ("channel_pages", "remote", "stale", page_cache_stats.stale),
+        ("channel_pages", "remote", "errors", page_cache_stats.errors),
+    ]
+
+    for counter in dict.fromkeys(row[2] for row in rows):
+        name = f"cache_{counter}_total"
+        writer.family(name, "counter", f"Cache {counter.replace('_', ' ')}, by cache and tier.")
+        for cache_name, tier, row_counter, value in rows:
+            if row_counter == counter:
+                writer.sample(name, value, cache=cache_name, tier=tier)
+
+
+def _local_cache_rows(cache_name: str, stats: CacheStats) -> list[tuple[str, str, str, int]]:
+    return [
+        (cache_name, "local", "hits", stats.hits),
+        (cache_name, "local", "misses", stats.misses),
+        (cache_name, "local", "evictions", stats.evictions),
+        (cache_name, "local", "expirations", stats.expirations),
+    ]
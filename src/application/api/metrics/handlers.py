@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Response, status
+
+from src.application.api.depends import get_mediator
+from src.application.api.metrics.exposition import CONTENT_TYPE, MetricsWriter, write_cache_metrics, \
+    write_mediator_metrics, write_pool_metrics
+from src.infra.cache.channels import ChannelPageCache
+from src.infra.cache.tokens import ProfileTokenCache
+from src.infra.cache.users import CredentialsCache, ProfileCache
+from src.infra.database import DatabaseManager
+from src.logic.init.container import init_container
+from src.logic.init.mediator import Mediator
+from src.logic.middlewares.metrics import MetricsMiddleware
+
+
+router = APIRouter(tags=["Monitoring"])
+
+
+@router.get(
+    path="/metrics",
+    status_code=status.HTTP_200_OK,
+    description="Metrics of the process in the Prometheus text format",
+    response_class=Response,
+    include_in_schema=False,
+)
+async def get_metrics(mediator: Mediator = Depends(get_mediator)) -> Response:
+    container = init_container()
+    writer = MetricsWriter()
+
+    write_mediator_metrics(writer, mediator, container.resolve(MetricsMiddleware))
+    write_pool_metrics(writer, container.resolve(DatabaseManager).get_pool_stats())
+    write_cache_metrics(
+        writer,
+        token_cache_stats=container.resolve(ProfileTokenCache).stats,
+        tiered_caches=(container.resolve(ProfileCache), container.resolve(CredentialsCache)),
+        page_cache_stats=container.resolve(ChannelPageCache).stats,
+    )
+
+    return Response(content=writer.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,54 @@
+import hashlib
+
+from typing import Any
+
+from fastapi import Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from src.infra.metrics.timing import span
+
+
+# NOTE: clients may keep responses but must revalidate them with `If-None-Match` before reuse
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+
+class SchemaJSONResponse(JSONResponse):
+    """
+    JSON response rendered straight from a response schema by its precompiled pydantic-core serializer.
+    Returned from an endpoint, it skips FastAPI validation of the return value and `jsonable_encoder`,
+    so the schema is validated only once, when the endpoint builds it.
+    Content may also be JSON already serialized from trusted data, by a precompiled `TypeAdapter`.
+    Declare `response_model` on the route to keep the OpenAPI schema.
+    """
+    def render(self, content: Any) -> bytes:
+        # NOTE: already serialized content is timed where it was serialized
+        if isinstance(content, bytes):
+            return content
+        with span("serialize"):
+            if isinstance(content, BaseModel):
+                return content.__pydantic_serializer__.to_json(content)
+            return super().render(content)
+
+
+def make_etag(*parts: Any) -> str:
+    """:return: strong entity tag of the representation identified by `parts`"""
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode("utf-8"), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Compare `If-None-Match` header with `etag` by the weak comparison, as RFC 9110 requires for it."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def conditional_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=conditional_headers(etag))
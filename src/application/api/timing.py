@@ -0,0 +1,80 @@
+import json
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infra.metrics.queries import QueryCount, count_queries
+from src.infra.metrics.timing import RequestTimings, request_timings
+
+
+access_logger = logging.getLogger("communet.access")
+
+
+def format_server_timing(timings: RequestTimings) -> str:
+    """:return: value of `Server-Timing` header, phases may overlap (auth includes its db and redis time)"""
+    metrics = [f"app;dur={timings.elapsed() * 1000:.2f}"]
+    for phase, timing in timings.phases.items():
+        metrics.append(f'{phase};dur={timing.seconds * 1000:.2f};desc="{timing.count}x"')
+    return ", ".join(metrics)
+
+
+class ServerTimingMiddleware:
+    """
+    Times every HTTP request by phases recorded with `span` and `timed` while it is handled.
+    Sends them in `Server-Timing` header, readable in browser devtools, and writes an access log line
+    in JSON once the response is sent, with the time of the whole response including its body.
+    Pure ASGI, so it runs in the task of the request and doesn't buffer streamed responses.
+    """
+    def __init__(self, app: ASGIApp, send_header: bool, log_access: bool) -> None:
+        self.app = app
+        self.send_header = send_header
+        self.log_access = log_access
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        with request_timings() as timings, count_queries() as queries:
+            async def send_with_timings(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    if self.send_header:
+                        MutableHeaders(scope=message).append("Server-Timing", format_server_timing(timings))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timings)
+            finally:
+                if self.log_access:
+                    self.__log(scope, status_code, timings, queries)
+
+    @staticmethod
+    def __log(scope: Scope, status_code: int, timings: RequestTimings, queries: QueryCount) -> None:
+        record = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "duration_ms": round(timings.elapsed() * 1000, 2),
+            "phases": {
+                phase: {"duration_ms": round(timing.seconds * 1000, 2), "count": timing.count}
+                for phase, timing in timings.phases.items()
+            },
+            "db_statements": queries.statements,
+            "db_rows": queries.rows,
+        }
+        access_logger.info(json.dumps(record, separators=(",", ":")), extra={"access": record})
+
+
+def setup_access_log() -> None:
+    """Write access log lines to stderr unless the logging configuration of the process handles them."""
+    if access_logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    access_logger.addHandler(handler)
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from uuid import UUID, uuid4
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseEntity(ABC):
     """Base entity with common attributes and methods"""
     oid: UUID = field(
@@ -6,7 +6,7 @@ from src.domain.entities.base import BaseEntity
 from src.domain.values.channels import ChannelName
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class Channel(BaseEntity):
     name: ChannelName
     description: str | None
@@ -18,6 +18,10 @@ class Channel(BaseEntity):
         default=False,
         kw_only=True,
     ) 
+    member_count: int = field(
+        default=0,
+        kw_only=True,
+    )
 
     @classmethod
     def create(
@@ -6,26 +6,27 @@ from src.domain.entities.base import BaseEntity
 from src.domain.values.users import Email, Password, Username
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class Credentials(BaseEntity):
     username: Username
     email: Email
     password: Password
 
     @classmethod
-    def create(cls, username: str, email: str, password: str,) -> "Credentials":
+    def create(cls, username: str, email: str, password: str | Password) -> "Credentials":
         """
         Method for create credentials entity and register events.
+        :param password: raw password to hash or already hashed `Password` instance.
         :return: instance of this class
         """
         return cls(
             username=Username(username),
             email=Email(email),
-            password=Password(password),
+            password=password if isinstance(password, Password) else Password(password),
         )
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class Profile(BaseEntity):
     display_name: Username
     avatar: str
@@ -48,7 +49,7 @@ class Profile(BaseEntity):
         return profile
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class AuthData(BaseEntity):
     access_token: str
     refresh_token: str
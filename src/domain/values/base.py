@@ -6,7 +6,7 @@ from typing import Generic, TypeVar
 VT = TypeVar("VT")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BaseValue(ABC, Generic[VT]):
     """Base value object with common methods"""
     value: VT
@@ -15,6 +15,16 @@ class BaseValue(ABC, Generic[VT]):
         """Calls after __init__ method"""
         self._validate()
 
+    @classmethod
+    def trusted(cls, value: VT) -> "BaseValue[VT]":
+        """
+        Wrap a value which was validated before it was stored (e.g. read from the database), skipping validation.
+        :return: instance of this class
+        """
+        instance = object.__new__(cls)
+        _set_value(instance, value)
+        return instance
+
     def as_generic_type(self) -> VT:
         """Return value as type which was specified in generic"""
         return self.value
@@ -23,3 +33,7 @@ class BaseValue(ABC, Generic[VT]):
     def _validate(self) -> None:
         """Validate the field for correctness"""
         ...
+
+
+# NOTE: setter of the `value` slot, fills frozen instances without going through `object.__setattr__`
+_set_value = BaseValue.value.__set__
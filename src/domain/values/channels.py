@@ -8,7 +8,7 @@ from src.domain.exceptions.channels import (
 from src.domain.values.base import BaseValue
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ChannelName(BaseValue[str]):
     def _validate(self) -> None:
         min_len = 3
@@ -15,7 +15,10 @@ from src.domain.exceptions.users import (
 from src.domain.values.base import BaseValue
 
 
-@dataclass(frozen=True)
+EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b")
+
+
+@dataclass(frozen=True, slots=True)
 class Username(BaseValue[str]):
     """
     Value object for username.
@@ -35,7 +38,7 @@ class Username(BaseValue[str]):
             raise UsernameTooLongException(max_len)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Email(BaseValue[str]):
     """
     Value object for email.
@@ -44,16 +47,14 @@ class Email(BaseValue[str]):
     """
     def _validate(self) -> None:
         """This method will be calls in `__post_init__` method"""
-        pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b"
-
         if not self.value:
             raise EmailEmptyException()
 
-        if not re.fullmatch(pattern, self.value):
+        if not EMAIL_PATTERN.fullmatch(self.value):
             raise EmailInvalidFormatException()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Password(BaseValue[str]):
     """
     Value object for password.
@@ -63,9 +64,18 @@ class Password(BaseValue[str]):
     def __post_init__(self) -> None:
         """validate and hash password after initializing"""
         self._validate(self.value)
-        object.__setattr__(self, 'value', self._hash_password(self.value))
+        object.__setattr__(self, 'value', self.hash_password(self.value))
 
-    def _hash_password(self, password: str) -> str:
+    @classmethod
+    def from_hash(cls, hashed_password: str) -> "Password":
+        """
+        Wrap a password which was already validated and hashed (e.g. in a worker pool),
+        skipping validation and hashing.
+        """
+        return cls.trusted(hashed_password)
+
+    @staticmethod
+    def hash_password(password: str) -> str:
         """:return: hashed password in string type"""
         salt = bcrypt.gensalt()
         hashed_password = bcrypt.hashpw(password.encode("utf-8"), salt)
@@ -79,11 +89,16 @@ class Password(BaseValue[str]):
         """
         return bcrypt.checkpw(password1.encode("utf-8"), password2.encode("utf-8"))
 
-    def _validate(self, value: str) -> None:
-        """This method will be calls in `__post_init__` method"""
+    @staticmethod
+    def validate(value: str) -> None:
+        """Check a raw password before hashing it"""
         min_len = 8
 
         if not value:
             raise PasswordEmptyException()
         if len(value) <= min_len:
             raise PasswordTooShortException(min_len)
+
+    def _validate(self, value: str) -> None:
+        """This method will be calls in `__post_init__` method"""
+        self.validate(value)
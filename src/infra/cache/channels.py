@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Awaitable, Callable, Optional, Sequence
+from uuid import UUID
+
+from pydantic import TypeAdapter, ValidationError
+from redis.exceptions import RedisError
+
+from src.infra.dto.channels import ChannelDTO
+from src.infra.filters.channels import ChannelsCursor, GetAllChannelsInfraFilters
+from src.infra.services.redis import BaseRedisService
+from src.settings.config import Settings
+
+
+ChannelsPage = tuple[Sequence[ChannelDTO], Optional[int], Optional[ChannelsCursor]]
+
+SEQUENCE_KEY = "channels:sequence"
+DELETIONS_KEY = "channels:generation:deletions"
+
+
+@dataclass
+class ChannelPageCacheStats:
+    """Counters of page lookups for monitoring."""
+    hits: int = 0
+    misses: int = 0
+    # NOTE: pages found but showing a channel changed since they were read
+    stale: int = 0
+    errors: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class _CachedPage:
+    channels: list[ChannelDTO]
+    count: Optional[int]
+    next_cursor: Optional[ChannelsCursor]
+    # NOTE: value of the change sequence taken before the page was read from the database
+    sequence: int
+
+
+class ChannelPageCache:
+    """
+    Pages of channels of a profile kept in Redis until anything they show changes, without key scans.
+
+    Every change takes the next value of a single sequence and stamps it on what it changed
+    (the profile's membership generation, the channel, the deletions generation). A page is stored under
+    the membership and deletions generations of its profile and the filters, so joins, leaves and deletions
+    (which also shift offsets and the total) move readers to new keys. It also remembers the sequence read
+    before its query: the page is served only while none of its channels has a later stamp, which covers
+    renames and member counts changed by other profiles, even if they commit while the page is being read.
+
+    Stamps are taken after commits. Generation keys have no expiration, Redis must not evict them
+    (`noeviction` or a `volatile-*` policy, pages expire after `ttl`).
+    Redis errors degrade to reading the database, a failed stamp leaves pages stale for at most `ttl`.
+    """
+    def __init__(self, config: Settings, redis_service: BaseRedisService) -> None:
+        self.__redis = redis_service
+        self.__ttl = timedelta(seconds=config.CHANNEL_PAGE_CACHE_TTL_SECONDS)
+        self.__adapter = TypeAdapter(_CachedPage)
+        self.stats = ChannelPageCacheStats()
+
+    async def get_or_load(
+        self,
+        profile_id: UUID,
+        filters: GetAllChannelsInfraFilters,
+        load: Callable[[], Awaitable[ChannelsPage]],
+    ) -> ChannelsPage:
+        try:
+            sequence, membership, deletions = await self.__redis.get_many(
+                [SEQUENCE_KEY, self.__membership_key(profile_id), DELETIONS_KEY],
+            )
+            page_key = f"channels:page:{profile_id}:{membership or 0}:{deletions or 0}:{self.__filters_key(filters)}"
+            page = await self.__get_fresh(page_key)
+        except RedisError:
+            self.stats.errors += 1
+            return await load()
+
+        if page is not None:
+            self.stats.hits += 1
+            return page.channels, page.count, page.next_cursor
+
+        channels, count, next_cursor = await load()
+        page = _CachedPage(list(channels), count, next_cursor, int(sequence or 0))
+        try:
+            await self.__redis.set(page_key, self.__adapter.dump_json(page).decode("utf-8"), self.__ttl)
+        except RedisError:
+            self.stats.errors += 1
+        return channels, count, next_cursor
+
+    async def bump_membership(self, profile_id: UUID, channel_id: UUID) -> None:
+        """The profile joined or left the channel, its member count changed too."""
+        await self.__stamp(self.__membership_key(profile_id), self.__channel_key(channel_id))
+
+    async def bump_channel(self, channel_id: UUID) -> None:
+        """Columns of the channel shown in pages changed."""
+        await self.__stamp(self.__channel_key(channel_id))
+
+    async def bump_deletion(self, channel_id: UUID) -> None:
+        """The channel was deleted, every page after it shifts."""
+        await self.__stamp(DELETIONS_KEY, self.__channel_key(channel_id))
+
+    async def __get_fresh(self, page_key: str) -> Optional[_CachedPage]:
+        payload = await self.__redis.get(page_key)
+        if not payload:
+            self.stats.misses += 1
+            return None
+        try:
+            page = self.__adapter.validate_json(payload)
+        except ValidationError:
+            self.stats.misses += 1
+            return None
+
+        if page.channels:
+            stamps = await self.__redis.get_many([self.__channel_key(channel.oid) for channel in page.channels])
+            if any(stamp and int(stamp) > page.sequence for stamp in stamps):
+                self.stats.stale += 1
+                return None
+        return page
+
+    async def __stamp(self, *keys: str) -> None:
+        try:
+            await self.__redis.stamp(SEQUENCE_KEY, keys)
+        except RedisError:
+            self.stats.errors += 1
+
+    @staticmethod
+    def __filters_key(filters: GetAllChannelsInfraFilters) -> str:
+        if filters.cursor:
+            return f"{filters.limit}:cursor:{filters.cursor.encode()}:{int(filters.with_count)}"
+        return f"{filters.limit}:offset:{filters.offset}:{int(filters.with_count)}"
+
+    @staticmethod
+    def __membership_key(profile_id: UUID) -> str:
+        return f"channels:generation:profile:{profile_id}"
+
+    @staticmethod
+    def __channel_key(channel_id: UUID) -> str:
+        return f"channels:generation:channel:{channel_id}"
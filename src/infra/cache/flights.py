@@ -0,0 +1,63 @@
+import asyncio
+
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+
+KT = TypeVar("KT", bound=Hashable)
+VT = TypeVar("VT")
+
+
+@dataclass
+class FlightStats:
+    """Counters of calls for monitoring."""
+    calls: int = 0
+    # NOTE: calls that waited for a call of the same key already in progress instead of starting their own
+    collapsed: int = 0
+
+
+class SingleFlight(Generic[KT, VT]):
+    """
+    Runs at most one call per key at a time, concurrent callers of the same key share its result or exception.
+    Results are shared objects, callers must treat them as read-only.
+    Flights are futures of the running event loop: mediator coalescing and `TieredCache` call it from request tasks
+    of the app loop, a caller on another loop or thread couldn't await them.
+    """
+    def __init__(self) -> None:
+        self.__flights: dict[KT, asyncio.Future] = {}
+        self.stats = FlightStats()
+
+    def __len__(self) -> int:
+        """:return: number of calls in progress"""
+        return len(self.__flights)
+
+    async def run(self, key: KT, call: Callable[[], Awaitable[VT]]) -> VT:
+        self.stats.calls += 1
+        flight = self.__flights.get(key)
+        if flight is not None:
+            self.stats.collapsed += 1
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                # NOTE: the running caller was cancelled, not this one, so the call is started over
+                if not flight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                return await self.run(key, call)
+
+        flight = asyncio.get_running_loop().create_future()
+        self.__flights[key] = flight
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as exception:
+            flight.set_exception(exception)
+            # NOTE: marks the exception retrieved, there may be no waiters
+            flight.exception()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self.__flights[key]
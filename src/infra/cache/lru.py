@@ -0,0 +1,87 @@
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+
+KT = TypeVar("KT", bound=Hashable)
+VT = TypeVar("VT")
+
+
+@dataclass
+class CacheStats:
+    """Counters of cache lookups for monitoring."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache(Generic[KT, VT]):
+    """
+    Bounded in-process cache with least recently used eviction and per-entry expiration.
+    Methods don't await, so coroutines of one event loop share it safely (the token cache of auth, the local tier
+    of `TieredCache`). Worker threads, such as the password hasher pool, must not touch it.
+    :param max_size: number of entries kept before the least recently used one is evicted.
+    :param ttl: default time to live of entries in seconds, `None` keeps entries until evicted.
+    :param clock: monotonic time source, replaceable in tests.
+    """
+    def __init__(
+        self,
+        max_size: int,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__clock = clock
+        self.__entries: OrderedDict[KT, tuple[float, VT]] = OrderedDict()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, key: KT) -> Optional[VT]:
+        """:return: cached value or None if the key is missing or expired"""
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self.__clock():
+            del self.__entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self.__entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: KT, value: VT, ttl: Optional[float] = None) -> None:
+        """Store value, `ttl` overrides the default time to live of the cache for this entry."""
+        ttl = self.__ttl if ttl is None else ttl
+        if ttl is not None and ttl <= 0:
+            return
+
+        expires_at = self.__clock() + ttl if ttl is not None else float("inf")
+        self.__entries[key] = (expires_at, value)
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def delete(self, key: KT) -> bool:
+        """:return: True if the key was cached else False"""
+        return self.__entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        self.__entries.clear()
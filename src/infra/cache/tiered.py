@@ -0,0 +1,192 @@
+import asyncio
+import math
+import random
+import time
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+from pydantic import TypeAdapter, ValidationError
+from redis.exceptions import RedisError
+
+from src.infra.cache.flights import FlightStats, SingleFlight
+from src.infra.cache.lru import CacheStats, LRUCache
+from src.infra.services.redis import BaseRedisService
+
+
+VT = TypeVar("VT")
+
+# Seconds to wait before subscribing again after the invalidation channel was lost
+INVALIDATION_RETRY_DELAY = 1.0
+
+
+@dataclass
+class TieredCacheStats:
+    """Counters of both tiers for monitoring, `local` counts every lookup."""
+    local: CacheStats
+    flights: FlightStats
+    remote_hits: int = 0
+    remote_misses: int = 0
+    remote_errors: int = 0
+    loads: int = 0
+    early_refreshes: int = 0
+    invalidations: int = 0
+
+    @property
+    def collapsed(self) -> int:
+        """:return: lookups that waited for a load already in progress instead of starting their own"""
+        return self.flights.collapsed
+
+    @property
+    def hit_ratio(self) -> float:
+        """:return: share of lookups answered without loading"""
+        lookups = self.local.hits + self.local.misses
+        return (self.local.hits + self.remote_hits) / lookups if lookups else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class _RemoteEntry(Generic[VT]):
+    value: VT
+    # NOTE: wall clock, entries are shared by all nodes
+    expires_at: float
+    # NOTE: seconds the load took, scales how early the entry is refreshed
+    load_time: float
+
+
+class TieredCache(Generic[VT]):
+    """
+    Read-through cache of values with a bounded in-process LRU in front of a Redis tier shared by all nodes.
+
+    Stampedes are prevented on both levels: concurrent misses of a key in a process wait for one load
+    (single-flight), and entries of the shared tier are refreshed by a single early reader with
+    probability growing towards expiration (XFetch), before all nodes miss at once.
+    Invalidations are published to every node, local entries also expire after `local_ttl`,
+    which bounds staleness if a message is lost.
+    Redis errors degrade to loading from the source, so the cache never makes a lookup fail.
+    Lookups of request handlers and the `listen_for_invalidations` task must run on the event loop the cache is
+    used from first, the local tier and the flights of loads aren't shared with other loops or threads.
+    :param namespace: prefix of Redis keys and of the invalidation channel.
+    :param value_type: type of cached values, serialized as JSON in the shared tier.
+    :param ttl: time to live of entries in the shared tier.
+    :param local_ttl: time to live of entries in the process.
+    :param early_refresh_beta: eagerness of early refresh, 0 turns it off, values above 1 refresh earlier.
+    """
+    def __init__(
+        self,
+        namespace: str,
+        value_type: type[VT],
+        redis_service: BaseRedisService,
+        max_size: int,
+        ttl: timedelta,
+        local_ttl: timedelta,
+        early_refresh_beta: float = 1.0,
+    ) -> None:
+        self.__namespace = namespace
+        self.__redis = redis_service
+        self.__ttl = ttl
+        self.__local_ttl = local_ttl.total_seconds()
+        self.__beta = early_refresh_beta
+        self.__adapter: TypeAdapter[_RemoteEntry[VT]] = TypeAdapter(_RemoteEntry[value_type])
+        self.__local: LRUCache[str, VT] = LRUCache(max_size=max_size)
+        self.__flights: SingleFlight[str, Optional[VT]] = SingleFlight()
+        self.stats = TieredCacheStats(local=self.__local.stats, flights=self.__flights.stats)
+
+    @property
+    def namespace(self) -> str:
+        return self.__namespace
+
+    @property
+    def invalidation_channel(self) -> str:
+        return f"cache:{self.__namespace}:invalidate"
+
+    async def get_or_load(self, key: str, load: Callable[[], Awaitable[Optional[VT]]]) -> Optional[VT]:
+        """
+        :param load: reads the value from the source of truth, None results aren't cached.
+        :return: cached or loaded value
+        """
+        value = self.__local.get(key)
+        if value is not None:
+            return value
+
+        return await self.__flights.run(key, lambda: self.__fetch(key, load))
+
+    async def invalidate(self, *keys: str) -> None:
+        """Drop entries from both tiers and from processes of other nodes."""
+        for key in keys:
+            self.__local.delete(key)
+            self.stats.invalidations += 1
+            try:
+                await self.__redis.delete(self.__remote_key(key))
+                await self.__redis.publish(self.invalidation_channel, key)
+            except RedisError:
+                self.stats.remote_errors += 1
+
+    async def listen_for_invalidations(self) -> None:
+        """
+        Drop local entries invalidated by any node, until cancelled.
+        The process cache is cleared whenever the subscription is lost, messages could be missed meanwhile.
+        """
+        while True:
+            try:
+                async for key in self.__redis.subscribe(self.invalidation_channel):
+                    self.__local.delete(key)
+            except RedisError:
+                self.stats.remote_errors += 1
+            self.__local.clear()
+            await asyncio.sleep(INVALIDATION_RETRY_DELAY)
+
+    async def __fetch(self, key: str, load: Callable[[], Awaitable[Optional[VT]]]) -> Optional[VT]:
+        entry = await self.__get_remote(key)
+        if entry is not None and not self.__refresh_early(entry):
+            self.stats.remote_hits += 1
+            self.__set_local(key, entry.value, entry.expires_at)
+            return entry.value
+
+        if entry is None:
+            self.stats.remote_misses += 1
+        else:
+            self.stats.early_refreshes += 1
+
+        started_at = time.monotonic()
+        value = await load()
+        load_time = time.monotonic() - started_at
+        self.stats.loads += 1
+        if value is None:
+            return None
+
+        expires_at = time.time() + self.__ttl.total_seconds()
+        await self.__set_remote(key, _RemoteEntry(value=value, expires_at=expires_at, load_time=load_time))
+        self.__set_local(key, value, expires_at)
+        return value
+
+    def __refresh_early(self, entry: _RemoteEntry[VT]) -> bool:
+        """XFetch: refresh before expiration with probability rising as it nears and for slow loads."""
+        jitter = -math.log(1.0 - random.random())
+        return time.time() + entry.load_time * self.__beta * jitter >= entry.expires_at
+
+    def __set_local(self, key: str, value: VT, expires_at: float) -> None:
+        self.__local.set(key, value, ttl=min(self.__local_ttl, expires_at - time.time()))
+
+    async def __get_remote(self, key: str) -> Optional[_RemoteEntry[VT]]:
+        try:
+            payload = await self.__redis.get(self.__remote_key(key))
+        except RedisError:
+            self.stats.remote_errors += 1
+            return None
+        if not payload:
+            return None
+        try:
+            return self.__adapter.validate_json(payload)
+        except ValidationError:
+            # NOTE: written by another version of the value type, replaced by the next load
+            return None
+
+    async def __set_remote(self, key: str, entry: _RemoteEntry[VT]) -> None:
+        try:
+            await self.__redis.set(self.__remote_key(key), self.__adapter.dump_json(entry).decode("utf-8"), self.__ttl)
+        except RedisError:
+            self.stats.remote_errors += 1
+
+    def __remote_key(self, key: str) -> str:
+        return f"cache:{self.__namespace}:{key}"
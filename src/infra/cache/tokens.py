@@ -0,0 +1,35 @@
+import hashlib
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from src.domain.entities.users import Profile
+from src.infra.cache.lru import CacheStats, LRUCache
+from src.settings.config import Settings
+
+
+class ProfileTokenCache:
+    """
+    Profiles resolved from verified access tokens.
+    Entries are keyed by a digest of the token (raw tokens are never kept in memory)
+    and live until the token expires, capped by `AUTH_CACHE_TTL_SECONDS`
+    so profile changes become visible after at most that many seconds.
+    """
+    def __init__(self, config: Settings) -> None:
+        self.__max_ttl: float = config.AUTH_CACHE_TTL_SECONDS
+        self.__cache: LRUCache[bytes, Profile] = LRUCache(max_size=config.AUTH_CACHE_SIZE)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.__cache.stats
+
+    def get(self, token: str) -> Optional[Profile]:
+        return self.__cache.get(self.__digest(token))
+
+    def set(self, token: str, profile: Profile, expires_at: datetime) -> None:
+        ttl = min((expires_at - datetime.now(timezone.utc)).total_seconds(), self.__max_ttl)
+        self.__cache.set(self.__digest(token), profile, ttl=ttl)
+
+    @staticmethod
+    def __digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from src.infra.cache.tiered import TieredCache
+from src.infra.dto.users import CredentialsDTO, ProfileDTO
+from src.infra.services.redis import BaseRedisService
+from src.settings.config import Settings
+
+
+class ProfileCache(TieredCache[ProfileDTO]):
+    """Profiles by oid, looked up on every authenticated request."""
+    def __init__(self, config: Settings, redis_service: BaseRedisService) -> None:
+        super().__init__(
+            namespace="profiles",
+            value_type=ProfileDTO,
+            redis_service=redis_service,
+            max_size=config.USER_CACHE_SIZE,
+            ttl=timedelta(seconds=config.USER_CACHE_TTL_SECONDS),
+            local_ttl=timedelta(seconds=config.USER_CACHE_LOCAL_TTL_SECONDS),
+            early_refresh_beta=config.USER_CACHE_EARLY_REFRESH_BETA,
+        )
+
+
+class CredentialsCache(TieredCache[CredentialsDTO]):
+    """
+    Credentials by username and by email, looked up on login.
+    Holds password hashes, so the shared tier must be as trusted as the refresh tokens Redis already keeps.
+    """
+    def __init__(self, config: Settings, redis_service: BaseRedisService) -> None:
+        super().__init__(
+            namespace="credentials",
+            value_type=CredentialsDTO,
+            redis_service=redis_service,
+            max_size=config.USER_CACHE_SIZE,
+            ttl=timedelta(seconds=config.USER_CACHE_TTL_SECONDS),
+            local_ttl=timedelta(seconds=config.USER_CACHE_LOCAL_TTL_SECONDS),
+            early_refresh_beta=config.USER_CACHE_EARLY_REFRESH_BETA,
+        )
+
+    @staticmethod
+    def username_key(username: str) -> str:
+        return f"username:{username}"
+
+    @staticmethod
+    def email_key(email: str) -> str:
+        return f"email:{email}"
+
+    async def invalidate_credentials(self, credentials: CredentialsDTO) -> None:
+        """Drop the credentials under every key they are cached by."""
+        await self.invalidate(self.username_key(credentials.username), self.email_key(credentials.email))
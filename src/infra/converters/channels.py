@@ -1,14 +1,37 @@
 from src.domain.entities.channels import Channel
 from src.domain.values.channels import ChannelName
+from src.infra.dto.channels import ChannelAccessDTO, ChannelDTO
 from src.infra.models.channels import ChannelModel
 
 
 def convert_channel_model_to_entity(channel_model: ChannelModel) -> Channel:
     return Channel(
         oid=channel_model.oid,
-        name=ChannelName(channel_model.name),
+        name=ChannelName.trusted(channel_model.name),
         description=channel_model.description,
         members=channel_model.profiles,
         is_deleted=channel_model.is_deleted,
         avatar=channel_model.avatar,
+        member_count=channel_model.total_member_count,
+    )
+
+
+def convert_channel_dto_to_entity(channel: ChannelDTO) -> Channel:
+    return Channel(
+        oid=channel.oid,
+        name=ChannelName.trusted(channel.name),
+        description=channel.description,
+        is_deleted=channel.is_deleted,
+        avatar=channel.avatar,
+        member_count=channel.member_count,
+    )
+
+
+def convert_channel_access_to_entity(channel_access: ChannelAccessDTO) -> Channel:
+    return Channel(
+        oid=channel_access.oid,
+        name=ChannelName.trusted(channel_access.name),
+        description=channel_access.description,
+        is_deleted=channel_access.is_deleted,
+        avatar=channel_access.avatar,
     )
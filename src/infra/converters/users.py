@@ -1,21 +1,32 @@
 from src.domain.entities.users import Credentials, Profile
 from src.domain.values.users import Email, Username
-from src.infra.models.users import CredentialsModel, ProfileModel
+from src.infra.dto.channels import ChannelMemberDTO
+from src.infra.dto.users import ProfileDTO
 
 
-def convert_credentials_model_to_entity(credentials_model: CredentialsModel) -> Credentials:
-	return Credentials(
-		oid=credentials_model.oid,
-		username=Username(credentials_model.username),
-		email=Email(credentials_model.email),
-		password=None,
+def convert_profile_dto_to_entity(profile: ProfileDTO) -> Profile:
+	return Profile(
+		oid=profile.oid,
+		display_name=Username.trusted(profile.display_name),
+		credentials=Credentials(
+			oid=profile.credentials_oid,
+			username=Username.trusted(profile.username),
+			email=Email.trusted(profile.email),
+			password=None,
+		),
+		avatar=profile.avatar,
 	)
 
 
-def convert_profile_model_to_entity(profile_model: ProfileModel) -> Profile:
+def convert_channel_member_to_entity(channel_member: ChannelMemberDTO) -> Profile:
 	return Profile(
-		oid=profile_model.oid,
-		display_name=Username(profile_model.display_name),
-		credentials=convert_credentials_model_to_entity(profile_model.credentials),
-		avatar=profile_model.avatar,
+		oid=channel_member.oid,
+		display_name=Username.trusted(channel_member.display_name),
+		credentials=Credentials(
+			oid=channel_member.credentials_oid,
+			username=Username.trusted(channel_member.username),
+			email=Email.trusted(channel_member.email),
+			password=None,
+		),
+		avatar=channel_member.avatar,
 	)
@@ -1,24 +1,193 @@
+import time
+
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Connection, ExceptionContext
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from typing import AsyncGenerator
+from sqlalchemy.orm import ORMExecuteState, Session, raiseload
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+from typing import AsyncGenerator, AsyncIterator
+
+from src.infra.metrics.queries import record_statement
+from src.infra.metrics.slow_queries import EXPLAINING, SlowQueryLog
+from src.infra.metrics.timing import record_span
+from src.settings.config import Settings
+
+
+# Session of the unit of work running in the current task (request), `None` outside of a unit of work
+_current_session: ContextVar[AsyncSession | None] = ContextVar("current_session", default=None)
+
+# Key of `Connection.info` with start times of statements being executed on the connection
+STATEMENT_STARTED_AT = "statement_started_at"
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Snapshot of the engine connection pool for monitoring."""
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
 
-from src.settings.config import settings
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a free (or new, or pinged) connection."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started_at
+            self.checkouts += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+
+class RaiseloadSession(Session):
+    """Session of the `DB_RAISELOAD` development mode, relationships not loaded by the query raise on access."""
 
 
 class DatabaseManager:
-    def __init__(self):
-        self.engine = create_async_engine(url=settings().get_db_url())
+    def __init__(self, config: Settings):
+        self.engine = create_async_engine(
+            url=config.get_db_url(),
+            poolclass=InstrumentedQueuePool,
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_recycle=config.DB_POOL_RECYCLE,
+            pool_pre_ping=config.DB_POOL_PRE_PING,
+            connect_args={
+                "timeout": config.DB_CONNECT_TIMEOUT,
+                "command_timeout": config.DB_COMMAND_TIMEOUT,
+                # asyncpg cache and SQLAlchemy adapter cache of prepared statements per connection
+                "statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+                "prepared_statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+            },
+        )
         self.session_factory = async_sessionmaker(
             bind=self.engine,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False,
             class_=AsyncSession,
+            # NOTE: an accidental lazy load fails loudly instead of adding a round trip per object
+            sync_session_class=RaiseloadSession if config.DB_RAISELOAD else Session,
         )
+        event.listen(self.engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(self.engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(self.engine.sync_engine, "handle_error", _handle_error)
+        if config.SLOW_QUERY_THRESHOLD_MS is not None:
+            SlowQueryLog(
+                threshold_seconds=config.SLOW_QUERY_THRESHOLD_MS / 1000,
+                explain_sample_rate=config.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+                path=config.SLOW_QUERY_LOG_PATH,
+                max_bytes=config.SLOW_QUERY_LOG_MAX_BYTES,
+                backup_count=config.SLOW_QUERY_LOG_BACKUPS,
+            ).install(self.engine.sync_engine)
 
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
         async with self.session_factory() as session:
             yield session
             await session.close()
 
-    def get_test_session(self) -> AsyncSession:
-        return self.session_factory()
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """
+        Provide a session for repository operations.
+        Inside a unit of work the session of that unit of work is reused,
+        otherwise a new session is checked out of the engine pool and closed on exit.
+        """
+        session = _current_session.get()
+        if session is not None:
+            yield session
+            return
+
+        async with self.session_factory() as session:
+            yield session
+
+    def begin(self) -> AsyncSession:
+        """
+        Open a session bound to the current task until `end` is called.
+        Every `session()` call made by the same task in between shares it.
+        """
+        if _current_session.get() is not None:
+            raise RuntimeError("Unit of work is already in progress for the current task")
+
+        session = self.session_factory()
+        _current_session.set(session)
+        return session
+
+    def current(self) -> AsyncSession:
+        """:return: session opened by `begin` for the current task"""
+        session = _current_session.get()
+        if session is None:
+            raise RuntimeError("Unit of work is not in progress for the current task")
+        return session
+
+    async def end(self) -> None:
+        """Close the session opened by `begin` and return its connection to the pool."""
+        session = _current_session.get()
+        _current_session.set(None)
+        if session is not None:
+            await session.close()
+
+    def get_pool_stats(self) -> PoolStats:
+        """:return: current state of the connection pool and accumulated checkout waits"""
+        pool: InstrumentedQueuePool = self.engine.sync_engine.pool
+        return PoolStats(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            total_wait_seconds=pool.total_wait_seconds,
+            max_wait_seconds=pool.max_wait_seconds,
+        )
+
+
+# NOTE: the async engine runs these in the task awaiting the statement, so they see its context variables
+def _before_cursor_execute(conn: Connection, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(STATEMENT_STARTED_AT, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Connection, cursor, statement, parameters, context, executemany) -> None:
+    seconds = time.perf_counter() - conn.info[STATEMENT_STARTED_AT].pop()
+    # NOTE: statements of a sampled EXPLAIN by `SlowQueryLog` aren't counted against the request they report on
+    if not conn.info.get(EXPLAINING):
+        record_span("db", seconds)
+        record_statement(statement, cursor.rowcount)
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    started_at = context.connection.info.get(STATEMENT_STARTED_AT) if context.connection is not None else None
+    if started_at:
+        seconds = time.perf_counter() - started_at.pop()
+        if not context.connection.info.get(EXPLAINING):
+            record_span("db", seconds)
+            record_statement(context.statement or "", 0)
+
+
+@event.listens_for(RaiseloadSession, "do_orm_execute")
+def _raise_on_lazy_loads(state: ORMExecuteState) -> None:
+    # NOTE: options given by the query itself (selectinload, contains_eager) take precedence over the wildcard
+    if state.is_select and not state.is_column_load and not state.is_relationship_load:
+        state.statement = state.statement.options(raiseload("*"))
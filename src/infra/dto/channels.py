@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+
+@dataclass(frozen=True, slots=True)
+class ChannelDTO:
+    """Columns of a channel row, read without the ORM."""
+    oid: UUID
+    name: str
+    description: str | None
+    avatar: str | None
+    is_deleted: bool
+    member_count: int
+
+
+@dataclass(frozen=True, slots=True)
+class ChannelAccessDTO:
+    """Columns of a channel row with the membership of the requesting profile, without members."""
+    oid: UUID
+    name: str
+    description: str | None
+    avatar: str | None
+    is_deleted: bool
+    # NOTE: None when membership wasn't requested
+    is_member: bool | None
+
+
+@dataclass(frozen=True, slots=True)
+class ChannelMemberDTO:
+    """Profile columns of a channel member with the position of the membership in the members order."""
+    oid: UUID
+    display_name: str
+    avatar: str | None
+    credentials_oid: UUID
+    username: str
+    email: str
+    joined_at: datetime
+    membership_oid: UUID
+
+
+@dataclass(frozen=True, slots=True)
+class ChannelVersionDTO:
+    """Change markers of a channel and its members, enough to tell whether a cached read is still fresh."""
+    updated_at: datetime
+    member_count: int
+    # NOTE: latest join or leave, None if the channel never had members
+    members_updated_at: datetime | None
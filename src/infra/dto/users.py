@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileDTO:
+    """Columns of a profile row with its credentials, without the password hash."""
+    oid: UUID
+    display_name: str
+    avatar: str | None
+    credentials_oid: UUID
+    username: str
+    email: str
+
+
+@dataclass(frozen=True, slots=True)
+class CredentialsDTO:
+    """Columns of a credentials row with the oid of its profile."""
+    oid: UUID
+    username: str
+    email: str
+    password: str
+    profile_oid: UUID
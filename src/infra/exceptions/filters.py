@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from src.infra.exceptions.base import InfraException
+
+
+@dataclass(eq=False)
+class InvalidCursorException(InfraException):
+    cursor: str
+
+    @property
+    def message(self) -> str:
+        return f"Invalid pagination cursor ({self.cursor})"
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from src.infra.exceptions.base import InfraException
+
+
+@dataclass(eq=False)
+class StreamTimeoutException(InfraException):
+    max_seconds: float
+
+    @property
+    def message(self) -> str:
+        return f"Stream wasn't consumed within {self.max_seconds} seconds"
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from src.infra.exceptions.base import InfraException
+
+
+@dataclass(eq=False)
+class PasswordServiceOverloadedException(InfraException):
+    max_pending: int
+
+    @property
+    def message(self) -> str:
+        return f"Too many password operations in progress (limit {self.max_pending}), try again later"
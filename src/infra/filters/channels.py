@@ -1,7 +1,51 @@
+import base64
+import binascii
+import json
+
 from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from src.infra.exceptions.filters import InvalidCursorException
+
+
+@dataclass(frozen=True)
+class ChannelsCursor:
+    """
+    Position after the last channel membership of a page, ordered by `(created_at, oid)`.
+    Used both for channels of a profile and for members of a channel.
+    Clients get it as an opaque string and send it back unchanged.
+    """
+    created_at: datetime
+    oid: UUID
 
+    def encode(self) -> str:
+        payload = json.dumps([self.created_at.isoformat(), str(self.oid)], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
 
-@dataclass(eq=False, frozen=True)
+    @classmethod
+    def decode(cls, cursor: str) -> "ChannelsCursor":
+        """:raises InvalidCursorException: if the cursor wasn't produced by `encode`"""
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            created_at, oid = json.loads(payload)
+            return cls(created_at=datetime.fromisoformat(created_at), oid=UUID(oid))
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise InvalidCursorException(cursor=cursor)
+
+
+@dataclass(frozen=True)
 class GetAllChannelsInfraFilters:
     limit: int = 10
     offset: int = 0
+    # NOTE: keyset pagination, `offset` is ignored when the cursor is given
+    cursor: ChannelsCursor | None = None
+    # NOTE: total count of channels is skipped when off, the next page is known from `limit + 1` rows
+    with_count: bool = True
+
+
+# NOTE: compared by value, queries holding filters are coalesced by the mediator
+@dataclass(frozen=True)
+class GetChannelMembersInfraFilters:
+    limit: int = 50
+    cursor: ChannelsCursor | None = None
@@ -0,0 +1,62 @@
+import math
+
+
+# NOTE: 2^6 sub-buckets per power of two keep recorded values within 1/32 (~3%) of their real value
+SUB_BUCKET_BITS = 6
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+# NOTE: durations are recorded in microseconds, longer ones than 2^36 (~19 hours) are clamped
+MAX_VALUE_BITS = 36
+MICROSECONDS = 1_000_000
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations with log-linear buckets, as HdrHistogram lays them out: values below
+    `SUB_BUCKET_COUNT` microseconds are counted exactly, every following power of two is split into
+    `SUB_BUCKET_HALF` equal buckets. Recording is a few integer operations on a fixed array of counters,
+    quantiles are read with the same relative precision at any magnitude.
+    Recorded by `MetricsMiddleware` around mediator handlers and read by the `/metrics` endpoint, both on the event
+    loop. Engine hooks don't record into it, they may run in other threads with a sync driver: statements and pool
+    waits are counted in `RequestTimings`, `QueryCount` and the pool itself.
+    """
+    def __init__(self) -> None:
+        self.__counts = [0] * (self.__index((1 << MAX_VALUE_BITS) - 1) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        value = min(max(int(seconds * MICROSECONDS), 0), (1 << MAX_VALUE_BITS) - 1)
+        self.__counts[self.__index(value)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, quantile: float) -> float:
+        """:return: highest duration in seconds equivalent to the one at the quantile, 0 if nothing is recorded"""
+        if not self.count:
+            return 0.0
+
+        rank = max(math.ceil(quantile * self.count), 1)
+        seen = 0
+        for index, count in enumerate(self.__counts):
+            seen += count
+            if seen >= rank:
+                return min(self.__highest_equivalent(index) / MICROSECONDS, self.max)
+        return self.max
+
+    @staticmethod
+    def __index(value: int) -> int:
+        if value < SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        return SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + (value >> shift) - SUB_BUCKET_HALF
+
+    @staticmethod
+    def __highest_equivalent(index: int) -> int:
+        if index < SUB_BUCKET_COUNT:
+            return index
+        shift, offset = divmod(index - SUB_BUCKET_COUNT, SUB_BUCKET_HALF)
+        shift += 1
+        return ((SUB_BUCKET_HALF + offset + 1) << shift) - 1
@@ -0,0 +1,41 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+@dataclass
+class QueryCount:
+    """Statements sent to the database and rows they returned or changed."""
+    statements: int = 0
+    rows: int = 0
+    # NOTE: SQL of the counted statements in the order they were executed, when kept
+    executed: Optional[list[str]] = None
+
+
+# Counters of the scopes the current task runs in, innermost last
+_current_counts: ContextVar[tuple[QueryCount, ...]] = ContextVar("current_counts", default=())
+
+
+@contextmanager
+def count_queries(keep_statements: bool = False) -> Iterator[QueryCount]:
+    """
+    Count statements executed by the current task (and by tasks it starts meanwhile) while the block runs.
+    Scopes nest, a statement is counted by every scope it runs in.
+    :param keep_statements: also collect SQL of the statements, for diagnostics.
+    """
+    count = QueryCount(executed=[] if keep_statements else None)
+    token = _current_counts.set((*_current_counts.get(), count))
+    try:
+        yield count
+    finally:
+        _current_counts.reset(token)
+
+
+def record_statement(statement: str, rows: int) -> None:
+    for count in _current_counts.get():
+        count.statements += 1
+        # NOTE: drivers report -1 when the number of rows is unknown
+        count.rows += max(rows, 0)
+        if count.executed is not None:
+            count.executed.append(statement)
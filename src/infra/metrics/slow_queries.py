@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+from logging.handlers import RotatingFileHandler
+from types import FrameType
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExceptionContext
+
+# NOTE: not a direct dependency, SQLAlchemy installs it only on some platforms. Without it, callers are looked for
+# in the frames of the current greenlet only, async repository methods may then be reported as unknown
+try:
+    import greenlet
+except ImportError:
+    greenlet = None
+
+
+# Modules whose functions are reported as callers of statements
+CALLER_MODULE_PREFIX = "src.infra.repositories."
+
+# Keys of `Connection.info`
+SLOW_STATEMENT_STARTED_AT = "slow_statement_started_at"
+EXPLAINING = "explaining"
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|(?<![\w$])\d+(?:\.\d+)?\b")
+# NOTE: lists of values (IN, VALUES) of any length are normalized alike
+_PLACEHOLDER_LIST = re.compile(r"\?(?:::\w+(?:\[\])?)?(?:\s*,\s*\?(?:::\w+(?:\[\])?)?)+")
+_WRITE = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b|\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE)\b", re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    """:return: statement with literals and bind placeholders replaced by `?`, so its executions group together"""
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    return _PLACEHOLDER_LIST.sub("?, ...", normalized)
+
+
+def parameter_shapes(parameters: Any, executemany: bool) -> Any:
+    """:return: types of bind parameters (and lengths of strings and lists), never their values"""
+    if executemany:
+        return {"rows": len(parameters), "first": parameter_shapes(parameters[0], False) if parameters else None}
+    if isinstance(parameters, dict):
+        return {name: _value_shape(value) for name, value in parameters.items()}
+    return [_value_shape(value) for value in parameters or ()]
+
+
+def _value_shape(value: Any) -> str:
+    if isinstance(value, (str, bytes, list, tuple)):
+        return f"{value.__class__.__name__}[{len(value)}]"
+    return value.__class__.__name__
+
+
+def _frames() -> Iterator[FrameType]:
+    """Frames of the current greenlet, then of the greenlets waiting for it, where the async callers are."""
+    frame = sys._getframe(1)
+    current = greenlet.getcurrent() if greenlet is not None else None
+    while True:
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        current = current.parent if current is not None else None
+        if current is None:
+            return
+        frame = current.gr_frame
+
+
+def find_caller() -> Optional[str]:
+    """:return: qualified name of the repository method the statement is executed by"""
+    for frame in _frames():
+        if frame.f_globals.get("__name__", "").startswith(CALLER_MODULE_PREFIX):
+            return frame.f_code.co_qualname
+    return None
+
+
+class SlowQueryLog:
+    """
+    Writes statements of an engine slower than `threshold_seconds` to a rotating file, a JSON object per line,
+    with normalized SQL, shapes of bind parameters, duration, rows and the calling repository method.
+    A share of slow read-only statements (`explain_sample_rate`) is executed again under
+    `EXPLAIN (ANALYZE, BUFFERS)` on the same connection, within the same transaction, and logged with the plan.
+    That makes the sampled statement take twice as long, keep the rate low outside of development.
+    Statements that write or lock rows are never explained, ANALYZE would run them again.
+    """
+    def __init__(
+        self,
+        threshold_seconds: float,
+        explain_sample_rate: float,
+        path: str,
+        max_bytes: int,
+        backup_count: int,
+    ) -> None:
+        self.threshold_seconds = threshold_seconds
+        self.explain_sample_rate = explain_sample_rate
+        self.logger = logging.getLogger("communet.slow_queries")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        path = os.path.abspath(path)
+        # NOTE: engines of the process share the file
+        if not any(getattr(handler, "baseFilename", None) == path for handler in self.logger.handlers):
+            handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.logger.addHandler(handler)
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn: Connection, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault(SLOW_STATEMENT_STARTED_AT, []).append(time.perf_counter())
+
+    @staticmethod
+    def _handle_error(context: ExceptionContext) -> None:
+        started_at = context.connection.info.get(SLOW_STATEMENT_STARTED_AT) if context.connection is not None else None
+        if started_at:
+            started_at.pop()
+
+    def _after_cursor_execute(self, conn: Connection, cursor, statement, parameters, context, executemany) -> None:
+        seconds = time.perf_counter() - conn.info[SLOW_STATEMENT_STARTED_AT].pop()
+        if seconds < self.threshold_seconds or conn.info.get(EXPLAINING):
+            return
+
+        record = {
+            "logged_at": time.time(),
+            "duration_ms": round(seconds * 1000, 3),
+            "caller": find_caller(),
+            "sql": normalize_sql(statement),
+            "parameters": parameter_shapes(parameters, executemany),
+            "rows": cursor.rowcount,
+        }
+        if (
+            not executemany
+            and random.random() < self.explain_sample_rate
+            and not _WRITE.search(statement)
+        ):
+            record["plan"] = self.__explain(conn, statement, parameters)
+        self.logger.info(json.dumps(record, default=str, separators=(",", ":")))
+
+    @staticmethod
+    def __explain(conn: Connection, statement: str, parameters: Any) -> list[str] | str:
+        conn.info[EXPLAINING] = True
+        # NOTE: a failed EXPLAIN must not abort the transaction of the caller
+        conn.exec_driver_sql("SAVEPOINT slow_query_explain")
+        try:
+            result = conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = [row[0] for row in result]
+        except Exception as exception:
+            conn.exec_driver_sql("ROLLBACK TO SAVEPOINT slow_query_explain")
+            # NOTE: the plan is optional, the statement itself already succeeded
+            return f"EXPLAIN failed: {exception.__class__.__name__}: {exception}"
+        else:
+            conn.exec_driver_sql("RELEASE SAVEPOINT slow_query_explain")
+            return plan
+        finally:
+            conn.info[EXPLAINING] = False
@@ -0,0 +1,77 @@
+import functools
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterator, Optional, ParamSpec, TypeVar
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+@dataclass
+class PhaseTiming:
+    seconds: float = 0.0
+    count: int = 0
+
+
+@dataclass
+class RequestTimings:
+    """Time spent by the current request in phases (auth, db, redis, ...), summed over their spans."""
+    started_at: float = field(default_factory=time.perf_counter)
+    phases: dict[str, PhaseTiming] = field(default_factory=dict)
+
+    def add(self, phase: str, seconds: float) -> None:
+        timing = self.phases.get(phase)
+        if timing is None:
+            timing = self.phases[phase] = PhaseTiming()
+        timing.seconds += seconds
+        timing.count += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+
+# Timings of the request handled by the current task, `None` outside of requests
+# NOTE: tasks started by the request share the same object, spans of concurrent work may overlap
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+
+@contextmanager
+def request_timings() -> Iterator[RequestTimings]:
+    """Collect spans of the current task (and of tasks it starts meanwhile) into new timings."""
+    timings = RequestTimings()
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+def record_span(phase: str, seconds: float) -> None:
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+@contextmanager
+def span(phase: str) -> Iterator[None]:
+    """Add the time of the block to `phase` of the current request, if any."""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(phase, time.perf_counter() - started_at)
+
+
+def timed(phase: str) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Add the time of every call of the decorated coroutine function to `phase` of the current request."""
+    def decorator(function: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @functools.wraps(function)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(phase):
+                return await function(*args, **kwargs)
+        return wrapper
+    return decorator
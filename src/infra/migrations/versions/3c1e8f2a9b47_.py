@@ -0,0 +1,49 @@
+"""channel members unique membership
+
+Revision ID: 3c1e8f2a9b47
+Revises: f051d930f6d1
+Create Date: 2026-10-18 13:22:08.519204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1e8f2a9b47'
+down_revision: Union[str, None] = 'f051d930f6d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NOTE: concurrent joins could insert the same membership twice,
+    # keep the connected (then the oldest) row of every pair before the constraint is added
+    op.execute(sa.text(
+        """
+        DELETE FROM channel_members
+        WHERE oid IN (
+            SELECT oid FROM (
+                SELECT
+                    oid,
+                    row_number() OVER (
+                        PARTITION BY channel_id, profile_id
+                        ORDER BY is_connected DESC, created_at, oid
+                    ) AS position
+                FROM channel_members
+            ) AS memberships
+            WHERE position > 1
+        )
+        """
+    ))
+    op.create_unique_constraint(
+        'uq_channel_members_channel_id_profile_id',
+        'channel_members',
+        ['channel_id', 'profile_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_channel_members_channel_id_profile_id', 'channel_members', type_='unique')
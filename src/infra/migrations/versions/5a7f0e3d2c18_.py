@@ -0,0 +1,58 @@
+"""covering channel members indexes
+
+Revision ID: 5a7f0e3d2c18
+Revises: 9d4b6a1c7e20
+Create Date: 2026-10-18 15:02:44.871305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7f0e3d2c18'
+down_revision: Union[str, None] = '9d4b6a1c7e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _recreate_index(name: str, columns: list[str], include: list[str]) -> None:
+    op.drop_index(name, table_name='channel_members', postgresql_where=sa.text('is_connected'))
+    op.create_index(
+        name,
+        'channel_members',
+        columns,
+        unique=False,
+        postgresql_where=sa.text('is_connected'),
+        postgresql_include=include,
+    )
+
+
+def upgrade() -> None:
+    # NOTE: `channel_members` is read only through these indexes, carrying the remaining
+    # membership column lets the count and the members queries skip the heap
+    _recreate_index(
+        'ix_channel_members_profile_id_created_at_oid',
+        ['profile_id', 'created_at', 'oid'],
+        include=['channel_id'],
+    )
+    _recreate_index(
+        'ix_channel_members_channel_id_created_at_oid',
+        ['channel_id', 'created_at', 'oid'],
+        include=['profile_id'],
+    )
+
+
+def downgrade() -> None:
+    _recreate_index(
+        'ix_channel_members_profile_id_created_at_oid',
+        ['profile_id', 'created_at', 'oid'],
+        include=[],
+    )
+    _recreate_index(
+        'ix_channel_members_channel_id_created_at_oid',
+        ['channel_id', 'created_at', 'oid'],
+        include=[],
+    )
@@ -0,0 +1,36 @@
+"""channel members of channel keyset pagination index
+
+Revision ID: 9d4b6a1c7e20
+Revises: 3c1e8f2a9b47
+Create Date: 2026-10-18 14:10:51.037412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b6a1c7e20'
+down_revision: Union[str, None] = '3c1e8f2a9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_channel_members_channel_id_created_at_oid',
+        'channel_members',
+        ['channel_id', 'created_at', 'oid'],
+        unique=False,
+        postgresql_where=sa.text('is_connected'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_channel_members_channel_id_created_at_oid',
+        table_name='channel_members',
+        postgresql_where=sa.text('is_connected'),
+    )
@@ -0,0 +1,52 @@
+"""channel member counts
+
+Revision ID: c82d1e5f4a03
+Revises: 5a7f0e3d2c18
+Create Date: 2026-10-18 15:48:12.204915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c82d1e5f4a03'
+down_revision: Union[str, None] = '5a7f0e3d2c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('channels', sa.Column('member_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_table(
+        'channel_member_count_shards',
+        sa.Column('channel_id', sa.UUID(), nullable=False),
+        sa.Column('shard', sa.SmallInteger(), nullable=False),
+        sa.Column('delta', sa.Integer(), nullable=False),
+        sa.Column('oid', sa.Uuid(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['channel_id'], ['channels.oid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('oid'),
+        sa.UniqueConstraint('channel_id', 'shard', name='uq_channel_member_count_shards_channel_id_shard'),
+    )
+    op.execute(sa.text(
+        """
+        UPDATE channels
+        SET member_count = members.count
+        FROM (
+            SELECT channel_id, count(*) AS count
+            FROM channel_members
+            WHERE is_connected
+            GROUP BY channel_id
+        ) AS members
+        WHERE channels.oid = members.channel_id
+        """
+    ))
+
+
+def downgrade() -> None:
+    op.drop_table('channel_member_count_shards')
+    op.drop_column('channels', 'member_count')
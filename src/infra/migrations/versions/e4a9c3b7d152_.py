@@ -0,0 +1,31 @@
+"""channel members change index
+
+Revision ID: e4a9c3b7d152
+Revises: c82d1e5f4a03
+Create Date: 2026-10-18 17:02:36.518290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a9c3b7d152'
+down_revision: Union[str, None] = 'c82d1e5f4a03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_channel_members_channel_id_updated_at',
+        'channel_members',
+        ['channel_id', 'updated_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_channel_members_channel_id_updated_at', table_name='channel_members')
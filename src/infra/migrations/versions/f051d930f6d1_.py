@@ -0,0 +1,36 @@
+"""channel members keyset pagination index
+
+Revision ID: f051d930f6d1
+Revises: b0d9c52e4766
+Create Date: 2026-10-18 12:04:31.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f051d930f6d1'
+down_revision: Union[str, None] = 'b0d9c52e4766'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_channel_members_profile_id_created_at_oid',
+        'channel_members',
+        ['profile_id', 'created_at', 'oid'],
+        unique=False,
+        postgresql_where=sa.text('is_connected'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_channel_members_profile_id_created_at_oid',
+        table_name='channel_members',
+        postgresql_where=sa.text('is_connected'),
+    )
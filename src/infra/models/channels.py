@@ -1,8 +1,8 @@
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, SmallInteger, String, Text, UniqueConstraint, func, select
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from src.infra.models.base import Base
 
@@ -14,12 +14,41 @@ class ChannelModel(Base):
     description: Mapped[str] = mapped_column(Text(), nullable=True, default=None)
     is_deleted: Mapped[bool] = mapped_column(default=False)
     avatar: Mapped[str] = mapped_column(String(255), nullable=True, default=None)
+    # NOTE: connected members, changes of hot channels are kept in `ChannelMemberCountShardModel` rows instead
+    member_count: Mapped[int] = mapped_column(default=0, server_default="0")
 
     profiles: Mapped[list["ChannelMembersModel"]] = relationship(back_populates="channel")
 
 
 class ChannelMembersModel(Base):
     __tablename__ = "channel_members"
+    __table_args__ = (
+        # NOTE: keyset pagination of channels of a profile, see `ChannelRepository.get_all_channels`
+        Index(
+            "ix_channel_members_profile_id_created_at_oid",
+            "profile_id",
+            "created_at",
+            "oid",
+            postgresql_where="is_connected",
+            # NOTE: covers the total count of channels of a profile with an index only scan
+            postgresql_include=["channel_id"],
+        ),
+        # NOTE: keyset pagination and streaming of members of a channel, see `ChannelRepository.get_members_by_channel_id`
+        Index(
+            "ix_channel_members_channel_id_created_at_oid",
+            "channel_id",
+            "created_at",
+            "oid",
+            postgresql_where="is_connected",
+            # NOTE: covers the membership columns read by the members page and export
+            postgresql_include=["profile_id"],
+        ),
+        # NOTE: latest membership change of a channel, read by `ChannelRepository.get_channel_version`.
+        # Not partial, leaving a channel changes its members too
+        Index("ix_channel_members_channel_id_updated_at", "channel_id", "updated_at"),
+        # NOTE: single membership row per profile, join and leave toggle `is_connected` of it
+        UniqueConstraint("channel_id", "profile_id", name="uq_channel_members_channel_id_profile_id"),
+    )
 
     profile_id: Mapped[UUID] = mapped_column(ForeignKey("profiles.oid", ondelete="CASCADE"), type_=PGUUID(as_uuid=True))
     channel_id: Mapped[UUID] = mapped_column(ForeignKey("channels.oid", ondelete="CASCADE"), type_=PGUUID(as_uuid=True))
@@ -28,3 +57,28 @@ class ChannelMembersModel(Base):
 
     profile: Mapped["ProfileModel"] = relationship(back_populates="channels")
     channel: Mapped["ChannelModel"] = relationship(back_populates="profiles")
+
+
+class ChannelMemberCountShardModel(Base):
+    """
+    Part of the member count of a hot channel.
+    Joins and leaves of such channel update one of several rows instead of contending for the channel row lock.
+    """
+    __tablename__ = "channel_member_count_shards"
+    __table_args__ = (
+        UniqueConstraint("channel_id", "shard", name="uq_channel_member_count_shards_channel_id_shard"),
+    )
+
+    channel_id: Mapped[UUID] = mapped_column(ForeignKey("channels.oid", ondelete="CASCADE"), type_=PGUUID(as_uuid=True))
+    shard: Mapped[int] = mapped_column(SmallInteger())
+    delta: Mapped[int] = mapped_column(default=0)
+
+
+# NOTE: loaded with every channel row by the same query, an index lookup of a few shard rows per channel
+ChannelModel.total_member_count = column_property(
+    ChannelModel.member_count
+    + select(func.coalesce(func.sum(ChannelMemberCountShardModel.delta), 0))
+    .where(ChannelMemberCountShardModel.channel_id == ChannelModel.oid)
+    .correlate_except(ChannelMemberCountShardModel)
+    .scalar_subquery()
+)
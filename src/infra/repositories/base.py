@@ -1,8 +1,6 @@
 from abc import ABC
 from dataclasses import dataclass
 
-from sqlalchemy.ext.asyncio import AsyncSession
-
 from src.infra.database import DatabaseManager
 
 
@@ -10,32 +8,36 @@ from src.infra.database import DatabaseManager
 class BaseRepository(ABC):
     """
     Base repository with common attributes and methods.
-    :param _session: SQLAlchemy session for database operations.
+    :param _database: database manager shared by the whole process, every operation
+        takes its own session from the engine pool (or the session of the current unit of work).
     """
-    _session: AsyncSession = DatabaseManager().get_test_session()
+    _database: DatabaseManager
 
 
 class BaseUoW(ABC):
     """
     Manages transactions and provides access to repositories.
-    :param session: SQLAlchemy session for database operations.
+    The session is opened on enter and bound to the current task,
+    so one instance can be shared by concurrent requests.
+    :param database: database manager shared by the whole process.
     """
-    def __init__(self, session: AsyncSession) -> None:
-        self._session = session
+    def __init__(self, database: DatabaseManager) -> None:
+        self._database = database
 
     async def commit(self) -> None:
         """Commit the current transaction in progress."""
-        await self._session.commit()
+        await self._database.current().commit()
 
     async def rollback(self) -> None:
         """Rollback the current transaction in progress."""
-        await self._session.rollback()
+        await self._database.current().rollback()
 
     async def __aenter__(self) -> "BaseUoW":
         """
         Enters the context manager.
         :return: The UnitOfWork instance.
         """
+        self._database.begin()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -45,7 +47,10 @@ class BaseUoW(ABC):
         :param exc_val: The exception value (if any).
         :param exc_tb: The exception traceback (if any).
         """
-        if exc_type is not None:
-            await self.rollback()
-        else:
-            await self.commit()
+        try:
+            if exc_type is not None:
+                await self.rollback()
+            else:
+                await self.commit()
+        finally:
+            await self._database.end()
@@ -1,17 +1,27 @@
+import random
+import time
+
 from abc import abstractmethod
 from dataclasses import dataclass
-from typing import Iterable, Sequence
+from typing import AsyncIterator, Sequence
 from uuid import UUID, uuid4
 
-from sqlalchemy import func, select, update
-from sqlalchemy.orm import contains_eager
+from sqlalchemy import CTE, Select, exists, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 
 from src.domain.entities.channels import Channel
 from src.domain.entities.users import Profile
-from src.infra.filters.channels import GetAllChannelsInfraFilters
-from src.infra.models.channels import ChannelMembersModel, ChannelModel
-from src.infra.models.users import ProfileModel
+from src.infra.dto.channels import ChannelAccessDTO, ChannelDTO, ChannelMemberDTO, ChannelVersionDTO
+from src.infra.exceptions.repositories import StreamTimeoutException
+from src.infra.filters.channels import ChannelsCursor, GetAllChannelsInfraFilters, GetChannelMembersInfraFilters
+from src.infra.models.channels import ChannelMemberCountShardModel, ChannelMembersModel, ChannelModel
+from src.infra.models.users import CredentialsModel, ProfileModel
 from src.infra.repositories.base import BaseRepository
+from src.settings.config import Settings
+
+
+# Rows fetched from the server-side cursor per round trip while streaming members
+MEMBERS_STREAM_BATCH_SIZE = 1000
 
 
 @dataclass(eq=False, frozen=True)
@@ -21,7 +31,11 @@ class BaseChannelRepository(BaseRepository):
         self,
         filters: GetAllChannelsInfraFilters,
         profile_id: UUID,
-    ) -> tuple[Sequence[ChannelModel], int]:
+    ) -> tuple[Sequence[ChannelDTO], int | None, ChannelsCursor | None]:
+        """
+        :return: page of channels, total count (None when `filters.with_count` is off)
+        and cursor of the next page (None on the last page)
+        """
         ...
 
     @abstractmethod
@@ -30,7 +44,24 @@ class BaseChannelRepository(BaseRepository):
         channel_id: UUID,
         profile_id: UUID,
         check_on_member: bool = True,
-    ) -> ChannelModel | None:
+    ) -> ChannelDTO | None:
+        ...
+
+    @abstractmethod
+    async def get_channel_access(self, channel_id: UUID, profile_id: UUID | None = None) -> ChannelAccessDTO | None:
+        """
+        Fetch a channel without its members, with the membership of `profile_id` if it is given.
+        :return: None if there is no channel with such id
+        """
+        ...
+
+    @abstractmethod
+    async def get_channel_version(self, channel_id: UUID, profile_id: UUID | None = None) -> ChannelVersionDTO | None:
+        """
+        Fetch change markers of a channel and its members instead of the channel itself,
+        checking the membership of `profile_id` if it is given, as `get_channel_by_id` does.
+        :return: None if there is no such channel, it is deleted or the profile isn't its member
+        """
         ...
 
     @abstractmethod
@@ -46,58 +77,136 @@ class BaseChannelRepository(BaseRepository):
         ...
 
     @abstractmethod
-    async def get_members_by_channel_id(self, channel_id: UUID) -> Iterable[ProfileModel]:
+    async def get_members_by_channel_id(
+        self,
+        channel_id: UUID,
+        filters: GetChannelMembersInfraFilters,
+    ) -> tuple[Sequence[ChannelMemberDTO], ChannelsCursor | None]:
+        """:return: page of members ordered by membership and cursor of the next page (None on the last page)"""
+        ...
+
+    @abstractmethod
+    def stream_members_by_channel_id(self, channel_id: UUID) -> AsyncIterator[ChannelMemberDTO]:
+        """
+        Iterate over all members of a channel through a server-side cursor, batch by batch.
+        :raises StreamTimeoutException: if the stream isn't consumed within `MEMBERS_EXPORT_MAX_SECONDS`
+        """
         ...
 
     @abstractmethod
     async def connect_to_channel(self, channel_id: UUID, profile_id: UUID) -> bool:
+        """:return: False if the profile is already a connected member of the channel"""
         ...
 
     @abstractmethod
     async def disconnect_from_channel(self, channel_id: UUID, profile_id: UUID) -> bool:
+        """:return: False if the profile isn't a connected member of the channel"""
         ...
 
 
 @dataclass(eq=False, frozen=True)
 class ChannelRepository(BaseChannelRepository):
+    _config: Settings
+
+    # NOTE: read paths select plain columns and map rows straight to DTOs,
+    # without ORM instances, identity map and `unique()` deduplication.
+    # Columns are in the order of `ChannelDTO` fields, leading columns of a row build it positionally
+    _channel_columns = (
+        ChannelModel.oid,
+        ChannelModel.name,
+        ChannelModel.description,
+        ChannelModel.avatar,
+        ChannelModel.is_deleted,
+        ChannelModel.total_member_count.label("member_count"),
+    )
+
+    @classmethod
+    def _channels_stmt(
+        cls,
+        filters: GetAllChannelsInfraFilters,
+        profile_id: UUID,
+    ) -> tuple[Select, Select]:
+        """:return: statements of the page of channels of a profile and of their total count"""
+        # NOTE: the page and the total share the same predicate
+        membership_filter = (
+            ChannelMembersModel.profile_id == profile_id,
+            ChannelMembersModel.is_connected == True,
+            ChannelModel.is_deleted == False,
+        )
+        channels_count_stmt = (
+            select(func.count())
+            .select_from(ChannelMembersModel)
+            .join(ChannelModel, ChannelMembersModel.channel)
+            .where(*membership_filter)
+        )
+        # NOTE: ordered by membership to use `ix_channel_members_profile_id_created_at_oid`,
+        # one more row than requested is fetched to know whether the next page exists
+        channels_stmt = (
+            select(
+                *cls._channel_columns,
+                ChannelMembersModel.created_at.label("joined_at"),
+                ChannelMembersModel.oid.label("membership_oid"),
+            )
+            .select_from(ChannelMembersModel)
+            .join(ChannelModel, ChannelMembersModel.channel)
+            .where(*membership_filter)
+            .order_by(ChannelMembersModel.created_at, ChannelMembersModel.oid)
+            .limit(filters.limit + 1)
+        )
+        if filters.with_count:
+            # NOTE: uncorrelated subquery is evaluated once per statement, so the total
+            # comes back with the page in the same round trip
+            channels_stmt = channels_stmt.add_columns(
+                channels_count_stmt.correlate(None).scalar_subquery().label("channels_count"),
+            )
+        if filters.cursor:
+            channels_stmt = channels_stmt.where(
+                tuple_(ChannelMembersModel.created_at, ChannelMembersModel.oid)
+                > tuple_(filters.cursor.created_at, filters.cursor.oid)
+            )
+        else:
+            channels_stmt = channels_stmt.offset(filters.offset)
+
+        return channels_stmt, channels_count_stmt
+
     async def get_all_channels(
         self,
         filters: GetAllChannelsInfraFilters,
         profile_id: UUID,
-    ) -> tuple[Sequence[ChannelModel], int]:
-        async with self._session as session:
-            channels_stmt = (
-                select(ChannelModel)
-                .join(ChannelMembersModel, ChannelModel.profiles)
-                .where(
-                    ChannelMembersModel.profile_id == profile_id,
-                    ChannelMembersModel.is_connected == True,
-                    ChannelModel.is_deleted == False,
-                )
-                .options(contains_eager(ChannelModel.profiles))
-                .limit(filters.limit)
-                .offset(filters.offset)
-            )
+    ) -> tuple[Sequence[ChannelDTO], int | None, ChannelsCursor | None]:
+        channels_stmt, channels_count_stmt = self._channels_stmt(filters=filters, profile_id=profile_id)
+
+        async with self._database.session() as session:
             result = await session.execute(channels_stmt)
-            channels = result.unique().scalars().all()
+            rows = result.all()
 
-            channels_count_stmt = (
-                select(func.count())
-                .select_from(ChannelModel)
-                .join(ChannelMembersModel, ChannelModel.profiles)
-                .where(ChannelMembersModel.profile_id == profile_id)
-            )
-            channels_count = await session.scalar(channels_count_stmt)
+            channels_count = None
+            if filters.with_count and rows:
+                channels_count = rows[0].channels_count
+            elif filters.with_count and (filters.cursor or filters.offset):
+                # NOTE: the page is past the end, so no row carried the total
+                channels_count = await session.scalar(channels_count_stmt)
+            elif filters.with_count:
+                channels_count = 0
+
+        next_cursor = None
+        if len(rows) > filters.limit:
+            rows = rows[:filters.limit]
+            next_cursor = ChannelsCursor(created_at=rows[-1].joined_at, oid=rows[-1].membership_oid)
 
-            return channels, channels_count
+        channel_columns = len(self._channel_columns)
+        channels = [ChannelDTO(*row[:channel_columns]) for row in rows]
+        return channels, channels_count, next_cursor
 
     async def create(self, author: Profile, channel: Channel) -> ChannelModel:
-        async with self._session as session:
+        async with self._database.session() as session:
             channel_model = ChannelModel(
                 oid=channel.oid,
                 name=channel.name.as_generic_type(),
                 description=channel.description,
                 avatar=channel.avatar,
+                # NOTE: the author is the first member
+                member_count=1,
             )
             channel_author = ChannelMembersModel(
                 oid=uuid4(),
@@ -111,7 +220,7 @@ class ChannelRepository(BaseChannelRepository):
             await session.commit()
 
     async def update_channel(self, channel: Channel) -> None:
-        async with self._session as session:
+        async with self._database.session() as session:
             stmt = (
                 update(ChannelModel)
                 .where(ChannelModel.oid == channel.oid)
@@ -129,94 +238,226 @@ class ChannelRepository(BaseChannelRepository):
         channel_id: UUID,
         profile_id: UUID,
         check_on_member: bool = True,
-    ) -> ChannelModel | None:
-        async with self._session as session:
-            if check_on_member:
-                stmt = (
-                    select(ChannelModel)
-                    .join(ChannelMembersModel, ChannelModel.profiles)
-                    .where(
-                        ChannelModel.oid == channel_id,
-                        ChannelMembersModel.profile_id == profile_id,
-                        ChannelModel.is_deleted == False,
-                    )
-                    .options(contains_eager(ChannelModel.profiles))
+    ) -> ChannelDTO | None:
+        stmt = select(*self._channel_columns).where(ChannelModel.oid == channel_id, ChannelModel.is_deleted == False)
+        if check_on_member:
+            stmt = stmt.where(
+                exists().where(
+                    ChannelMembersModel.channel_id == ChannelModel.oid,
+                    ChannelMembersModel.profile_id == profile_id,
+                )
+            )
+
+        async with self._database.session() as session:
+            result = await session.execute(stmt)
+            row = result.one_or_none()
+
+        return ChannelDTO(*row) if row else None
+
+    async def get_channel_access(self, channel_id: UUID, profile_id: UUID | None = None) -> ChannelAccessDTO | None:
+        if profile_id is not None:
+            # NOTE: probes a single row of `uq_channel_members_channel_id_profile_id`, whatever the channel size
+            is_member = exists().where(
+                ChannelMembersModel.channel_id == ChannelModel.oid,
+                ChannelMembersModel.profile_id == profile_id,
+                ChannelMembersModel.is_connected == True,
+            )
+        else:
+            is_member = literal(None)
+
+        async with self._database.session() as session:
+            stmt = (
+                select(
+                    ChannelModel.oid,
+                    ChannelModel.name,
+                    ChannelModel.description,
+                    ChannelModel.avatar,
+                    ChannelModel.is_deleted,
+                    is_member.label("is_member"),
                 )
-            else:
-                stmt = (
-                    select(ChannelModel)
-                    .join(ChannelMembersModel, ChannelModel.profiles)
-                    .where(ChannelModel.oid == channel_id, ChannelModel.is_deleted == False)
-                    .options(contains_eager(ChannelModel.profiles))
+                .where(ChannelModel.oid == channel_id)
+            )
+            result = await session.execute(stmt)
+            row = result.one_or_none()
+
+            return ChannelAccessDTO(**row._mapping) if row else None
+
+    async def get_channel_version(self, channel_id: UUID, profile_id: UUID | None = None) -> ChannelVersionDTO | None:
+        # NOTE: index only scan of `ix_channel_members_channel_id_updated_at` reading a single entry
+        members_updated_at = (
+            select(func.max(ChannelMembersModel.updated_at))
+            .where(ChannelMembersModel.channel_id == ChannelModel.oid)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(
+                ChannelModel.updated_at,
+                ChannelModel.total_member_count.label("member_count"),
+                members_updated_at.label("members_updated_at"),
+            )
+            .where(ChannelModel.oid == channel_id, ChannelModel.is_deleted == False)
+        )
+        if profile_id is not None:
+            stmt = stmt.where(
+                exists().where(
+                    ChannelMembersModel.channel_id == ChannelModel.oid,
+                    ChannelMembersModel.profile_id == profile_id,
                 )
+            )
+
+        async with self._database.session() as session:
             result = await session.execute(stmt)
-            return result.unique().scalar_one_or_none()
+            row = result.one_or_none()
+
+        return ChannelVersionDTO(*row) if row else None
 
     async def delete_channel_by_id(self, channel_id: UUID) -> None:
-        async with self._session as session:
+        async with self._database.session() as session:
             stmt = update(ChannelModel).where(ChannelModel.oid == channel_id).values(is_deleted=True)
             await session.execute(stmt)
             await session.commit()
 
-    async def connect_to_channel(self, channel_id: UUID, profile_id: UUID) -> bool:
-        async with self._session as session:
-            stmt = (
-                select(ChannelMembersModel)
-                .where(ChannelMembersModel.channel_id == channel_id, ChannelMembersModel.profile_id == profile_id)
+    def _member_count_ctes(self, channel_id: UUID, toggled: CTE, delta: int) -> tuple[CTE, CTE]:
+        """
+        Build statements applying `delta` to the member count of the channel if `toggled` returns a row.
+        Channels below the shard threshold update their own row, hot channels update a random shard row.
+        """
+        counted = (
+            update(ChannelModel)
+            .where(
+                ChannelModel.oid == channel_id,
+                ChannelModel.member_count < self._config.CHANNEL_MEMBER_COUNT_SHARD_THRESHOLD,
+                exists(select(toggled)),
+            )
+            .values(member_count=ChannelModel.member_count + delta)
+            .returning(ChannelModel.oid)
+            .cte("counted")
+        )
+        shard_stmt = insert(ChannelMemberCountShardModel).from_select(
+            ["oid", "channel_id", "shard", "delta"],
+            select(
+                literal(uuid4()),
+                literal(channel_id),
+                literal(random.randrange(self._config.CHANNEL_MEMBER_COUNT_SHARDS)),
+                literal(delta),
             )
+            .where(exists(select(toggled)), ~exists(select(counted))),
+        )
+        sharded = (
+            shard_stmt
+            .on_conflict_do_update(
+                constraint="uq_channel_member_count_shards_channel_id_shard",
+                set_={"delta": ChannelMemberCountShardModel.delta + shard_stmt.excluded.delta},
+            )
+            .returning(ChannelMemberCountShardModel.oid)
+            .cte("sharded")
+        )
+        return counted, sharded
 
-            result = True
-            stmt_result = await session.execute(stmt)
-            row: ChannelMembersModel = stmt_result.scalar_one_or_none()
+    async def connect_to_channel(self, channel_id: UUID, profile_id: UUID) -> bool:
+        # NOTE: a row is returned only when the membership is created or reconnected,
+        # a connected membership is left untouched by the conflict clause
+        connected = (
+            insert(ChannelMembersModel)
+            .values(oid=uuid4(), channel_id=channel_id, profile_id=profile_id, is_connected=True)
+            .on_conflict_do_update(
+                constraint="uq_channel_members_channel_id_profile_id",
+                set_={"is_connected": True, "updated_at": func.now()},
+                where=ChannelMembersModel.is_connected == False,
+            )
+            .returning(ChannelMembersModel.oid)
+            .cte("connected")
+        )
+        # NOTE: the membership and the member count are changed by one statement, so atomically
+        stmt = select(connected.c.oid).add_cte(*self._member_count_ctes(channel_id, connected, delta=1))
 
-            if row and row.is_connected:
-                result = False
-            elif row:
-                row.is_connected = True
-                session.add(row)
-                await session.commit()
-            else:
-                new_row = ChannelMembersModel(oid=uuid4(), channel_id=channel_id, profile_id=profile_id)
-                session.add(new_row)
-                await session.commit()
+        async with self._database.session() as session:
+            result = await session.execute(stmt)
+            await session.commit()
 
-            return result
+            return result.scalar_one_or_none() is not None
 
     async def disconnect_from_channel(self, channel_id: UUID, profile_id: UUID) -> bool:
-        async with self._session as session:
-            stmt = (
-                select(ChannelMembersModel)
-                .where(ChannelMembersModel.channel_id == channel_id, ChannelMembersModel.profile_id == profile_id)
-            )
-
-            result = True
-            stmt_result = await session.execute(stmt)
-            row: ChannelMembersModel = stmt_result.scalar_one_or_none()
-
-            if row and row.is_connected:
-                row.is_connected = False
-                session.add(row)
-                await session.commit()
-            else:
-                result = False
-
-            return result
-
-    async def get_members_by_channel_id(self, channel_id: UUID) -> Iterable[ProfileModel]:
-        async with self._session as session:
-            query = (
-                select(ProfileModel)
-                .join(ChannelMembersModel, ProfileModel.oid == ChannelMembersModel.profile_id)
-                .join(ChannelModel, ChannelMembersModel.channel_id == ChannelModel.oid)
-                .where(
-                    ChannelModel.oid == channel_id,
-                    ChannelModel.is_deleted == False,
-                    ChannelMembersModel.is_connected == True,
-                )
-                .options(
-                    contains_eager(ProfileModel.channels),
-                    contains_eager(ProfileModel.credentials),
-                )
+        disconnected = (
+            update(ChannelMembersModel)
+            .where(
+                ChannelMembersModel.channel_id == channel_id,
+                ChannelMembersModel.profile_id == profile_id,
+                ChannelMembersModel.is_connected == True,
+            )
+            .values(is_connected=False)
+            .returning(ChannelMembersModel.oid)
+            .cte("disconnected")
+        )
+        stmt = select(disconnected.c.oid).add_cte(*self._member_count_ctes(channel_id, disconnected, delta=-1))
+
+        async with self._database.session() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+
+            return result.scalar_one_or_none() is not None
+
+    @staticmethod
+    def _members_stmt(channel_id: UUID) -> Select:
+        return (
+            select(
+                ProfileModel.oid,
+                ProfileModel.display_name,
+                ProfileModel.avatar,
+                CredentialsModel.oid.label("credentials_oid"),
+                CredentialsModel.username,
+                CredentialsModel.email,
+                ChannelMembersModel.created_at.label("joined_at"),
+                ChannelMembersModel.oid.label("membership_oid"),
             )
-            result = await session.execute(query)
-            return result.unique().scalars().all()
+            .select_from(ChannelMembersModel)
+            .join(ChannelModel, ChannelMembersModel.channel_id == ChannelModel.oid)
+            .join(ProfileModel, ChannelMembersModel.profile_id == ProfileModel.oid)
+            .join(CredentialsModel, ProfileModel.credentials_id == CredentialsModel.oid)
+            .where(
+                ChannelMembersModel.channel_id == channel_id,
+                ChannelMembersModel.is_connected == True,
+                ChannelModel.is_deleted == False,
+            )
+            # NOTE: matches `ix_channel_members_channel_id_created_at_oid`
+            .order_by(ChannelMembersModel.created_at, ChannelMembersModel.oid)
+        )
+
+    async def get_members_by_channel_id(
+        self,
+        channel_id: UUID,
+        filters: GetChannelMembersInfraFilters,
+    ) -> tuple[Sequence[ChannelMemberDTO], ChannelsCursor | None]:
+        stmt = self._members_stmt(channel_id=channel_id).limit(filters.limit + 1)
+        if filters.cursor:
+            stmt = stmt.where(
+                tuple_(ChannelMembersModel.created_at, ChannelMembersModel.oid)
+                > tuple_(filters.cursor.created_at, filters.cursor.oid)
+            )
+
+        async with self._database.session() as session:
+            result = await session.execute(stmt)
+            members = [ChannelMemberDTO(**row._mapping) for row in result]
+
+        next_cursor = None
+        if len(members) > filters.limit:
+            members = members[:filters.limit]
+            next_cursor = ChannelsCursor(created_at=members[-1].joined_at, oid=members[-1].membership_oid)
+
+        return members, next_cursor
+
+    async def stream_members_by_channel_id(self, channel_id: UUID) -> AsyncIterator[ChannelMemberDTO]:
+        stmt = self._members_stmt(channel_id=channel_id).execution_options(yield_per=MEMBERS_STREAM_BATCH_SIZE)
+        max_seconds = self._config.MEMBERS_EXPORT_MAX_SECONDS
+        deadline = time.monotonic() + max_seconds
+
+        async with self._database.session() as session:
+            # NOTE: the connection and the cursor are held while the consumer is slow, the server ends the session
+            # once it stays idle in the transaction between fetches longer than the timeout
+            idle_timeout = f"{int(self._config.MEMBERS_EXPORT_IDLE_SECONDS * 1000)}ms"
+            await session.execute(select(func.set_config("idle_in_transaction_session_timeout", idle_timeout, True)))
+            result = await session.stream(stmt)
+            async for row in result:
+                if time.monotonic() > deadline:
+                    raise StreamTimeoutException(max_seconds=max_seconds)
+                yield ChannelMemberDTO(**row._mapping)
@@ -1,14 +1,14 @@
 from abc import abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import ClassVar, Optional
 from uuid import UUID
 
-from sqlalchemy import select, or_
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy import ColumnElement, Select, select, or_
 
 from src.domain.entities.users import Credentials, Profile
+from src.infra.cache.users import CredentialsCache, ProfileCache
 from src.infra.database import DatabaseManager
+from src.infra.dto.users import CredentialsDTO, ProfileDTO
 from src.infra.models.users import CredentialsModel, ProfileModel
 from src.infra.repositories.base import BaseRepository, BaseUoW
 
@@ -16,11 +16,11 @@ from src.infra.repositories.base import BaseRepository, BaseUoW
 @dataclass(eq=False, frozen=True)
 class BaseCredentialsRepository(BaseRepository):
     @abstractmethod
-    async def find_by_email(self, email: str) -> Optional[CredentialsModel]:
+    async def find_by_email(self, email: str) -> Optional[CredentialsDTO]:
         ...
 
     @abstractmethod
-    async def find_by_username(self, username: str) -> Optional[CredentialsModel]:
+    async def find_by_username(self, username: str) -> Optional[CredentialsDTO]:
         ...
 
     @abstractmethod
@@ -34,23 +34,37 @@ class BaseCredentialsRepository(BaseRepository):
 
 @dataclass(eq=False, frozen=True)
 class CredentialsRepository(BaseCredentialsRepository):
-    async def find_by_email(self, email: str) -> Optional[CredentialsModel]:
-        stmt = (
-            select(CredentialsModel)
-            .where(CredentialsModel.email == email)
-            .options(joinedload(CredentialsModel.profile))
+    # NOTE: lookups go to the database directly without it
+    _cache: Optional[CredentialsCache] = None
+
+    _credentials_stmt: ClassVar[Select] = (
+        select(
+            CredentialsModel.oid,
+            CredentialsModel.username,
+            CredentialsModel.email,
+            CredentialsModel.password,
+            ProfileModel.oid.label("profile_oid"),
         )
-        result = await self._session.execute(stmt)
-        return result.scalar_one_or_none()
-
-    async def find_by_username(self, username: str) -> Optional[CredentialsModel]:
-        stmt = (
-            select(CredentialsModel)
-            .where(CredentialsModel.username == username)
-            .options(joinedload(CredentialsModel.profile))
-        )
-        result = await self._session.execute(stmt)
-        return result.scalar_one_or_none()
+        .join(ProfileModel, ProfileModel.credentials_id == CredentialsModel.oid)
+    )
+
+    async def find_by_email(self, email: str) -> Optional[CredentialsDTO]:
+        load = lambda: self._find(CredentialsModel.email == email)
+        if self._cache is None:
+            return await load()
+        return await self._cache.get_or_load(CredentialsCache.email_key(email), load)
+
+    async def find_by_username(self, username: str) -> Optional[CredentialsDTO]:
+        load = lambda: self._find(CredentialsModel.username == username)
+        if self._cache is None:
+            return await load()
+        return await self._cache.get_or_load(CredentialsCache.username_key(username), load)
+
+    async def _find(self, criterion: ColumnElement[bool]) -> Optional[CredentialsDTO]:
+        async with self._database.session() as session:
+            result = await session.execute(self._credentials_stmt.where(criterion))
+            row = result.one_or_none()
+        return CredentialsDTO(*row) if row else None
 
     async def create(self, credentials: Credentials) -> Optional[CredentialsModel]:
         """
@@ -64,8 +78,9 @@ class CredentialsRepository(BaseCredentialsRepository):
             email=credentials.email.as_generic_type(),
             password=credentials.password.as_generic_type(),
         )
-        self._session.add(credentials_model)
-        await self._session.flush()
+        async with self._database.session() as session:
+            session.add(credentials_model)
+            await session.flush()
         return credentials_model
 
     async def check_user_exists(self, email: str, username: str) -> bool:
@@ -76,14 +91,15 @@ class CredentialsRepository(BaseCredentialsRepository):
         stmt = select(CredentialsModel).where(
             or_(CredentialsModel.email == email, CredentialsModel.username == username)
         )
-        result = await self._session.execute(stmt)
-        return result.scalar() is not None
+        async with self._database.session() as session:
+            result = await session.execute(stmt)
+            return result.scalar() is not None
 
 
 @dataclass(eq=False, frozen=True)
 class BaseProfileRepository(BaseRepository):
     @abstractmethod
-    async def find_by_id(self, profile_id: UUID) -> Optional[ProfileModel]:
+    async def find_by_id(self, profile_id: UUID) -> Optional[ProfileDTO]:
         ...
 
     @abstractmethod
@@ -93,10 +109,32 @@ class BaseProfileRepository(BaseRepository):
 
 @dataclass(eq=False, frozen=True)
 class ProfileRepository(BaseProfileRepository):
-    async def find_by_id(self, profile_id) -> Optional[ProfileModel]:
-        stmt = select(ProfileModel).where(ProfileModel.oid == profile_id).options(joinedload(ProfileModel.credentials))
-        result = await self._session.execute(stmt)
-        return result.scalar_one_or_none()
+    # NOTE: lookups go to the database directly without it
+    _cache: Optional[ProfileCache] = None
+
+    async def find_by_id(self, profile_id: UUID) -> Optional[ProfileDTO]:
+        load = lambda: self._find_by_id(profile_id)
+        if self._cache is None:
+            return await load()
+        return await self._cache.get_or_load(str(profile_id), load)
+
+    async def _find_by_id(self, profile_id: UUID) -> Optional[ProfileDTO]:
+        stmt = (
+            select(
+                ProfileModel.oid,
+                ProfileModel.display_name,
+                ProfileModel.avatar,
+                CredentialsModel.oid.label("credentials_oid"),
+                CredentialsModel.username,
+                CredentialsModel.email,
+            )
+            .join(CredentialsModel, ProfileModel.credentials_id == CredentialsModel.oid)
+            .where(ProfileModel.oid == profile_id)
+        )
+        async with self._database.session() as session:
+            result = await session.execute(stmt)
+            row = result.one_or_none()
+        return ProfileDTO(*row) if row else None
 
     async def create(self, profile: Profile) -> Optional[ProfileModel]:
         """
@@ -110,13 +148,22 @@ class ProfileRepository(BaseProfileRepository):
             avatar=profile.avatar,
             credentials_id=profile.credentials.oid,
         )
-        self._session.add(profile_model)
-        await self._session.flush()
+        async with self._database.session() as session:
+            session.add(profile_model)
+            await session.flush()
         return profile_model
 
 
 class UserUoW(BaseUoW):
-    def __init__(self, session: AsyncSession = DatabaseManager().get_test_session()):
-        super().__init__(session)
-        self.profile_repository: BaseProfileRepository = ProfileRepository(self._session)
-        self.credentials_repository: BaseCredentialsRepository = CredentialsRepository(self._session)
+    def __init__(
+        self,
+        database: DatabaseManager,
+        profile_cache: Optional[ProfileCache] = None,
+        credentials_cache: Optional[CredentialsCache] = None,
+    ):
+        super().__init__(database)
+        self.profile_repository: BaseProfileRepository = ProfileRepository(self._database, profile_cache)
+        self.credentials_repository: BaseCredentialsRepository = CredentialsRepository(
+            self._database,
+            credentials_cache,
+        )
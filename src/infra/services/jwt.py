@@ -15,12 +15,30 @@ class BaseJWTService(ABC):
 	def decode_jwt_token(self, token: str) -> str | None:
 		...
 
+	def decode_jwt_claims(self, token: str) -> tuple[str, datetime] | None:
+		""":return: profile id and expiration time of a valid token else None"""
+		...
+
+	def generate_access_token(self, profile_id: str) -> tuple[str, datetime]:
+		...
+
+	def generate_refresh_token(self) -> tuple[str, timedelta]:
+		...
+
 
 class JWTService(BaseJWTService):
 	def __init__(self, config: Settings) -> None:
 		self.__config: Settings = config
 
 	def decode_jwt_token(self, token: str) -> str | None:
+		claims = self.decode_jwt_claims(token)
+		if not claims:
+			return None
+
+		profile_id, _ = claims
+		return profile_id
+
+	def decode_jwt_claims(self, token: str) -> tuple[str, datetime] | None:
 		try:
 			payload = jwt.decode(
 				jwt=token,
@@ -31,20 +49,22 @@ class JWTService(BaseJWTService):
 			return None
 
 		expire = payload.get("exp")
+		if not expire:
+			return None
+
 		expire_time = datetime.fromtimestamp(int(expire), timezone.utc)
-		if (not expire) or (expire_time < datetime.now(timezone.utc)):
+		if expire_time < datetime.now(timezone.utc):
 			return None
 
 		profile_id = payload.get("sub")
 		if not profile_id:
 			return None
 
-		return profile_id
-
+		return profile_id, expire_time
 
 	def generate_auth_tokens(self, profile_id: str) -> AuthData:
-		access_token, access_expires = self.__generate_access_token(profile_id)
-		refresh_token, refresh_expires = self.__generate_refresh_token()
+		access_token, access_expires = self.generate_access_token(profile_id)
+		refresh_token, refresh_expires = self.generate_refresh_token()
 
 		return AuthData(
 			access_token=access_token,
@@ -53,7 +73,7 @@ class JWTService(BaseJWTService):
 			refresh_expires=refresh_expires,
 		)
 
-	def __generate_access_token(self, profile_id: str) -> tuple[str, datetime]:
+	def generate_access_token(self, profile_id: str) -> tuple[str, datetime]:
 		access_expires = datetime.now(timezone.utc) + timedelta(minutes=self.__config.JWT_EXPIRES_IN_MINUTES)
 		access_token = jwt.encode(
 			payload={
@@ -66,7 +86,7 @@ class JWTService(BaseJWTService):
 
 		return access_token, access_expires
 
-	def __generate_refresh_token(self) -> tuple[str, timedelta]:
+	def generate_refresh_token(self) -> tuple[str, timedelta]:
 		refresh_token = str(uuid4())
 		refresh_expires = timedelta(days=self.__config.REFRESH_EXPIRES_IN_DAYS)
 
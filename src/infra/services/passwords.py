@@ -0,0 +1,65 @@
+import asyncio
+
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from src.domain.values.users import Password
+from src.infra.exceptions.services import PasswordServiceOverloadedException
+from src.settings.config import Settings
+
+
+RT = TypeVar("RT")
+
+
+class BasePasswordService(ABC):
+	@abstractmethod
+	async def hash_password(self, password: str) -> Password:
+		...
+
+	@abstractmethod
+	async def check_password(self, password: str, hashed_password: str) -> bool:
+		...
+
+	@abstractmethod
+	def shutdown(self) -> None:
+		"""Stop workers, waiting for running operations and cancelling queued ones."""
+		...
+
+
+class PasswordService(BasePasswordService):
+	"""
+	Runs bcrypt outside of the event loop in a bounded worker pool.
+	Operations over `PASSWORD_HASHER_MAX_PENDING` (running and queued) are rejected immediately
+	with `PasswordServiceOverloadedException` instead of piling up behind the workers.
+	"""
+	def __init__(self, config: Settings) -> None:
+		self.__max_pending: int = config.PASSWORD_HASHER_MAX_PENDING
+		self.__pending: int = 0
+		self.__executor: Executor = (
+			ProcessPoolExecutor(max_workers=config.PASSWORD_HASHER_WORKERS)
+			if config.PASSWORD_HASHER_EXECUTOR == "process" else
+			ThreadPoolExecutor(max_workers=config.PASSWORD_HASHER_WORKERS, thread_name_prefix="password-hasher")
+		)
+
+	async def hash_password(self, password: str) -> Password:
+		Password.validate(password)
+		hashed_password = await self.__run(Password.hash_password, password)
+		return Password.from_hash(hashed_password)
+
+	async def check_password(self, password: str, hashed_password: str) -> bool:
+		return await self.__run(Password.check_passwords, password, hashed_password)
+
+	def shutdown(self) -> None:
+		# NOTE: process workers would otherwise outlive a reload or stop of the server
+		self.__executor.shutdown(wait=True, cancel_futures=True)
+
+	async def __run(self, func: Callable[..., RT], *args) -> RT:
+		if self.__pending >= self.__max_pending:
+			raise PasswordServiceOverloadedException(max_pending=self.__max_pending)
+
+		self.__pending += 1
+		try:
+			return await asyncio.get_running_loop().run_in_executor(self.__executor, func, *args)
+		finally:
+			self.__pending -= 1
@@ -1,12 +1,34 @@
 from abc import ABC, abstractmethod
 from datetime import timedelta
-from typing import Optional
+from typing import AsyncIterator, Optional, Sequence
 
 from redis.asyncio import Redis
 
+from src.infra.metrics.timing import timed
 from src.settings.config import Settings
 
 
+# Consume the value of KEYS[1] and store it under KEYS[2] with TTL of ARGV[1] milliseconds in one atomic step
+ROTATE_SCRIPT = """
+local value = redis.call('GETDEL', KEYS[1])
+if not value then
+	return nil
+end
+redis.call('SET', KEYS[2], value, 'PX', ARGV[1])
+return value
+"""
+
+
+# Increment KEYS[1] and store its new value under the rest of KEYS in one atomic step
+STAMP_SCRIPT = """
+local sequence = redis.call('INCR', KEYS[1])
+for index = 2, #KEYS do
+	redis.call('SET', KEYS[index], sequence)
+end
+return sequence
+"""
+
+
 class BaseRedisService(ABC):
 	@abstractmethod
 	async def get(self, key: str) -> Optional[str]:
@@ -20,22 +42,57 @@ class BaseRedisService(ABC):
 	async def delete(self, key: str) -> bool:
 		...
 
+	@abstractmethod
+	async def get_many(self, keys: Sequence[str]) -> list[Optional[str]]:
+		""":return: values in the order of `keys`, None for missing ones"""
+		...
+
+	@abstractmethod
+	async def stamp(self, sequence_key: str, keys: Sequence[str]) -> int:
+		"""
+		Atomically increment the counter of `sequence_key` and store its new value under each of `keys`.
+		:return: new value of the counter
+		"""
+		...
+
 	@abstractmethod
 	async def pop(self, key: str) -> Optional[str]:
 		...
 
+	@abstractmethod
+	async def rotate(self, key: str, new_key: str, ttl: timedelta) -> Optional[str]:
+		"""
+		Atomically consume value of `key` and store it under `new_key`.
+		:return: moved value or None if `key` does not exist (nothing is stored then)
+		"""
+		...
+
+	@abstractmethod
+	async def publish(self, channel: str, message: str) -> int:
+		""":return: number of subscribers that received the message"""
+		...
+
+	@abstractmethod
+	def subscribe(self, channel: str) -> AsyncIterator[str]:
+		"""Iterate over messages published to `channel` from now on, until the connection is lost."""
+		...
+
 
 class RedisService(BaseRedisService):
 	def __init__(self, config: Settings) -> None:
 		self.__config: Settings = config
 		self.__client: Redis = Redis.from_url(url=self.__config.get_redis_url())
+		self.__rotate_script = self.__client.register_script(ROTATE_SCRIPT)
+		self.__stamp_script = self.__client.register_script(STAMP_SCRIPT)
 
+	@timed("redis")
 	async def get(self, key: str) -> Optional[str]:
 		result = await self.__client.get(name=key)
 		if result:
 			result = result.decode("utf-8")
 		return result
 
+	@timed("redis")
 	async def set(self, key: str, value: str, ttl: timedelta) -> bool:
 		return await self.__client.set(
 			name=key,
@@ -43,12 +100,44 @@ class RedisService(BaseRedisService):
 			ex=ttl,
 		)
 
+	@timed("redis")
 	async def pop(self, key: str) -> Optional[str]:
-		result = await self.get(key=key)
+		result = await self.__client.getdel(name=key)
+		if result:
+			result = result.decode("utf-8")
+		return result
+
+	@timed("redis")
+	async def rotate(self, key: str, new_key: str, ttl: timedelta) -> Optional[str]:
+		result = await self.__rotate_script(
+			keys=[key, new_key],
+			args=[int(ttl.total_seconds() * 1000)],
+		)
 		if result:
-			await self.delete(key=key)
+			result = result.decode("utf-8")
 		return result
 
+	@timed("redis")
 	async def delete(self, key: str) -> bool:
 		result = await self.__client.delete(key)
 		return bool(result)
+
+	@timed("redis")
+	async def get_many(self, keys: Sequence[str]) -> list[Optional[str]]:
+		results = await self.__client.mget(keys)
+		return [result.decode("utf-8") if result else None for result in results]
+
+	@timed("redis")
+	async def stamp(self, sequence_key: str, keys: Sequence[str]) -> int:
+		return await self.__stamp_script(keys=[sequence_key, *keys])
+
+	@timed("redis")
+	async def publish(self, channel: str, message: str) -> int:
+		return await self.__client.publish(channel=channel, message=message)
+
+	async def subscribe(self, channel: str) -> AsyncIterator[str]:
+		# NOTE: a dedicated connection, subscribed connections can't serve other commands
+		async with self.__client.pubsub(ignore_subscribe_messages=True) as pubsub:
+			await pubsub.subscribe(channel)
+			async for message in pubsub.listen():
+				yield message["data"].decode("utf-8")
@@ -2,10 +2,11 @@ from dataclasses import dataclass
 from typing import Optional
 
 from src.domain.entities.users import AuthData, Profile, Credentials
-from src.domain.values.users import Password
-from src.infra.converters.users import convert_profile_model_to_entity
+from src.infra.cache.tokens import ProfileTokenCache
+from src.infra.converters.users import convert_profile_dto_to_entity
 from src.infra.repositories.users import UserUoW
 from src.infra.services.jwt import BaseJWTService
+from src.infra.services.passwords import BasePasswordService
 from src.infra.services.redis import BaseRedisService
 from src.logic.commands.base import BaseCommand, CommandHandler
 from src.logic.exceptions.auth import InvalidCredentialsException, InvalidRefreshTokenException, UnauthorizedException, UserAlreadyExistsException
@@ -24,13 +25,17 @@ class RegisterCommand(BaseCommand):
 @dataclass(frozen=True)
 class RegisterCommandHandler(CommandHandler[RegisterCommand, Profile]):
     user_uow: UserUoW
+    password_service: BasePasswordService
 
     async def handle(self, command: RegisterCommand) -> Profile:
+        # NOTE: hash before opening the unit of work, so no pooled connection is held while bcrypt runs
+        password = await self.password_service.hash_password(command.password)
+
         async with self.user_uow as uow:
             if await uow.credentials_repository.check_user_exists(email=command.email, username=command.username):
                 raise UserAlreadyExistsException(email=command.email, username=command.username)
 
-            credentials = Credentials.create(command.username, command.email, command.password)
+            credentials = Credentials.create(command.username, command.email, password)
             profile = Profile.create(command.display_name, command.avatar, credentials)
 
             await uow.credentials_repository.create(credentials)
@@ -51,6 +56,7 @@ class LoginCommandHandler(CommandHandler[LoginCommand, AuthData]):
     jwt_service: BaseJWTService
     redis_service: BaseRedisService
     user_uow: UserUoW
+    password_service: BasePasswordService
 
     async def handle(self, command: LoginCommand) -> AuthData:
         async with self.user_uow as uow:
@@ -62,10 +68,10 @@ class LoginCommandHandler(CommandHandler[LoginCommand, AuthData]):
             if not credentials:
                 raise InvalidCredentialsException()
 
-        if not Password.check_passwords(password1=command.password, password2=credentials.password):
+        if not await self.password_service.check_password(command.password, credentials.password):
             raise InvalidCredentialsException()
 
-        profile_id = str(credentials.profile.oid)
+        profile_id = str(credentials.profile_oid)
         auth_data = self.jwt_service.generate_auth_tokens(profile_id=profile_id)
 
         await self.redis_service.set(
@@ -86,18 +92,25 @@ class ExtractProfileFromJWTTokenCommand(BaseCommand):
 class ExtractProfileFromJWTTokenHandler(CommandHandler[ExtractProfileFromJWTTokenCommand, Profile]):
     user_uow: UserUoW
     jwt_service: BaseJWTService
+    token_cache: ProfileTokenCache
 
     async def handle(self, command: ExtractProfileFromJWTTokenCommand) -> Profile:
-        profile_id = self.jwt_service.decode_jwt_token(token=command.token)
-        if not profile_id:
+        profile_entity = self.token_cache.get(command.token)
+        if profile_entity:
+            return profile_entity
+
+        claims = self.jwt_service.decode_jwt_claims(token=command.token)
+        if not claims:
             raise UnauthorizedException()
+        profile_id, expires_at = claims
 
         async with self.user_uow as uow:
-            profile_model = await uow.profile_repository.find_by_id(profile_id)
-            if not profile_model:
+            profile = await uow.profile_repository.find_by_id(profile_id)
+            if not profile:
                 raise UnauthorizedException()
 
-        profile_entity = convert_profile_model_to_entity(profile_model)
+        profile_entity = convert_profile_dto_to_entity(profile)
+        self.token_cache.set(command.token, profile_entity, expires_at=expires_at)
         return profile_entity
 
 
@@ -112,16 +125,22 @@ class RefreshTokensCommandHandler(CommandHandler[RefreshTokensCommand, AuthData]
     redis_service: BaseRedisService
 
     async def handle(self, command: RefreshTokensCommand) -> AuthData:
-        profile_id = await self.redis_service.pop(key=command.refresh_token)
+        # NOTE: the new refresh token doesn't depend on the profile, so the old one is consumed
+        # and the new one stored in a single atomic round trip (a token can't be refreshed twice)
+        refresh_token, refresh_expires = self.jwt_service.generate_refresh_token()
+        profile_id = await self.redis_service.rotate(
+            key=command.refresh_token,
+            new_key=refresh_token,
+            ttl=refresh_expires,
+        )
         if not profile_id:
             raise InvalidRefreshTokenException()
 
-        auth_data = self.jwt_service.generate_auth_tokens(profile_id=profile_id)
+        access_token, access_expires = self.jwt_service.generate_access_token(profile_id=profile_id)
 
-        await self.redis_service.set(
-            key=auth_data.refresh_token,
-            value=profile_id,
-            ttl=auth_data.refresh_expires,
+        return AuthData(
+            access_token=access_token,
+            access_expires=access_expires,
+            refresh_token=refresh_token,
+            refresh_expires=refresh_expires,
         )
-
-        return auth_data
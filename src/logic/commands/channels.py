@@ -3,7 +3,8 @@ from uuid import UUID
 
 from src.domain.entities.channels import Channel
 from src.domain.entities.users import Profile
-from src.infra.converters.channels import convert_channel_model_to_entity
+from src.infra.cache.channels import ChannelPageCache
+from src.infra.converters.channels import convert_channel_access_to_entity
 from src.infra.repositories.channels import BaseChannelRepository
 from src.logic.commands.base import BaseCommand, CommandHandler
 from src.logic.exceptions.channels import ChannelDoesNotExistsException, UserAlreadyDisconnectedFromChannelException, UserAlreadyMemberException
@@ -20,6 +21,7 @@ class CreateChannelCommand(BaseCommand):
 @dataclass(frozen=True)
 class CreateChannelCommandHandler(CommandHandler[CreateChannelCommand, Channel]):
     channel_repository: BaseChannelRepository
+    page_cache: ChannelPageCache
 
     async def handle(self, command: CreateChannelCommand) -> Channel:
         channel = Channel.create(
@@ -30,6 +32,8 @@ class CreateChannelCommandHandler(CommandHandler[CreateChannelCommand, Channel])
         )
 
         await self.channel_repository.create(author=command.author, channel=channel)
+        # NOTE: the author is the first member
+        await self.page_cache.bump_membership(profile_id=command.author.oid, channel_id=channel.oid)
         return channel
 
 
@@ -44,14 +48,15 @@ class UpdateChannelCommand(BaseCommand):
 @dataclass(frozen=True)
 class UpdateChannelCommandHandler(CommandHandler[UpdateChannelCommand, Channel]):
     channel_repository: BaseChannelRepository
+    page_cache: ChannelPageCache
 
     async def handle(self, command: UpdateChannelCommand) -> Channel:
-        channel_model = await self.channel_repository.get_channel_by_id(channel_id=command.channel_id)
+        channel_access = await self.channel_repository.get_channel_access(channel_id=command.channel_id)
 
-        if not channel_model:
+        if not channel_access or channel_access.is_deleted:
             raise ChannelDoesNotExistsException(channel_id=command.channel_id)
 
-        channel = convert_channel_model_to_entity(channel_model)
+        channel = convert_channel_access_to_entity(channel_access)
         channel.update(
             name=command.name,
             description=command.description,
@@ -59,6 +64,7 @@ class UpdateChannelCommandHandler(CommandHandler[UpdateChannelCommand, Channel])
         )
 
         await self.channel_repository.update_channel(channel=channel)
+        await self.page_cache.bump_channel(channel_id=channel.oid)
         return channel
 
 
@@ -70,17 +76,19 @@ class DeleteChannelCommand(BaseCommand):
 @dataclass(frozen=True)
 class DeleteChannelCommandHandler(CommandHandler[DeleteChannelCommand, None]):
     channel_repository: BaseChannelRepository
+    page_cache: ChannelPageCache
 
     async def handle(self, command: DeleteChannelCommand) -> None:
-        channel_model = await self.channel_repository.get_channel_by_id(channel_id=command.channel_id)
+        channel_access = await self.channel_repository.get_channel_access(channel_id=command.channel_id)
 
-        if not channel_model:
+        if not channel_access or channel_access.is_deleted:
             raise ChannelDoesNotExistsException(channel_id=command.channel_id)
 
-        channel = convert_channel_model_to_entity(channel_model)
+        channel = convert_channel_access_to_entity(channel_access)
         channel.delete()
 
         await self.channel_repository.delete_channel_by_id(channel_id=command.channel_id)
+        await self.page_cache.bump_deletion(channel_id=command.channel_id)
 
 
 @dataclass(frozen=True)
@@ -92,24 +100,25 @@ class ConnectToChannelCommand(BaseCommand):
 @dataclass(frozen=True)
 class ConnectToChannelCommandHandler(CommandHandler[ConnectToChannelCommand, Channel]):
     channel_repository: BaseChannelRepository
+    page_cache: ChannelPageCache
 
     async def handle(self, command: ConnectToChannelCommand) -> Channel:
-        channel_model = await self.channel_repository.get_channel_by_id(
-            profile_id=command.profile_id,
+        channel_access = await self.channel_repository.get_channel_access(
             channel_id=command.channel_id,
-            check_on_member=False,
+            profile_id=command.profile_id,
         )
-        if not channel_model:
+        if not channel_access or channel_access.is_deleted:
             raise ChannelDoesNotExistsException(channel_id=command.channel_id)
 
-        joined = await self.channel_repository.connect_to_channel(
+        # NOTE: the upsert reports a concurrent join of the same profile that happened after the check
+        if channel_access.is_member or not await self.channel_repository.connect_to_channel(
             channel_id=command.channel_id,
             profile_id=command.profile_id,
-        )
-        if not joined:
+        ):
             raise UserAlreadyMemberException(channel_id=command.channel_id, profile_id=command.profile_id)
 
-        return convert_channel_model_to_entity(channel_model)
+        await self.page_cache.bump_membership(profile_id=command.profile_id, channel_id=command.channel_id)
+        return convert_channel_access_to_entity(channel_access)
 
 
 @dataclass(frozen=True)
@@ -121,21 +130,23 @@ class DisconnectFromChannelCommand(BaseCommand):
 @dataclass(frozen=True)
 class DisconnectFromChannelCommandHandler(CommandHandler[DisconnectFromChannelCommand, None]):
     channel_repository: BaseChannelRepository
+    page_cache: ChannelPageCache
 
     async def handle(self, command: DisconnectFromChannelCommand) -> None:
-        channel_model = await self.channel_repository.get_channel_by_id(
-            profile_id=command.profile_id,
+        channel_access = await self.channel_repository.get_channel_access(
             channel_id=command.channel_id,
+            profile_id=command.profile_id,
         )
-        if not channel_model:
+        if not channel_access or channel_access.is_deleted:
             raise ChannelDoesNotExistsException(channel_id=command.channel_id)
 
-        disconnected = await self.channel_repository.disconnect_from_channel(
+        if not channel_access.is_member or not await self.channel_repository.disconnect_from_channel(
             channel_id=command.channel_id,
             profile_id=command.profile_id,
-        )
-        if not disconnected:
+        ):
             raise UserAlreadyDisconnectedFromChannelException(
                 channel_id=command.channel_id,
                 profile_id=command.profile_id,
             )
+
+        await self.page_cache.bump_membership(profile_id=command.profile_id, channel_id=command.channel_id)
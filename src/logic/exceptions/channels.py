@@ -23,6 +23,16 @@ class UserAlreadyMemberException(LogicException):
         return f"The user ({str(self.profile_id)}) is already a member of a channel ({str(self.channel_id)})"
 
 
+@dataclass(eq=False)
+class UserIsNotMemberException(LogicException):
+    channel_id: UUID
+    profile_id: UUID
+
+    @property
+    def message(self) -> str:
+        return f"The user ({str(self.profile_id)}) is not a member of a channel ({str(self.channel_id)})"
+
+
 @dataclass(eq=False)
 class UserAlreadyDisconnectedFromChannelException(LogicException):
     channel_id: UUID
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import timedelta
 
 from src.logic.exceptions.base import LogicException
 
@@ -10,3 +11,24 @@ class CommandHandlersNotRegisteredException(LogicException):
     @property
     def message(self) -> str:
         return f"CommandHandler has not been registered for: {self.command_type}"
+
+
+@dataclass(eq=False)
+class MediatorFrozenException(LogicException):
+    @property
+    def message(self) -> str:
+        return "Handlers can't be registered after the mediator has been frozen"
+
+
+@dataclass(eq=False)
+class CommandHandlerTimeoutException(LogicException):
+    command_type: type
+    handler_type: type
+    timeout: timedelta
+
+    @property
+    def message(self) -> str:
+        return (
+            f"{self.handler_type.__name__} hasn't handled {self.command_type.__name__} "
+            f"in {self.timeout.total_seconds()} seconds"
+        )
@@ -2,9 +2,14 @@ from functools import lru_cache
 
 from punq import Container, Scope
 
+from src.infra.cache.channels import ChannelPageCache
+from src.infra.cache.tokens import ProfileTokenCache
+from src.infra.cache.users import CredentialsCache, ProfileCache
+from src.infra.database import DatabaseManager
 from src.infra.repositories.channels import BaseChannelRepository, ChannelRepository
 from src.infra.repositories.users import UserUoW
 from src.infra.services.jwt import BaseJWTService, JWTService
+from src.infra.services.passwords import BasePasswordService, PasswordService
 from src.infra.services.redis import BaseRedisService, RedisService
 from src.logic.commands.auth import ExtractProfileFromJWTTokenCommand, ExtractProfileFromJWTTokenHandler, \
     LoginCommand, LoginCommandHandler, RefreshTokensCommand, RefreshTokensCommandHandler, RegisterCommandHandler, \
@@ -13,8 +18,10 @@ from src.logic.commands.channels import ConnectToChannelCommand, ConnectToChanne
     CreateChannelCommandHandler, DeleteChannelCommand, DeleteChannelCommandHandler, DisconnectFromChannelCommand, \
     DisconnectFromChannelCommandHandler, UpdateChannelCommand, UpdateChannelCommandHandler
 from src.logic.init.mediator import Mediator
+from src.logic.middlewares.metrics import MetricsMiddleware
 from src.logic.queries.channels import GetAllChannelMembersQuery, GetAllChannelMembersQueryHandler, \
-    GetAllChannelsQuery, GetAllChannelsQueryHandler, GetChannelByOidQuery, GetChannelByOidQueryHandler
+    GetAllChannelsQuery, GetAllChannelsQueryHandler, GetChannelByOidQuery, GetChannelByOidQueryHandler, \
+    GetChannelVersionQuery, GetChannelVersionQueryHandler, StreamChannelMembersQuery, StreamChannelMembersQueryHandler
 from src.settings.config import settings
 
 
@@ -23,6 +30,12 @@ def init_container() -> Container:
     return _init_container()
 
 
+@lru_cache(1)
+def init_mediator() -> Mediator:
+    """Process-wide mediator, built once on first use and shared by every request."""
+    return init_container().resolve(Mediator)
+
+
 def _init_container() -> Container:
     container = Container()
 
@@ -32,109 +45,176 @@ def _init_container() -> Container:
     def redis_factory() -> BaseRedisService:
         return RedisService(settings())
 
-    container.register(BaseChannelRepository, factory=ChannelRepository, scope=Scope.singleton)
-    container.register(UserUoW, factory=UserUoW, scope=Scope.singleton)
-    container.register(BaseRedisService, factory=redis_factory, scope=Scope.singleton)
-    container.register(BaseJWTService, factory=jwt_factory, scope=Scope.singleton)
+    def database_factory() -> DatabaseManager:
+        return DatabaseManager(settings())
 
-    def init_mediator() -> Mediator:
-        mediator = Mediator()
+    def channel_repository_factory() -> BaseChannelRepository:
+        return ChannelRepository(container.resolve(DatabaseManager), settings())
 
-		# Authenticate handlers
-        register_new_user_handler = RegisterCommandHandler(
-            user_uow=container.resolve(UserUoW),
-        )
-        user_login_handler = LoginCommandHandler(
-            jwt_service=container.resolve(BaseJWTService),
-            redis_service=container.resolve(BaseRedisService),
-            user_uow=container.resolve(UserUoW),
-        )
-        extract_profile_handler = ExtractProfileFromJWTTokenHandler(
-            jwt_service=container.resolve(BaseJWTService),
-            user_uow=container.resolve(UserUoW),
-        )
-        refresh_tokens_handler = RefreshTokensCommandHandler(
-            jwt_service=container.resolve(BaseJWTService),
-            redis_service=container.resolve(BaseRedisService),
-        )
+    def token_cache_factory() -> ProfileTokenCache:
+        return ProfileTokenCache(settings())
 
-        # Channel handlers
-        get_all_channels_handler = GetAllChannelsQueryHandler(
-            channel_repository=container.resolve(BaseChannelRepository),
-        )
-        get_channel_by_oid_handler = GetChannelByOidQueryHandler(
-            channel_repository=container.resolve(BaseChannelRepository),
-        )
-        create_channel_handler = CreateChannelCommandHandler(
-            channel_repository=container.resolve(BaseChannelRepository),
-        )
-        update_channel_handler = UpdateChannelCommandHandler(
-            channel_repository=container.resolve(BaseChannelRepository),
-        )
-        delete_channel_handler = DeleteChannelCommandHandler(
-            channel_repository=container.resolve(BaseChannelRepository),
-        )
-        get_all_members_of_channel_handler = GetAllChannelMembersQueryHandler(
-            channel_repository=container.resolve(BaseChannelRepository),
-        )
-        connect_to_channel_handler = ConnectToChannelCommandHandler(
-            channel_repository=container.resolve(BaseChannelRepository),
-        )
-        disconnect_from_channel_handler = DisconnectFromChannelCommandHandler(
-            channel_repository=container.resolve(BaseChannelRepository),
-        )
+    def profile_cache_factory() -> ProfileCache:
+        return ProfileCache(settings(), container.resolve(BaseRedisService))
 
-        mediator.register_command(
-            command=RegisterCommand,
-            command_handlers=[register_new_user_handler],
-        )
-        mediator.register_command(
-            command=LoginCommand,
-            command_handlers=[user_login_handler],
-        )
-        mediator.register_command(
-            command=ExtractProfileFromJWTTokenCommand,
-            command_handlers=[extract_profile_handler],
-        )
-        mediator.register_command(
-            command=RefreshTokensCommand,
-            command_handlers=[refresh_tokens_handler],
-        )
-        mediator.register_query(
-            query=GetAllChannelsQuery,
-            query_handler=get_all_channels_handler,
-        )
-        mediator.register_query(
-            query=GetChannelByOidQuery,
-            query_handler=get_channel_by_oid_handler,
-        )
-        mediator.register_command(
-            command=CreateChannelCommand,
-            command_handlers=[create_channel_handler],
-        )
-        mediator.register_command(
-            command=UpdateChannelCommand,
-            command_handlers=[update_channel_handler],
-        )
-        mediator.register_command(
-            command=DeleteChannelCommand,
-            command_handlers=[delete_channel_handler],
-        )
-        mediator.register_query(
-            query=GetAllChannelMembersQuery,
-            query_handler=get_all_members_of_channel_handler,
-        )
-        mediator.register_command(
-            command=ConnectToChannelCommand,
-            command_handlers=[connect_to_channel_handler],
-        )
-        mediator.register_command(
-            command=DisconnectFromChannelCommand,
-            command_handlers=[disconnect_from_channel_handler],
+    def credentials_cache_factory() -> CredentialsCache:
+        return CredentialsCache(settings(), container.resolve(BaseRedisService))
+
+    def page_cache_factory() -> ChannelPageCache:
+        return ChannelPageCache(settings(), container.resolve(BaseRedisService))
+
+    def user_uow_factory() -> UserUoW:
+        return UserUoW(
+            database=container.resolve(DatabaseManager),
+            profile_cache=container.resolve(ProfileCache),
+            credentials_cache=container.resolve(CredentialsCache),
         )
 
-        return mediator
+    def password_factory() -> BasePasswordService:
+        return PasswordService(settings())
 
-    container.register(Mediator, factory=init_mediator)
+    # NOTE: one engine (and connection pool) per process, sessions are opened per operation or unit of work
+    container.register(DatabaseManager, factory=database_factory, scope=Scope.singleton)
+    container.register(BaseChannelRepository, factory=channel_repository_factory, scope=Scope.singleton)
+    container.register(UserUoW, factory=user_uow_factory, scope=Scope.singleton)
+    container.register(BaseRedisService, factory=redis_factory, scope=Scope.singleton)
+    container.register(BaseJWTService, factory=jwt_factory, scope=Scope.singleton)
+    container.register(ProfileTokenCache, factory=token_cache_factory, scope=Scope.singleton)
+    container.register(ProfileCache, factory=profile_cache_factory, scope=Scope.singleton)
+    container.register(CredentialsCache, factory=credentials_cache_factory, scope=Scope.singleton)
+    container.register(ChannelPageCache, factory=page_cache_factory, scope=Scope.singleton)
+    container.register(BasePasswordService, factory=password_factory, scope=Scope.singleton)
+    container.register(MetricsMiddleware, factory=MetricsMiddleware, scope=Scope.singleton)
+
+    def mediator_factory() -> Mediator:
+        return _build_mediator(container)
+
+    container.register(Mediator, factory=mediator_factory, scope=Scope.singleton)
 
     return container
+
+
+def _build_mediator(container: Container) -> Mediator:
+    mediator = Mediator()
+    mediator.add_middleware(container.resolve(MetricsMiddleware))
+
+    # Authenticate handlers
+    register_new_user_handler = RegisterCommandHandler(
+        user_uow=container.resolve(UserUoW),
+        password_service=container.resolve(BasePasswordService),
+    )
+    user_login_handler = LoginCommandHandler(
+        jwt_service=container.resolve(BaseJWTService),
+        redis_service=container.resolve(BaseRedisService),
+        user_uow=container.resolve(UserUoW),
+        password_service=container.resolve(BasePasswordService),
+    )
+    extract_profile_handler = ExtractProfileFromJWTTokenHandler(
+        jwt_service=container.resolve(BaseJWTService),
+        user_uow=container.resolve(UserUoW),
+        token_cache=container.resolve(ProfileTokenCache),
+    )
+    refresh_tokens_handler = RefreshTokensCommandHandler(
+        jwt_service=container.resolve(BaseJWTService),
+        redis_service=container.resolve(BaseRedisService),
+    )
+
+    # Channel handlers
+    get_all_channels_handler = GetAllChannelsQueryHandler(
+        channel_repository=container.resolve(BaseChannelRepository),
+        page_cache=container.resolve(ChannelPageCache),
+    )
+    get_channel_by_oid_handler = GetChannelByOidQueryHandler(
+        channel_repository=container.resolve(BaseChannelRepository),
+    )
+    get_channel_version_handler = GetChannelVersionQueryHandler(
+        channel_repository=container.resolve(BaseChannelRepository),
+    )
+    create_channel_handler = CreateChannelCommandHandler(
+        channel_repository=container.resolve(BaseChannelRepository),
+        page_cache=container.resolve(ChannelPageCache),
+    )
+    update_channel_handler = UpdateChannelCommandHandler(
+        channel_repository=container.resolve(BaseChannelRepository),
+        page_cache=container.resolve(ChannelPageCache),
+    )
+    delete_channel_handler = DeleteChannelCommandHandler(
+        channel_repository=container.resolve(BaseChannelRepository),
+        page_cache=container.resolve(ChannelPageCache),
+    )
+    get_all_members_of_channel_handler = GetAllChannelMembersQueryHandler(
+        channel_repository=container.resolve(BaseChannelRepository),
+    )
+    stream_members_of_channel_handler = StreamChannelMembersQueryHandler(
+        channel_repository=container.resolve(BaseChannelRepository),
+    )
+    connect_to_channel_handler = ConnectToChannelCommandHandler(
+        channel_repository=container.resolve(BaseChannelRepository),
+        page_cache=container.resolve(ChannelPageCache),
+    )
+    disconnect_from_channel_handler = DisconnectFromChannelCommandHandler(
+        channel_repository=container.resolve(BaseChannelRepository),
+        page_cache=container.resolve(ChannelPageCache),
+    )
+
+    mediator.register_command(
+        command=RegisterCommand,
+        command_handlers=[register_new_user_handler],
+    )
+    mediator.register_command(
+        command=LoginCommand,
+        command_handlers=[user_login_handler],
+    )
+    mediator.register_command(
+        command=ExtractProfileFromJWTTokenCommand,
+        command_handlers=[extract_profile_handler],
+    )
+    mediator.register_command(
+        command=RefreshTokensCommand,
+        command_handlers=[refresh_tokens_handler],
+    )
+    mediator.register_query(
+        query=GetAllChannelsQuery,
+        query_handler=get_all_channels_handler,
+    )
+    mediator.register_query(
+        query=GetChannelByOidQuery,
+        query_handler=get_channel_by_oid_handler,
+        coalesce=True,
+    )
+    mediator.register_query(
+        query=GetChannelVersionQuery,
+        query_handler=get_channel_version_handler,
+        coalesce=True,
+    )
+    mediator.register_command(
+        command=CreateChannelCommand,
+        command_handlers=[create_channel_handler],
+    )
+    mediator.register_command(
+        command=UpdateChannelCommand,
+        command_handlers=[update_channel_handler],
+    )
+    mediator.register_command(
+        command=DeleteChannelCommand,
+        command_handlers=[delete_channel_handler],
+    )
+    mediator.register_query(
+        query=GetAllChannelMembersQuery,
+        query_handler=get_all_members_of_channel_handler,
+        coalesce=True,
+    )
+    mediator.register_query(
+        query=StreamChannelMembersQuery,
+        query_handler=stream_members_of_channel_handler,
+    )
+    mediator.register_command(
+        command=ConnectToChannelCommand,
+        command_handlers=[connect_to_channel_handler],
+    )
+    mediator.register_command(
+        command=DisconnectFromChannelCommand,
+        command_handlers=[disconnect_from_channel_handler],
+    )
+
+    return mediator.freeze()
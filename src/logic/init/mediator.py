@@ -1,48 +1,233 @@
-from collections import defaultdict
+import asyncio
+import logging
+
 from dataclasses import dataclass, field
-from typing import Iterable, Type
+from datetime import timedelta
+from enum import Enum
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Iterable, Mapping, Sequence, Type
 
+from src.infra.cache.flights import FlightStats, SingleFlight
 from src.logic.commands.base import CT, CommandHandler, CR, BaseCommand
-from src.logic.exceptions.mediator import CommandHandlersNotRegisteredException
+from src.logic.exceptions.mediator import (
+    CommandHandlersNotRegisteredException,
+    CommandHandlerTimeoutException,
+    MediatorFrozenException,
+)
+from src.logic.middlewares.base import MediatorMiddleware
 from src.logic.queries.base import QR, QT, BaseQuery, QueryHandler
 
 
+logger = logging.getLogger(__name__)
+
+
+class CommandExecution(Enum):
+    # NOTE: one after another in the order of registration, a failure skips the rest
+    SEQUENTIAL = "sequential"
+    # NOTE: at the same time in a task group, a failure cancels the rest
+    CONCURRENT = "concurrent"
+    # NOTE: at the same time after the command is handled, the caller gets no results and failures are only logged
+    BACKGROUND = "background"
+
+
+@dataclass(frozen=True)
+class CommandPolicy:
+    execution: CommandExecution = CommandExecution.SEQUENTIAL
+    # NOTE: limit of every handler call, not of the whole command
+    timeout: timedelta | None = None
+
+
+DEFAULT_COMMAND_POLICY = CommandPolicy()
+
+
 @dataclass(eq=False)
 class Mediator:
     # TODO: add events here
-    queries_map: dict[QT, QueryHandler] = field(
+    queries_map: Mapping[QT, QueryHandler] = field(
+        default_factory=dict,
+        kw_only=True,
+    )
+    commands_map: Mapping[CT, tuple[CommandHandler, ...]] = field(
+        default_factory=dict,
+        kw_only=True,
+    )
+    command_policies: Mapping[CT, CommandPolicy] = field(
         default_factory=dict,
         kw_only=True,
     )
-    commands_map: dict[CT, list[CommandHandler]] = field(
-        default_factory=lambda: defaultdict(list),
+    # NOTE: query types whose concurrent identical queries share one handler call
+    coalesced_queries: Mapping[QT, SingleFlight[BaseQuery, QR]] = field(
+        default_factory=dict,
+        kw_only=True,
+    )
+    middlewares: Sequence[MediatorMiddleware] = field(
+        default_factory=list,
+        kw_only=True,
+    )
+    is_frozen: bool = field(
+        default=False,
         kw_only=True,
     )
+    # NOTE: strong references of background handler calls, the event loop keeps weak ones only
+    _background_tasks: set[asyncio.Task] = field(
+        default_factory=set,
+        init=False,
+        repr=False,
+    )
 
-    def register_command(self, command: type(CT), command_handlers: Iterable[CommandHandler[CT, CR]]) -> None:
-        """Register command handlers for command by command type"""
-        self.commands_map[command].extend(command_handlers)
+    def register_command(
+        self,
+        command: type(CT),
+        command_handlers: Iterable[CommandHandler[CT, CR]],
+        policy: CommandPolicy | None = None,
+    ) -> None:
+        """
+        Register command handlers for command by command type.
+        :param policy: how the handlers of the command type are run, sequential without timeouts by default.
+            Replaces the policy given by earlier registrations of the command type.
+        """
+        if self.is_frozen:
+            raise MediatorFrozenException()
+        self.commands_map[command] = (*self.commands_map.get(command, ()), *command_handlers)
+        if policy is not None:
+            self.command_policies[command] = policy
 
-    def register_query(self, query: type(QT), query_handler: QueryHandler[QT, QR]) -> None:
-        """Register query handler for query by query type"""
+    def register_query(self, query: type(QT), query_handler: QueryHandler[QT, QR], coalesce: bool = False) -> None:
+        """
+        Register query handler for query by query type.
+        :param coalesce: run the handler once for equal queries handled at the same time, all callers get
+            the same result object or exception. Only for read-only queries whose results aren't mutated
+            and can be consumed more than once.
+        """
+        if self.is_frozen:
+            raise MediatorFrozenException()
         self.queries_map[query] = query_handler
+        if coalesce:
+            self.coalesced_queries[query] = SingleFlight()
+        else:
+            self.coalesced_queries.pop(query, None)
+
+    def add_middleware(self, middleware: MediatorMiddleware) -> None:
+        """Wrap handling of every command and query, middlewares added earlier run outermost"""
+        if self.is_frozen:
+            raise MediatorFrozenException()
+        self.middlewares.append(middleware)
+
+    def freeze(self) -> "Mediator":
+        """
+        Make the dispatch tables read-only once all handlers are registered.
+        :return: the same mediator, ready to be shared between requests
+        """
+        self.queries_map = MappingProxyType(dict(self.queries_map))
+        self.commands_map = MappingProxyType(dict(self.commands_map))
+        self.command_policies = MappingProxyType(dict(self.command_policies))
+        self.coalesced_queries = MappingProxyType(dict(self.coalesced_queries))
+        self.middlewares = tuple(self.middlewares)
+        self.is_frozen = True
+        return self
 
     async def handle_command(self, command: BaseCommand) -> Iterable[CR]:
         """
         Find command handler by command type and return handle result.
-        :return: iterable results of registered command handlers
+        Handlers run concurrently or in background get a copy of the context of the caller,
+        so such commands must not be handled inside a unit of work.
+        :return: iterable results of registered command handlers in the order of registration,
+            empty for background commands
         """
+        return await self.__through_middlewares(command, self.__dispatch_command)
+
+    async def handle_query(self, query: BaseQuery) -> QR:
+        """
+        Find query handler by query type and return handle result.
+        :return: results of registered query handler
+        """
+        return await self.__through_middlewares(query, self.__dispatch_query)
+
+    async def wait_for_background(self) -> None:
+        """Wait until handler calls of background commands started so far are done, on shutdown."""
+        while self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+    async def __through_middlewares(
+        self,
+        request: BaseCommand | BaseQuery,
+        dispatch: Callable[[Any], Awaitable[Any]],
+    ) -> Any:
+        call = partial(dispatch, request)
+        for middleware in reversed(self.middlewares):
+            call = partial(middleware, request, call)
+        return await call()
+
+    async def __dispatch_command(self, command: BaseCommand) -> Iterable[CR]:
         command_type: Type[CT] = command.__class__
         handlers = self.commands_map.get(command_type)
 
         if not handlers:
             raise CommandHandlersNotRegisteredException(command_type)
 
-        return [await handler.handle(command) for handler in handlers]
+        policy = self.command_policies.get(command_type, DEFAULT_COMMAND_POLICY)
 
-    async def handle_query(self, query: BaseQuery) -> QR:
-        """
-        Find query handler by query type and return handle result.
-        :return: results of registered query handler
-        """
-        return await self.queries_map[query.__class__].handle(query=query)
+        if policy.execution is CommandExecution.SEQUENTIAL:
+            return [await self.__run_handler(handler, command, policy.timeout) for handler in handlers]
+
+        if policy.execution is CommandExecution.BACKGROUND:
+            for handler in handlers:
+                task = asyncio.create_task(self.__run_in_background(handler, command, policy.timeout))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+            return []
+
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                tasks = [
+                    task_group.create_task(self.__run_handler(handler, command, policy.timeout))
+                    for handler in handlers
+                ]
+        except ExceptionGroup as errors:
+            # NOTE: callers expect errors of handlers as they are, the first one is raised like in sequential runs
+            raise errors.exceptions[0]
+        return [task.result() for task in tasks]
+
+    async def __dispatch_query(self, query: BaseQuery) -> QR:
+        query_handler = self.queries_map[query.__class__]
+        flights = self.coalesced_queries.get(query.__class__)
+
+        if flights is None:
+            return await query_handler.handle(query=query)
+        return await flights.run(query, lambda: query_handler.handle(query=query))
+
+    @staticmethod
+    async def __run_handler(handler: CommandHandler[CT, CR], command: BaseCommand, timeout: timedelta | None) -> CR:
+        if timeout is None:
+            return await handler.handle(command)
+
+        deadline = asyncio.timeout(timeout.total_seconds())
+        try:
+            async with deadline:
+                return await handler.handle(command)
+        except TimeoutError:
+            # NOTE: timeouts raised by the handler itself are passed as they are
+            if not deadline.expired():
+                raise
+            raise CommandHandlerTimeoutException(
+                command_type=command.__class__,
+                handler_type=handler.__class__,
+                timeout=timeout,
+            )
+
+    async def __run_in_background(
+        self,
+        handler: CommandHandler[CT, CR],
+        command: BaseCommand,
+        timeout: timedelta | None,
+    ) -> None:
+        try:
+            await self.__run_handler(handler, command, timeout)
+        except Exception:
+            logger.exception("Background handler %s failed for %s", handler.__class__.__name__, command)
+
+    @property
+    def coalescing_stats(self) -> Mapping[QT, FlightStats]:
+        """:return: counters of handled and collapsed queries by coalesced query type"""
+        return {query: flights.stats for query, flights in self.coalesced_queries.items()}
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from src.logic.commands.base import BaseCommand
+from src.logic.queries.base import BaseQuery
+
+
+@dataclass(frozen=True)
+class MediatorMiddleware(ABC):
+    """Wraps handling of every command and query, in the order of registration, the first one outermost."""
+    @abstractmethod
+    async def __call__(self, request: BaseCommand | BaseQuery, call_next: Callable[[], Awaitable[Any]]) -> Any:
+        """:return: result of `call_next`, the results of the handlers"""
+        ...
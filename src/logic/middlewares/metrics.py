@@ -0,0 +1,52 @@
+import time
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Mapping
+
+from src.infra.metrics.histograms import LatencyHistogram
+from src.infra.metrics.queries import count_queries
+from src.logic.commands.base import BaseCommand
+from src.logic.middlewares.base import MediatorMiddleware
+from src.logic.queries.base import BaseQuery
+
+
+@dataclass
+class RequestMetrics:
+    """Metrics of one command or query type."""
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # NOTE: by name of the exception type
+    errors: Counter[str] = field(default_factory=Counter)
+    in_flight: int = 0
+    # NOTE: statements sent to the database and their rows, summed over all calls
+    statements: int = 0
+    rows: int = 0
+
+
+@dataclass(frozen=True)
+class MetricsMiddleware(MediatorMiddleware):
+    """Records latency, errors, calls in progress and database statements by command and query type."""
+    _metrics: dict[type, RequestMetrics] = field(default_factory=dict, init=False, repr=False)
+
+    @property
+    def metrics(self) -> Mapping[type, RequestMetrics]:
+        return self._metrics
+
+    async def __call__(self, request: BaseCommand | BaseQuery, call_next: Callable[[], Awaitable[Any]]) -> Any:
+        metrics = self._metrics.get(request.__class__)
+        if metrics is None:
+            metrics = self._metrics[request.__class__] = RequestMetrics()
+
+        metrics.in_flight += 1
+        started_at = time.perf_counter()
+        with count_queries() as queries:
+            try:
+                return await call_next()
+            except Exception as exception:
+                metrics.errors[exception.__class__.__name__] += 1
+                raise
+            finally:
+                metrics.latency.record(time.perf_counter() - started_at)
+                metrics.in_flight -= 1
+                metrics.statements += queries.statements
+                metrics.rows += queries.rows
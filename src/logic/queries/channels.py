@@ -1,14 +1,16 @@
 from dataclasses import dataclass
-from typing import Iterable
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
 from src.domain.entities.channels import Channel
 from src.domain.entities.users import Profile
-from src.infra.converters.channels import convert_channel_model_to_entity
-from src.infra.converters.users import convert_profile_model_to_entity
-from src.infra.filters.channels import GetAllChannelsInfraFilters
+from src.infra.cache.channels import ChannelPageCache
+from src.infra.converters.channels import convert_channel_dto_to_entity
+from src.infra.converters.users import convert_channel_member_to_entity
+from src.infra.dto.channels import ChannelVersionDTO
+from src.infra.filters.channels import ChannelsCursor, GetAllChannelsInfraFilters, GetChannelMembersInfraFilters
 from src.infra.repositories.channels import BaseChannelRepository
-from src.logic.exceptions.channels import ChannelDoesNotExistsException
+from src.logic.exceptions.channels import ChannelDoesNotExistsException, UserIsNotMemberException
 from src.logic.queries.base import BaseQuery, QueryHandler
 
 
@@ -19,16 +21,20 @@ class GetAllChannelsQuery(BaseQuery):
 
 
 @dataclass(frozen=True)
-class GetAllChannelsQueryHandler(QueryHandler[GetAllChannelsQuery, tuple[Iterable[Channel], int]]):
+class GetAllChannelsQueryHandler(
+    QueryHandler[GetAllChannelsQuery, tuple[Iterable[Channel], int | None, ChannelsCursor | None]],
+):
     channel_repository: BaseChannelRepository
+    page_cache: ChannelPageCache
 
-    async def handle(self, query: GetAllChannelsQuery) -> tuple[Iterable[Channel], int]:
-        channel_models, channels_count = await self.channel_repository.get_all_channels(
-            filters=query.filters,
+    async def handle(self, query: GetAllChannelsQuery) -> tuple[Iterable[Channel], int | None, ChannelsCursor | None]:
+        channel_dtos, channels_count, next_cursor = await self.page_cache.get_or_load(
             profile_id=query.profile_id,
+            filters=query.filters,
+            load=lambda: self.channel_repository.get_all_channels(filters=query.filters, profile_id=query.profile_id),
         )
-        channels = list(map(lambda model: convert_channel_model_to_entity(model), channel_models))
-        return channels, channels_count
+        channels = list(map(convert_channel_dto_to_entity, channel_dtos))
+        return channels, channels_count, next_cursor
 
 
 @dataclass(frozen=True)
@@ -42,28 +48,85 @@ class GetChannelByOidQueryHandler(QueryHandler[GetChannelByOidQuery, Channel]):
     channel_repository: BaseChannelRepository
 
     async def handle(self, query: GetChannelByOidQuery) -> Channel:
-        channel_model = await self.channel_repository.get_channel_by_id(
+        channel_dto = await self.channel_repository.get_channel_by_id(
             channel_id=query.channel_id,
             profile_id=query.profile_id,
             check_on_member=True,
         )
 
-        if not channel_model:
+        if not channel_dto:
             raise ChannelDoesNotExistsException(channel_id=query.channel_id)
 
-        return convert_channel_model_to_entity(channel_model=channel_model)
+        return convert_channel_dto_to_entity(channel_dto)
+
+
+@dataclass(frozen=True)
+class GetChannelVersionQuery(BaseQuery):
+    channel_id: UUID
+    # NOTE: membership is checked as by `GetChannelByOidQuery` when given
+    profile_id: UUID | None = None
+
+
+@dataclass(frozen=True)
+class GetChannelVersionQueryHandler(QueryHandler[GetChannelVersionQuery, ChannelVersionDTO | None]):
+    channel_repository: BaseChannelRepository
+
+    async def handle(self, query: GetChannelVersionQuery) -> ChannelVersionDTO | None:
+        """:return: None if the channel can't be read, the full read reports why"""
+        return await self.channel_repository.get_channel_version(
+            channel_id=query.channel_id,
+            profile_id=query.profile_id,
+        )
+
+
+async def check_member_access(channel_repository: BaseChannelRepository, channel_id: UUID, profile_id: UUID) -> None:
+    """:raises UserIsNotMemberException: if the profile isn't a connected member of the channel"""
+    channel_access = await channel_repository.get_channel_access(channel_id=channel_id, profile_id=profile_id)
+    if not channel_access or channel_access.is_deleted:
+        raise ChannelDoesNotExistsException(channel_id=channel_id)
+    if not channel_access.is_member:
+        raise UserIsNotMemberException(channel_id=channel_id, profile_id=profile_id)
 
 
 @dataclass(frozen=True)
 class GetAllChannelMembersQuery(BaseQuery):
     channel_id: UUID
+    filters: GetChannelMembersInfraFilters
+    profile_id: UUID
+
+
+@dataclass(frozen=True)
+class GetAllChannelMembersQueryHandler(
+    QueryHandler[GetAllChannelMembersQuery, tuple[Iterable[Profile], ChannelsCursor | None]],
+):
+    channel_repository: BaseChannelRepository
+
+    async def handle(self, query: GetAllChannelMembersQuery) -> tuple[Iterable[Profile], ChannelsCursor | None]:
+        """:raises UserIsNotMemberException: only members of a channel can read its members"""
+        await check_member_access(self.channel_repository, query.channel_id, query.profile_id)
+        members, next_cursor = await self.channel_repository.get_members_by_channel_id(
+            channel_id=query.channel_id,
+            filters=query.filters,
+        )
+        profiles = list(map(convert_channel_member_to_entity, members))
+        return profiles, next_cursor
+
+
+@dataclass(frozen=True)
+class StreamChannelMembersQuery(BaseQuery):
+    channel_id: UUID
+    profile_id: UUID
 
 
 @dataclass(frozen=True)
-class GetAllChannelMembersQueryHandler(QueryHandler[GetAllChannelMembersQuery, Iterable[Profile]]):
+class StreamChannelMembersQueryHandler(QueryHandler[StreamChannelMembersQuery, AsyncIterator[Profile]]):
     channel_repository: BaseChannelRepository
 
-    async def handle(self, query: GetAllChannelMembersQuery) -> Iterable[Profile]:
-        member_models = await self.channel_repository.get_members_by_channel_id(channel_id=query.channel_id)
-        profiles = list(map(lambda model: convert_profile_model_to_entity(model), member_models))
-        return profiles
+    async def handle(self, query: StreamChannelMembersQuery) -> AsyncIterator[Profile]:
+        """
+        :return: lazy iterator, members are fetched while it is consumed
+        :raises UserIsNotMemberException: only members of a channel can export its members
+        """
+        await check_member_access(self.channel_repository, query.channel_id, query.profile_id)
+        members = self.channel_repository.stream_members_by_channel_id(channel_id=query.channel_id)
+        return (convert_channel_member_to_entity(member) async for member in members)
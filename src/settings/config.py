@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -12,11 +13,41 @@ class Settings(BaseSettings):
 	POSTGRES_HOST: str = Field(default="postgres", alias="POSTGRES_HOST")
 	POSTGRES_PORT: int = Field(default=5432, alias="POSTGRES_PORT")
 	POSTGRES_DB: str = Field(default="communet_db", alias="POSTGRES_DB")
+	DB_POOL_SIZE: int = Field(default=10, alias="DB_POOL_SIZE")
+	DB_MAX_OVERFLOW: int = Field(default=10, alias="DB_MAX_OVERFLOW")
+	DB_POOL_TIMEOUT: float = Field(default=30.0, alias="DB_POOL_TIMEOUT")
+	DB_POOL_RECYCLE: int = Field(default=1800, alias="DB_POOL_RECYCLE")
+	DB_POOL_PRE_PING: bool = Field(default=True, alias="DB_POOL_PRE_PING")
+	DB_STATEMENT_CACHE_SIZE: int = Field(default=100, alias="DB_STATEMENT_CACHE_SIZE")
+	DB_CONNECT_TIMEOUT: float = Field(default=10.0, alias="DB_CONNECT_TIMEOUT")
+	DB_COMMAND_TIMEOUT: float | None = Field(default=None, alias="DB_COMMAND_TIMEOUT")
+	DB_RAISELOAD: bool = Field(default=False, alias="DB_RAISELOAD")
+	SLOW_QUERY_THRESHOLD_MS: float | None = Field(default=None, alias="SLOW_QUERY_THRESHOLD_MS")
+	SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = Field(default=0.0, ge=0.0, le=1.0, alias="SLOW_QUERY_EXPLAIN_SAMPLE_RATE")
+	SLOW_QUERY_LOG_PATH: str = Field(default="slow_queries.log", alias="SLOW_QUERY_LOG_PATH")
+	SLOW_QUERY_LOG_MAX_BYTES: int = Field(default=10 * 1024 * 1024, alias="SLOW_QUERY_LOG_MAX_BYTES")
+	SLOW_QUERY_LOG_BACKUPS: int = Field(default=5, alias="SLOW_QUERY_LOG_BACKUPS")
 	REDIS_HOST: str = Field(default="redis", alias="REDIS_HOST")
 	REDIS_PORT: int = Field(default=6379, alias="REDIS_PORT")
 	REDIS_DB: int = Field(default=0, alias="REDIS_DB")
 	JWT_EXPIRES_IN_MINUTES: int = Field(default=15, alias="JWT_EXPIRES_IN_MINUTES")
 	REFRESH_EXPIRES_IN_DAYS: int = Field(default=7, alias="REFRESH_EXPIRES_IN_DAYS")
+	AUTH_CACHE_SIZE: int = Field(default=10_000, alias="AUTH_CACHE_SIZE")
+	AUTH_CACHE_TTL_SECONDS: float = Field(default=60.0, alias="AUTH_CACHE_TTL_SECONDS")
+	USER_CACHE_SIZE: int = Field(default=10_000, alias="USER_CACHE_SIZE")
+	USER_CACHE_TTL_SECONDS: float = Field(default=300.0, alias="USER_CACHE_TTL_SECONDS")
+	USER_CACHE_LOCAL_TTL_SECONDS: float = Field(default=5.0, alias="USER_CACHE_LOCAL_TTL_SECONDS")
+	USER_CACHE_EARLY_REFRESH_BETA: float = Field(default=1.0, alias="USER_CACHE_EARLY_REFRESH_BETA")
+	PASSWORD_HASHER_EXECUTOR: Literal["thread", "process"] = Field(default="thread", alias="PASSWORD_HASHER_EXECUTOR")
+	PASSWORD_HASHER_WORKERS: int = Field(default=4, alias="PASSWORD_HASHER_WORKERS")
+	PASSWORD_HASHER_MAX_PENDING: int = Field(default=64, alias="PASSWORD_HASHER_MAX_PENDING")
+	CHANNEL_MEMBER_COUNT_SHARD_THRESHOLD: int = Field(default=1000, alias="CHANNEL_MEMBER_COUNT_SHARD_THRESHOLD")
+	CHANNEL_MEMBER_COUNT_SHARDS: int = Field(default=16, alias="CHANNEL_MEMBER_COUNT_SHARDS")
+	CHANNEL_PAGE_CACHE_TTL_SECONDS: float = Field(default=300.0, alias="CHANNEL_PAGE_CACHE_TTL_SECONDS")
+	MEMBERS_EXPORT_MAX_SECONDS: float = Field(default=300.0, alias="MEMBERS_EXPORT_MAX_SECONDS")
+	MEMBERS_EXPORT_IDLE_SECONDS: float = Field(default=30.0, alias="MEMBERS_EXPORT_IDLE_SECONDS")
+	SERVER_TIMING_HEADER: bool = Field(default=False, alias="SERVER_TIMING_HEADER")
+	ACCESS_LOG: bool = Field(default=True, alias="ACCESS_LOG")
 
 	def get_db_url(self) -> str:
 		return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from src.application.api.channels.schemas import GetAllChannelMembersResponse, GetAllChannelsResponseSchema
+from src.infra.converters.channels import convert_channel_dto_to_entity
+from src.infra.converters.users import convert_channel_member_to_entity
+from src.infra.dto.channels import ChannelDTO, ChannelMemberDTO
+from src.infra.filters.channels import ChannelsCursor
+
+
+NOW = datetime.now(timezone.utc)
+CURSOR = ChannelsCursor(created_at=NOW, oid=uuid4())
+
+
+def test_channels_page_serializes_as_validated_schema() -> None:
+    channels = [
+        convert_channel_dto_to_entity(ChannelDTO(uuid4(), "first channel", "description", None, False, 3)),
+        convert_channel_dto_to_entity(ChannelDTO(uuid4(), "second channel", None, "avatar.png", True, 0)),
+    ]
+    arguments = {"count": 2, "limit": 2, "offset": 0, "entities": channels, "next_cursor": CURSOR}
+
+    payload = GetAllChannelsResponseSchema.serialize_entity(**arguments)
+
+    assert payload == GetAllChannelsResponseSchema.from_entity(**arguments).model_dump_json().encode()
+
+
+def test_members_page_serializes_as_validated_schema() -> None:
+    members = [
+        convert_channel_member_to_entity(ChannelMemberDTO(
+            uuid4(), f"member_{number}", None, uuid4(), f"member_{number}", f"member_{number}@mail.com", NOW, uuid4(),
+        ))
+        for number in range(2)
+    ]
+
+    for next_cursor in (None, CURSOR):
+        payload = GetAllChannelMembersResponse.serialize_entity(members, next_cursor=next_cursor)
+
+        assert payload == GetAllChannelMembersResponse.from_entity(members, next_cursor).model_dump_json().encode()
@@ -0,0 +1,57 @@
+import pytest
+
+from dataclasses import dataclass
+
+from src.application.api.metrics.exposition import MetricsWriter, write_mediator_metrics
+from src.logic.init.mediator import Mediator
+from src.logic.middlewares.metrics import MetricsMiddleware
+from src.logic.queries.base import BaseQuery, QueryHandler
+
+
+pytest_plugin = ("pytest_asyncio")
+
+
+@dataclass(frozen=True)
+class FailingQuery(BaseQuery):
+    ...
+
+
+@dataclass(frozen=True)
+class FailingQueryHandler(QueryHandler[FailingQuery, None]):
+    async def handle(self, query: FailingQuery) -> None:
+        raise ValueError()
+
+
+def test_writer() -> None:
+    writer = MetricsWriter()
+    writer.family("requests_total", "counter", "Requests.")
+    writer.sample("requests_total", 3, path='/a"b')
+    writer.sample("requests_total", 0.5)
+
+    assert writer.render() == (
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{path="/a\\"b"} 3\n'
+        "requests_total 0.5\n"
+    )
+
+
+@pytest.mark.asyncio
+async def test_mediator_metrics() -> None:
+    middleware = MetricsMiddleware()
+    mediator = Mediator()
+    mediator.add_middleware(middleware)
+    mediator.register_query(query=FailingQuery, query_handler=FailingQueryHandler(), coalesce=True)
+    mediator.freeze()
+
+    with pytest.raises(ValueError):
+        await mediator.handle_query(FailingQuery())
+
+    writer = MetricsWriter()
+    write_mediator_metrics(writer, mediator, middleware)
+    metrics = writer.render()
+
+    assert 'mediator_request_duration_seconds_count{kind="query",name="FailingQuery"} 1' in metrics
+    assert 'mediator_request_errors_total{kind="query",name="FailingQuery",error="ValueError"} 1' in metrics
+    assert 'mediator_requests_in_flight{kind="query",name="FailingQuery"} 0' in metrics
+    assert 'mediator_coalesced_queries_total{name="FailingQuery"} 0' in metrics
@@ -0,0 +1,31 @@
+import pytest
+
+from src.application.api.responses import etag_matches, make_etag
+
+
+def test_etag_is_stable_and_quoted() -> None:
+    etag = make_etag("2026-10-18", 3)
+
+    assert etag == make_etag("2026-10-18", 3)
+    assert etag != make_etag("2026-10-18", 4)
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+@pytest.mark.parametrize(
+    "if_none_match, matches",
+    [
+        (None, False),
+        ("", False),
+        ("*", True),
+        ('"{etag}"', True),
+        ('W/"{etag}"', True),
+        ('"other", "{etag}"', True),
+        ('"other"', False),
+    ],
+)
+def test_etag_matches(if_none_match: str | None, matches: bool) -> None:
+    etag = make_etag("channel")
+    if if_none_match:
+        if_none_match = if_none_match.replace('"{etag}"', etag)
+
+    assert etag_matches(if_none_match, etag) is matches
@@ -0,0 +1,61 @@
+import json
+import logging
+import pytest
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.application.api.timing import ServerTimingMiddleware
+from src.infra.metrics.timing import span, timed
+
+
+pytest_plugin = ("pytest_asyncio")
+
+
+@timed("redis")
+async def read_cache() -> None:
+    ...
+
+
+def make_app(send_header: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/")
+    async def endpoint() -> dict:
+        with span("db"):
+            await read_cache()
+            await read_cache()
+        return {}
+
+    app.add_middleware(ServerTimingMiddleware, send_header=send_header, log_access=True)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_server_timing(caplog) -> None:
+    caplog.set_level(logging.INFO, logger="communet.access")
+
+    async with AsyncClient(transport=ASGITransport(app=make_app(send_header=True)), base_url="http://test") as client:
+        response = await client.get("/")
+
+    metrics = [metric.split(";")[0] for metric in response.headers["Server-Timing"].split(", ")]
+    assert metrics == ["app", "redis", "db"]
+    assert response.headers["Server-Timing"].split(", ")[1].endswith('desc="2x"')
+
+    record = json.loads(caplog.records[-1].message)
+    assert record["status"] == 200
+    assert record["phases"]["redis"]["count"] == 2
+    assert record["phases"]["db"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_header_is_optional() -> None:
+    async with AsyncClient(transport=ASGITransport(app=make_app(send_header=False)), base_url="http://test") as client:
+        response = await client.get("/")
+
+    assert "Server-Timing" not in response.headers
+
+
+def test_spans_outside_of_requests_are_ignored() -> None:
+    with span("db"):
+        ...
@@ -84,3 +84,14 @@ def test_invalid_password() -> None:
 
     password = Password(valid_password)
     assert Password.check_passwords(password1=invalid_password, password2=password.as_generic_type()) is False
+
+
+def test_trusted_values() -> None:
+    # NOTE: values read from storage were validated when written, so invalid ones aren't rejected here
+    username = Username.trusted("12")
+    email = Email.trusted("stored@mail.com")
+
+    assert isinstance(username, Username)
+    assert username.as_generic_type() == "12"
+    assert email == Email("stored@mail.com")
+    assert not hasattr(email, "__dict__")
@@ -0,0 +1,66 @@
+import asyncio
+
+from datetime import timedelta
+from typing import AsyncIterator, Optional, Sequence
+
+from redis.exceptions import ConnectionError
+
+from src.infra.services.redis import BaseRedisService
+
+
+class InMemoryRedisService(BaseRedisService):
+    """Redis shared by several cache instances standing for nodes, without expiration."""
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.subscribers: list[asyncio.Queue] = []
+        self.available = True
+
+    async def get(self, key: str) -> Optional[str]:
+        self.__check()
+        return self.values.get(key)
+
+    async def set(self, key: str, value: str, ttl: timedelta) -> bool:
+        self.__check()
+        self.values[key] = value
+        return True
+
+    async def delete(self, key: str) -> bool:
+        self.__check()
+        return self.values.pop(key, None) is not None
+
+    async def pop(self, key: str) -> Optional[str]:
+        return self.values.pop(key, None)
+
+    async def rotate(self, key: str, new_key: str, ttl: timedelta) -> Optional[str]:
+        self.__check()
+        value = self.values.pop(key, None)
+        if value is not None:
+            self.values[new_key] = value
+        return value
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[str]]:
+        self.__check()
+        return [self.values.get(key) for key in keys]
+
+    async def stamp(self, sequence_key: str, keys: Sequence[str]) -> int:
+        self.__check()
+        sequence = int(self.values.get(sequence_key, 0)) + 1
+        for key in (sequence_key, *keys):
+            self.values[key] = str(sequence)
+        return sequence
+
+    async def publish(self, channel: str, message: str) -> int:
+        self.__check()
+        for subscriber in self.subscribers:
+            subscriber.put_nowait(message)
+        return len(self.subscribers)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        queue = asyncio.Queue()
+        self.subscribers.append(queue)
+        while True:
+            yield await queue.get()
+
+    def __check(self) -> None:
+        if not self.available:
+            raise ConnectionError("Redis is down")
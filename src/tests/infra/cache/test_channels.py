@@ -0,0 +1,99 @@
+import pytest
+
+from uuid import uuid4
+
+from src.infra.cache.channels import ChannelPageCache, ChannelsPage
+from src.infra.dto.channels import ChannelDTO
+from src.infra.filters.channels import GetAllChannelsInfraFilters
+from src.settings.config import settings
+from src.tests.infra.cache.redis import InMemoryRedisService
+
+
+pytest_plugin = ("pytest_asyncio")
+
+FILTERS = GetAllChannelsInfraFilters()
+
+
+class PageLoader:
+    def __init__(self, *channels: ChannelDTO) -> None:
+        self.channels = list(channels)
+        self.calls = 0
+        self.during_load = None
+
+    async def __call__(self) -> ChannelsPage:
+        self.calls += 1
+        channels = list(self.channels)
+        if self.during_load:
+            await self.during_load()
+        return channels, len(channels), None
+
+
+def make_channel(name: str = "channel") -> ChannelDTO:
+    return ChannelDTO(oid=uuid4(), name=name, description=None, avatar=None, is_deleted=False, member_count=1)
+
+
+@pytest.mark.asyncio
+async def test_page_is_served_until_it_changes() -> None:
+    cache = ChannelPageCache(settings(), InMemoryRedisService())
+    profile_id, channel = uuid4(), make_channel()
+    load = PageLoader(channel)
+
+    assert await cache.get_or_load(profile_id, FILTERS, load) == ([channel], 1, None)
+    assert await cache.get_or_load(profile_id, FILTERS, load) == ([channel], 1, None)
+    assert await cache.get_or_load(profile_id, GetAllChannelsInfraFilters(limit=5), load) == ([channel], 1, None)
+    assert load.calls == 2
+
+    await cache.bump_channel(channel.oid)
+    await cache.get_or_load(profile_id, FILTERS, load)
+    await cache.bump_membership(profile_id, make_channel().oid)
+    await cache.get_or_load(profile_id, FILTERS, load)
+    await cache.bump_deletion(make_channel().oid)
+    await cache.get_or_load(profile_id, FILTERS, load)
+
+    assert load.calls == 5
+    assert cache.stats.hits == 1
+    assert cache.stats.stale == 1
+
+
+@pytest.mark.asyncio
+async def test_unrelated_changes_keep_pages() -> None:
+    cache = ChannelPageCache(settings(), InMemoryRedisService())
+    profile_id = uuid4()
+    load = PageLoader(make_channel())
+
+    await cache.get_or_load(profile_id, FILTERS, load)
+    await cache.bump_channel(make_channel().oid)
+    await cache.bump_membership(uuid4(), make_channel().oid)
+    await cache.get_or_load(profile_id, FILTERS, load)
+
+    assert load.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_change_committed_while_page_is_read() -> None:
+    cache = ChannelPageCache(settings(), InMemoryRedisService())
+    profile_id, channel = uuid4(), make_channel()
+    load = PageLoader(channel)
+    # NOTE: the page was read before the rename committed, the stamp comes after the read
+    load.during_load = lambda: cache.bump_channel(channel.oid)
+
+    await cache.get_or_load(profile_id, FILTERS, load)
+    load.during_load = None
+    await cache.get_or_load(profile_id, FILTERS, load)
+
+    assert load.calls == 2
+    assert cache.stats.stale == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_loading() -> None:
+    redis_service = InMemoryRedisService()
+    redis_service.available = False
+    cache = ChannelPageCache(settings(), redis_service)
+    load = PageLoader(make_channel())
+
+    await cache.get_or_load(uuid4(), FILTERS, load)
+    await cache.bump_channel(uuid4())
+
+    assert load.calls == 1
+    assert cache.stats.errors == 2
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+
+from src.domain.entities.users import Credentials, Profile
+from src.infra.cache.lru import LRUCache
+from src.infra.cache.tokens import ProfileTokenCache
+from src.settings.config import settings
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_eviction() -> None:
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+
+    cache.set("first", 1)
+    cache.set("second", 2)
+    assert cache.get("first") == 1
+
+    cache.set("third", 3)
+
+    assert cache.get("second") is None
+    assert cache.get("first") == 1
+    assert cache.get("third") == 3
+    assert cache.stats.evictions == 1
+    assert cache.stats.hits == 3
+    assert cache.stats.misses == 1
+
+
+def test_lru_expiration() -> None:
+    clock = FakeClock()
+    cache: LRUCache[str, int] = LRUCache(max_size=10, ttl=5, clock=clock)
+
+    cache.set("default_ttl", 1)
+    cache.set("short_ttl", 2, ttl=1)
+    cache.set("expired", 3, ttl=0)
+
+    clock.now = 2
+    assert cache.get("short_ttl") is None
+    assert cache.get("default_ttl") == 1
+    assert cache.get("expired") is None
+
+    clock.now = 5
+    assert cache.get("default_ttl") is None
+    assert cache.stats.expirations == 2
+    assert len(cache) == 0
+
+
+def test_profile_token_cache() -> None:
+    cache = ProfileTokenCache(settings())
+    profile = Profile.create(
+        display_name="display_name",
+        avatar="avatar.jpg",
+        credentials=Credentials.create("username", "valid_email@gmail.com", "some_password"),
+    )
+
+    cache.set("valid_token", profile, expires_at=datetime.now(timezone.utc) + timedelta(minutes=5))
+    cache.set("expired_token", profile, expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+
+    assert cache.get("valid_token") is profile
+    assert cache.get("expired_token") is None
+    assert cache.get("unknown_token") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
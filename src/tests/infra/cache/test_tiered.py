@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+
+from datetime import timedelta
+from typing import Optional
+from uuid import uuid4
+
+from src.infra.cache.tiered import TieredCache
+from src.infra.dto.users import ProfileDTO
+from src.infra.services.redis import BaseRedisService
+from src.tests.infra.cache.redis import InMemoryRedisService
+
+
+pytest_plugin = ("pytest_asyncio")
+
+
+def make_cache(redis_service: BaseRedisService, early_refresh_beta: float = 0.0) -> TieredCache[ProfileDTO]:
+    return TieredCache(
+        namespace="test",
+        value_type=ProfileDTO,
+        redis_service=redis_service,
+        max_size=100,
+        ttl=timedelta(minutes=5),
+        local_ttl=timedelta(minutes=1),
+        early_refresh_beta=early_refresh_beta,
+    )
+
+
+class Loader:
+    def __init__(self, value: Optional[ProfileDTO], delay: float = 0.0) -> None:
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> Optional[ProfileDTO]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+def make_profile() -> ProfileDTO:
+    return ProfileDTO(
+        oid=uuid4(),
+        display_name="display_name",
+        avatar=None,
+        credentials_oid=uuid4(),
+        username="username",
+        email="valid_email@gmail.com",
+    )
+
+
+@pytest.mark.asyncio
+async def test_tiers() -> None:
+    redis_service = InMemoryRedisService()
+    node, other_node = make_cache(redis_service), make_cache(redis_service)
+    profile = make_profile()
+    load = Loader(profile)
+
+    assert await node.get_or_load("key", load) == profile
+    assert await node.get_or_load("key", load) == profile
+    assert await other_node.get_or_load("key", load) == profile
+
+    assert load.calls == 1
+    assert node.stats.local.hits == 1
+    assert other_node.stats.remote_hits == 1
+    assert other_node.stats.hit_ratio == 1.0
+
+
+@pytest.mark.asyncio
+async def test_missing_values_are_not_cached() -> None:
+    cache = make_cache(InMemoryRedisService())
+    load = Loader(None)
+
+    assert await cache.get_or_load("key", load) is None
+    assert await cache.get_or_load("key", load) is None
+    assert load.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_load_once() -> None:
+    cache = make_cache(InMemoryRedisService())
+    profile = make_profile()
+    load = Loader(profile, delay=0.01)
+
+    results = await asyncio.gather(*(cache.get_or_load("key", load) for _ in range(10)))
+
+    assert results == [profile] * 10
+    assert load.calls == 1
+    assert cache.stats.collapsed == 9
+
+
+@pytest.mark.asyncio
+async def test_cancelled_load_is_started_over_by_waiters() -> None:
+    cache = make_cache(InMemoryRedisService())
+    profile = make_profile()
+    load = Loader(profile, delay=0.01)
+
+    leader = asyncio.create_task(cache.get_or_load("key", load))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_load("key", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == profile
+    assert load.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_early_refresh() -> None:
+    redis_service = InMemoryRedisService()
+    load = Loader(make_profile(), delay=0.01)
+    await make_cache(redis_service).get_or_load("key", load)
+
+    # NOTE: beta this large makes any entry due for refresh
+    eager_node = make_cache(redis_service, early_refresh_beta=1e9)
+    await eager_node.get_or_load("key", load)
+
+    assert load.calls == 2
+    assert eager_node.stats.early_refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_nodes() -> None:
+    redis_service = InMemoryRedisService()
+    node, other_node = make_cache(redis_service), make_cache(redis_service)
+    listener = asyncio.create_task(other_node.listen_for_invalidations())
+    await asyncio.sleep(0)
+    load = Loader(make_profile())
+
+    await node.get_or_load("key", load)
+    await other_node.get_or_load("key", load)
+    await node.invalidate("key")
+    await asyncio.sleep(0)
+    await other_node.get_or_load("key", load)
+
+    listener.cancel()
+    assert load.calls == 2
+    assert other_node.stats.remote_misses == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_loading() -> None:
+    redis_service = InMemoryRedisService()
+    redis_service.available = False
+    cache = make_cache(redis_service)
+    profile = make_profile()
+
+    assert await cache.get_or_load("key", Loader(profile)) == profile
+    assert cache.stats.remote_errors == 2
@@ -0,0 +1,114 @@
+import pytest
+import pytest_asyncio
+
+from dataclasses import dataclass
+from typing import AsyncIterator
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.infra.database import DatabaseManager
+from src.settings.config import Settings, settings
+
+
+pytest_plugin = ("pytest_asyncio")
+
+
+@dataclass(frozen=True)
+class Seed:
+    """Seeded rows in the order of their numbers, credentials of a profile are named `seed_<profile oid>`."""
+    profile_ids: list[UUID]
+    channel_ids: list[UUID]
+
+
+async def seed(
+    executor: AsyncConnection | AsyncSession,
+    profiles: int,
+    channels: int,
+    members: int,
+) -> Seed:
+    """
+    Add `profiles` profiles and `channels` channels of `members` members each, in the current transaction.
+    Members of a channel are distinct, with `members` equal to `profiles` every profile is a member of every channel.
+    Every tenth channel is deleted, every tenth membership is disconnected and every hundredth channel is hot,
+    its member count spread over shard rows.
+    """
+    await executor.execute(text(
+        """
+        CREATE TEMPORARY TABLE seed_profiles ON COMMIT DROP AS
+        SELECT gen_random_uuid() AS oid, gen_random_uuid() AS credentials_id, number
+        FROM generate_series(1, :profiles) AS number
+        """
+    ), {"profiles": profiles})
+    await executor.execute(text(
+        """
+        INSERT INTO credentials (oid, username, email, password)
+        SELECT credentials_id, 'seed_' || oid, 'seed_' || oid || '@test.com', 'hash' FROM seed_profiles
+        """
+    ))
+    await executor.execute(text(
+        """
+        INSERT INTO profiles (oid, display_name, avatar, credentials_id)
+        SELECT oid, 'seed', 'avatar', credentials_id FROM seed_profiles
+        """
+    ))
+    await executor.execute(text(
+        """
+        CREATE TEMPORARY TABLE seed_channels ON COMMIT DROP AS
+        SELECT gen_random_uuid() AS oid, number FROM generate_series(1, :channels) AS number
+        """
+    ), {"channels": channels})
+    await executor.execute(text(
+        """
+        INSERT INTO channels (oid, name, is_deleted)
+        SELECT oid, 'seed', number % 10 = 0 FROM seed_channels
+        """
+    ))
+    # NOTE: the step is a prime, coprime with the number of profiles, so members of a channel are distinct
+    await executor.execute(text(
+        """
+        INSERT INTO channel_members (oid, profile_id, channel_id, is_connected)
+        SELECT gen_random_uuid(), seed_profiles.oid, seed_channels.oid, member % 10 <> 9
+        FROM seed_channels
+        CROSS JOIN generate_series(0, :members - 1) AS member
+        JOIN seed_profiles ON seed_profiles.number = (seed_channels.number * 7919 + member * 4729) % :profiles + 1
+        """
+    ), {"members": members, "profiles": profiles})
+    await executor.execute(text(
+        """
+        INSERT INTO channel_member_count_shards (oid, channel_id, shard, delta)
+        SELECT gen_random_uuid(), seed_channels.oid, shard, 1
+        FROM seed_channels
+        CROSS JOIN generate_series(0, 15) AS shard
+        WHERE seed_channels.number % 100 = 0
+        """
+    ))
+
+    profile_ids = await executor.scalars(text("SELECT oid FROM seed_profiles ORDER BY number"))
+    channel_ids = await executor.scalars(text("SELECT oid FROM seed_channels ORDER BY number"))
+    return Seed(profile_ids=list(profile_ids), channel_ids=list(channel_ids))
+
+
+@pytest.fixture
+def database_config() -> Settings:
+    """Settings of the `database` fixture, overridden by modules that test other modes."""
+    return settings()
+
+
+@pytest_asyncio.fixture
+async def database(database_config: Settings) -> AsyncIterator[DatabaseManager]:
+    """Manager of the configured database, tests using it are skipped when Postgres is not reachable."""
+    database = DatabaseManager(database_config)
+    try:
+        async with database.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except (OSError, SQLAlchemyError):
+        await database.engine.dispose()
+        pytest.skip("Postgres is not reachable")
+
+    try:
+        yield database
+    finally:
+        await database.engine.dispose()
@@ -0,0 +1,22 @@
+import pytest
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from src.infra.exceptions.filters import InvalidCursorException
+from src.infra.filters.channels import ChannelsCursor
+
+
+def test_cursor_round_trip() -> None:
+    cursor = ChannelsCursor(created_at=datetime.now(timezone.utc), oid=uuid4())
+
+    encoded = cursor.encode()
+
+    assert "=" not in encoded
+    assert ChannelsCursor.decode(encoded) == cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "garbage", "W10", "WyJ4IiwieSJd"])
+def test_cursor_decode_invalid(cursor: str) -> None:
+    with pytest.raises(InvalidCursorException):
+        ChannelsCursor.decode(cursor)
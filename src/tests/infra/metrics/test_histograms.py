@@ -0,0 +1,25 @@
+import random
+
+from src.infra.metrics.histograms import LatencyHistogram
+
+
+def test_quantiles_keep_relative_precision() -> None:
+    histogram = LatencyHistogram()
+    durations = sorted(random.Random(0).lognormvariate(-6, 1.5) for _ in range(10_000))
+    for duration in durations:
+        histogram.record(duration)
+
+    for quantile in (0.5, 0.9, 0.99):
+        expected = durations[int(quantile * len(durations)) - 1]
+        assert abs(histogram.quantile(quantile) - expected) / expected < 0.05
+
+    assert histogram.count == len(durations)
+    assert histogram.quantile(1.0) == durations[-1]
+
+
+def test_empty_and_small_values() -> None:
+    histogram = LatencyHistogram()
+    assert histogram.quantile(0.99) == 0.0
+
+    histogram.record(0.000005)
+    assert histogram.quantile(0.5) == 0.000005
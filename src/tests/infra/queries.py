@@ -0,0 +1,17 @@
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from src.infra.metrics.queries import QueryCount, count_queries
+
+
+@contextmanager
+def assert_max_queries(statements: int, rows: Optional[int] = None) -> Iterator[QueryCount]:
+    """Fail if the block sends more than `statements` statements to the database or they touch more than `rows` rows."""
+    with count_queries(keep_statements=True) as queries:
+        yield queries
+
+    executed = "\n".join(queries.executed)
+    assert queries.statements <= statements, (
+        f"{queries.statements} statements executed, at most {statements} expected:\n{executed}"
+    )
+    assert rows is None or queries.rows <= rows, f"{queries.rows} rows touched, at most {rows} expected:\n{executed}"
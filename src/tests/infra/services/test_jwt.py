@@ -41,3 +41,15 @@ def test_decode_jwt_token(jwt_service) -> None:
 	assert profile_id_from_token is not None
 	assert isinstance(profile_id_from_token, str)
 	assert profile_id_from_token == profile_id
+
+
+def test_decode_jwt_claims(jwt_service) -> None:
+	profile_id = str(uuid4())
+	auth_data = jwt_service.generate_auth_tokens(profile_id)
+	claims = jwt_service.decode_jwt_claims(auth_data.access_token)
+
+	assert claims is not None
+	assert claims[0] == profile_id
+	assert claims[1] == auth_data.access_expires.replace(microsecond=0)
+
+	assert jwt_service.decode_jwt_claims("invalid_token") is None
@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+
+from typing import Iterator
+
+from src.domain.exceptions.users import PasswordTooShortException
+from src.domain.values.users import Password
+from src.infra.exceptions.services import PasswordServiceOverloadedException
+from src.infra.services.passwords import BasePasswordService, PasswordService
+from src.settings.config import Settings, settings
+
+
+pytest_plugin = ("pytest_asyncio")
+
+
+@pytest.fixture
+def password_service() -> Iterator[BasePasswordService]:
+	config = settings()
+	password_service = PasswordService(config)
+	yield password_service
+	password_service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_password(password_service) -> None:
+	raw_password = "some_valid_password"
+	password = await password_service.hash_password(raw_password)
+
+	assert isinstance(password, Password)
+	assert password.as_generic_type() != raw_password
+	assert await password_service.check_password(raw_password, password.as_generic_type()) is True
+	assert await password_service.check_password("incorrect_password", password.as_generic_type()) is False
+
+
+@pytest.mark.asyncio
+async def test_hash_invalid_password(password_service) -> None:
+	with pytest.raises(PasswordTooShortException):
+		await password_service.hash_password("123")
+
+
+@pytest.mark.asyncio
+async def test_reject_when_overloaded() -> None:
+	password_service = PasswordService(Settings(PASSWORD_HASHER_WORKERS=1, PASSWORD_HASHER_MAX_PENDING=1))
+
+	in_progress = asyncio.ensure_future(password_service.hash_password("some_valid_password"))
+	await asyncio.sleep(0)
+
+	with pytest.raises(PasswordServiceOverloadedException):
+		await password_service.hash_password("other_valid_password")
+
+	assert isinstance(await in_progress, Password)
+	password_service.shutdown()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("executor", ["thread", "process"])
+async def test_shutdown_stops_workers(executor: str) -> None:
+	password_service = PasswordService(Settings(PASSWORD_HASHER_EXECUTOR=executor, PASSWORD_HASHER_WORKERS=1))
+	assert await password_service.check_password("some_valid_password", Password.hash_password("other_password")) is False
+
+	password_service.shutdown()
+
+	with pytest.raises(RuntimeError):
+		await password_service.hash_password("some_valid_password")
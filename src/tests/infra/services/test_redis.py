@@ -72,3 +72,33 @@ async def test_pop_value(redis_service) -> None:
 
 	result = await redis_service.pop(key=test_data.get("key"))
 	assert result is None
+
+
+@pytest.mark.asyncio
+async def test_rotate_value(redis_service) -> None:
+	test_data = {"key": "test_key", "new_key": "test_new_key", "value": "test_value", "ttl": timedelta(minutes=2)}
+
+	await redis_service.set(
+		key=test_data.get("key"),
+		value=test_data.get("value"),
+		ttl=test_data.get("ttl"),
+	)
+
+	result = await redis_service.rotate(
+		key=test_data.get("key"),
+		new_key=test_data.get("new_key"),
+		ttl=test_data.get("ttl"),
+	)
+	assert result == test_data.get("value")
+	assert await redis_service.get(test_data.get("key")) is None
+	assert await redis_service.get(test_data.get("new_key")) == test_data.get("value")
+
+	result = await redis_service.rotate(
+		key=test_data.get("key"),
+		new_key="test_other_key",
+		ttl=test_data.get("ttl"),
+	)
+	assert result is None
+	assert await redis_service.get("test_other_key") is None
+
+	await redis_service.delete(test_data.get("new_key"))
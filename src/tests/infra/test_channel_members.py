@@ -0,0 +1,298 @@
+import asyncio
+import importlib.util
+import pytest
+import pytest_asyncio
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import ModuleType
+from typing import AsyncIterator
+from uuid import UUID, uuid4
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import Connection, func, select, text
+
+from src.domain.entities.channels import Channel
+from src.infra.cache.channels import ChannelPageCache
+from src.infra.database import DatabaseManager
+from src.infra.models.channels import ChannelMemberCountShardModel, ChannelModel
+from src.infra.repositories.channels import ChannelRepository
+from src.logic.commands.channels import ConnectToChannelCommand, ConnectToChannelCommandHandler
+from src.logic.exceptions.channels import UserAlreadyMemberException
+from src.settings.config import settings
+from src.tests.infra.cache.redis import InMemoryRedisService
+from src.tests.infra.conftest import Seed, seed
+
+
+pytest_plugin = ("pytest_asyncio")
+
+# NOTE: joins and leaves commit, so they run concurrently on their own connections
+CONCURRENT_MEMBERS = 12
+MIGRATIONS = Path(__file__).parents[2] / "infra" / "migrations" / "versions"
+
+
+class Seeder:
+    """Profiles and channels committed for a test, removed with their memberships and shards afterwards."""
+    def __init__(self, database: DatabaseManager) -> None:
+        self.database = database
+        self.channel_ids: list[UUID] = []
+        self.profile_ids: list[UUID] = []
+
+    async def channel(self) -> UUID:
+        channel_id, = (await self.__seed(profiles=0, channels=1)).channel_ids
+        return channel_id
+
+    async def profiles(self, count: int) -> list[UUID]:
+        return (await self.__seed(profiles=count, channels=0)).profile_ids
+
+    async def cleanup(self) -> None:
+        # NOTE: memberships and shards cascade from channels, profiles from credentials
+        async with self.database.session() as session:
+            await session.execute(text("DELETE FROM channels WHERE oid = ANY(:oids)"), {"oids": self.channel_ids})
+            await session.execute(
+                text("DELETE FROM credentials WHERE oid IN (SELECT credentials_id FROM profiles WHERE oid = ANY(:oids))"),
+                {"oids": self.profile_ids},
+            )
+            await session.commit()
+
+    async def __seed(self, profiles: int, channels: int) -> Seed:
+        async with self.database.session() as session:
+            seeded = await seed(session, profiles=profiles, channels=channels, members=0)
+            await session.commit()
+        self.channel_ids += seeded.channel_ids
+        self.profile_ids += seeded.profile_ids
+        return seeded
+
+
+@pytest_asyncio.fixture
+async def seeder(database) -> AsyncIterator[Seeder]:
+    seeder = Seeder(database)
+    try:
+        yield seeder
+    finally:
+        await seeder.cleanup()
+
+
+def make_repository(database: DatabaseManager, shard_threshold: int) -> ChannelRepository:
+    config = settings().model_copy(update={
+        "CHANNEL_MEMBER_COUNT_SHARD_THRESHOLD": shard_threshold,
+        "CHANNEL_MEMBER_COUNT_SHARDS": 4,
+    })
+    return ChannelRepository(database, config)
+
+
+async def assert_member_count(database: DatabaseManager, channel_id: UUID, expected: int) -> None:
+    """Every member count of the channel equals its connected memberships."""
+    async with database.session() as session:
+        connected = await session.scalar(
+            text("SELECT count(*) FROM channel_members WHERE channel_id = :oid AND is_connected"),
+            {"oid": channel_id},
+        )
+        total_member_count = await session.scalar(
+            select(ChannelModel.total_member_count).where(ChannelModel.oid == channel_id),
+        )
+    version = await ChannelRepository(database, settings()).get_channel_version(channel_id=channel_id)
+
+    assert connected == expected
+    assert total_member_count == expected
+    assert version.member_count == expected
+
+
+async def shard_deltas(database: DatabaseManager, channel_id: UUID) -> tuple[int, int]:
+    """:return: member count kept in the channel row and the sum of its shards"""
+    async with database.session() as session:
+        member_count = await session.scalar(select(ChannelModel.member_count).where(ChannelModel.oid == channel_id))
+        sharded = await session.scalar(
+            select(func.coalesce(func.sum(ChannelMemberCountShardModel.delta), 0))
+            .where(ChannelMemberCountShardModel.channel_id == channel_id),
+        )
+    return member_count, sharded
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "shard_threshold, expected_deltas",
+    [
+        (1000, (3, 0)),
+        # NOTE: the channel row counts up to the threshold, later joins and every leave above it go to shards
+        (2, (2, 1)),
+        (0, (0, 3)),
+    ],
+    ids=["below_threshold", "crossing_threshold", "above_threshold"],
+)
+async def test_joins_and_leaves_keep_member_count(database, seeder, shard_threshold, expected_deltas) -> None:
+    repository = make_repository(database, shard_threshold)
+    channel_id = await seeder.channel()
+    profile_ids = await seeder.profiles(5)
+
+    for profile_id in profile_ids:
+        assert await repository.connect_to_channel(channel_id=channel_id, profile_id=profile_id)
+    for profile_id in profile_ids[:2]:
+        assert await repository.disconnect_from_channel(channel_id=channel_id, profile_id=profile_id)
+
+    await assert_member_count(database, channel_id, expected=3)
+    assert await shard_deltas(database, channel_id) == expected_deltas
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("shard_threshold", [1000, 0], ids=["below_threshold", "above_threshold"])
+async def test_repeated_joins_and_leaves_are_counted_once(database, seeder, shard_threshold) -> None:
+    repository = make_repository(database, shard_threshold)
+    channel_id = await seeder.channel()
+    profile_id, = await seeder.profiles(1)
+
+    assert await repository.connect_to_channel(channel_id=channel_id, profile_id=profile_id)
+    assert not await repository.connect_to_channel(channel_id=channel_id, profile_id=profile_id)
+    await assert_member_count(database, channel_id, expected=1)
+
+    assert await repository.disconnect_from_channel(channel_id=channel_id, profile_id=profile_id)
+    assert not await repository.disconnect_from_channel(channel_id=channel_id, profile_id=profile_id)
+    await assert_member_count(database, channel_id, expected=0)
+
+    assert await repository.connect_to_channel(channel_id=channel_id, profile_id=profile_id)
+    await assert_member_count(database, channel_id, expected=1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("shard_threshold", [1000, 4], ids=["below_threshold", "crossing_threshold"])
+async def test_concurrent_joins_and_leaves_keep_member_count(database, seeder, shard_threshold) -> None:
+    repository = make_repository(database, shard_threshold)
+    channel_id = await seeder.channel()
+    profile_ids = await seeder.profiles(CONCURRENT_MEMBERS)
+
+    joined = await asyncio.gather(*(
+        repository.connect_to_channel(channel_id=channel_id, profile_id=profile_id) for profile_id in profile_ids
+    ))
+    assert all(joined)
+    await assert_member_count(database, channel_id, expected=CONCURRENT_MEMBERS)
+
+    left = await asyncio.gather(*(
+        repository.disconnect_from_channel(channel_id=channel_id, profile_id=profile_id)
+        for profile_id in profile_ids[::2]
+    ))
+    assert all(left)
+    await assert_member_count(database, channel_id, expected=CONCURRENT_MEMBERS // 2)
+
+
+async def memberships(database: DatabaseManager, channel_id: UUID) -> list[tuple[UUID, bool]]:
+    async with database.session() as session:
+        result = await session.execute(
+            text("SELECT oid, is_connected FROM channel_members WHERE channel_id = :oid"),
+            {"oid": channel_id},
+        )
+        return [tuple(row) for row in result]
+
+
+@pytest.mark.asyncio
+async def test_join_toggles_a_single_membership(database, seeder) -> None:
+    repository = make_repository(database, 1000)
+    channel_id = await seeder.channel()
+    profile_id, = await seeder.profiles(1)
+
+    assert await repository.connect_to_channel(channel_id=channel_id, profile_id=profile_id)
+    (membership_id, _), = await memberships(database, channel_id)
+
+    assert not await repository.connect_to_channel(channel_id=channel_id, profile_id=profile_id)
+    assert await memberships(database, channel_id) == [(membership_id, True)]
+
+    assert await repository.disconnect_from_channel(channel_id=channel_id, profile_id=profile_id)
+    assert await memberships(database, channel_id) == [(membership_id, False)]
+
+    # NOTE: rejoining reconnects the existing row instead of adding one
+    assert await repository.connect_to_channel(channel_id=channel_id, profile_id=profile_id)
+    assert await memberships(database, channel_id) == [(membership_id, True)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_joins_of_a_profile_make_one_membership(database, seeder) -> None:
+    repository = make_repository(database, 1000)
+    channel_id = await seeder.channel()
+    profile_id, = await seeder.profiles(1)
+
+    joined = await asyncio.gather(*(
+        repository.connect_to_channel(channel_id=channel_id, profile_id=profile_id) for _ in range(2)
+    ))
+
+    assert sorted(joined) == [False, True]
+    assert len(await memberships(database, channel_id)) == 1
+    await assert_member_count(database, channel_id, expected=1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_join_commands_of_a_profile_raise_already_member(database, seeder) -> None:
+    handler = ConnectToChannelCommandHandler(
+        channel_repository=make_repository(database, 1000),
+        page_cache=ChannelPageCache(settings(), InMemoryRedisService()),
+    )
+    channel_id = await seeder.channel()
+    profile_id, = await seeder.profiles(1)
+    command = ConnectToChannelCommand(channel_id=channel_id, profile_id=profile_id)
+
+    results = await asyncio.gather(handler.handle(command), handler.handle(command), return_exceptions=True)
+
+    assert sorted(type(result).__name__ for result in results) == [
+        Channel.__name__, UserAlreadyMemberException.__name__,
+    ]
+    assert len(await memberships(database, channel_id)) == 1
+    await assert_member_count(database, channel_id, expected=1)
+
+
+def load_migration(revision: str) -> ModuleType:
+    path, = MIGRATIONS.glob(f"{revision}_*.py")
+    spec = importlib.util.spec_from_file_location(f"migration_{revision}", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def upgrade(connection: Connection, migration: ModuleType) -> None:
+    with Operations.context(MigrationContext.configure(connection)):
+        migration.upgrade()
+
+
+@pytest.mark.asyncio
+async def test_unique_membership_migration_keeps_connected_then_oldest_row(database, seeder) -> None:
+    channel_id = await seeder.channel()
+    first, second, third = await seeder.profiles(3)
+    now = datetime.now(timezone.utc)
+    # NOTE: duplicated memberships as (profile, is_connected, created_at, kept by the migration)
+    rows = {
+        uuid4(): (first, False, now - timedelta(days=3), False),
+        uuid4(): (first, True, now - timedelta(days=2), True),
+        uuid4(): (first, True, now - timedelta(days=1), False),
+        uuid4(): (second, False, now - timedelta(days=2), True),
+        uuid4(): (second, False, now - timedelta(days=1), False),
+        uuid4(): (third, True, now, True),
+    }
+
+    async with database.engine.connect() as connection:
+        # NOTE: never committed, the constraint comes back with the rollback
+        await connection.execute(text(
+            "ALTER TABLE channel_members DROP CONSTRAINT uq_channel_members_channel_id_profile_id"
+        ))
+        for oid, (profile_id, is_connected, created_at, _) in rows.items():
+            await connection.execute(
+                text(
+                    """
+                    INSERT INTO channel_members (oid, profile_id, channel_id, is_connected, created_at)
+                    VALUES (:oid, :profile_id, :channel_id, :is_connected, :created_at)
+                    """
+                ),
+                {
+                    "oid": oid,
+                    "profile_id": profile_id,
+                    "channel_id": channel_id,
+                    "is_connected": is_connected,
+                    "created_at": created_at,
+                },
+            )
+        await connection.run_sync(upgrade, load_migration("3c1e8f2a9b47"))
+        kept = await connection.scalars(
+            text("SELECT oid FROM channel_members WHERE channel_id = :oid"),
+            {"oid": channel_id},
+        )
+        kept = set(kept)
+        await connection.rollback()
+
+    assert kept == {oid for oid, (*_, is_kept) in rows.items() if is_kept}
@@ -0,0 +1,57 @@
+import asyncio
+import pytest
+
+from src.infra.database import DatabaseManager
+from src.infra.repositories.users import UserUoW
+from src.settings.config import settings
+
+
+pytest_plugin = ("pytest_asyncio")
+
+
+@pytest.fixture
+def database() -> DatabaseManager:
+	return DatabaseManager(settings())
+
+
+@pytest.mark.asyncio
+async def test_session_per_operation(database) -> None:
+	async with database.session() as first, database.session() as second:
+		assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_shares_session(database) -> None:
+	async with UserUoW(database):
+		async with database.session() as first, database.session() as second:
+			assert first is second is database.current()
+
+	with pytest.raises(RuntimeError):
+		database.current()
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_per_task(database) -> None:
+	uow = UserUoW(database)
+	sessions = []
+
+	async def request() -> None:
+		async with uow:
+			session = database.current()
+			sessions.append(session)
+			await asyncio.sleep(0)
+			assert database.current() is session
+
+	await asyncio.gather(request(), request())
+
+	assert len(sessions) == 2
+	assert sessions[0] is not sessions[1]
+
+
+def test_pool_stats(database) -> None:
+	config = settings()
+	stats = database.get_pool_stats()
+
+	assert stats.size == config.DB_POOL_SIZE
+	assert stats.checked_out == 0
+	assert stats.checkouts == 0
@@ -0,0 +1,124 @@
+import pytest
+import pytest_asyncio
+
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from src.infra.database import DatabaseManager
+from src.infra.filters.channels import GetAllChannelsInfraFilters, GetChannelMembersInfraFilters
+from src.infra.models.users import CredentialsModel
+from src.infra.repositories.channels import ChannelRepository
+from src.infra.repositories.users import CredentialsRepository, ProfileRepository
+from src.settings.config import Settings, settings
+from src.tests.infra.conftest import seed
+from src.tests.infra.queries import assert_max_queries
+
+
+pytest_plugin = ("pytest_asyncio")
+
+CHANNELS = 3
+MEMBERS = 4
+
+
+@dataclass(frozen=True)
+class Subject:
+    profile_id: UUID
+    username: str
+    channel_id: UUID
+
+
+@dataclass(frozen=True)
+class Budget:
+    statements: int
+    rows: int
+
+
+# Statements and rows each hot read may take for the seeded data, an N+1 pattern exceeds them
+QUERY_BUDGETS: dict[str, tuple[Callable[[DatabaseManager, Subject], Awaitable], Budget]] = {
+    "channels_page": (
+        lambda database, subject: ChannelRepository(database, settings()).get_all_channels(
+            filters=GetAllChannelsInfraFilters(), profile_id=subject.profile_id,
+        ),
+        Budget(statements=1, rows=CHANNELS),
+    ),
+    "channels_page_without_count": (
+        lambda database, subject: ChannelRepository(database, settings()).get_all_channels(
+            filters=GetAllChannelsInfraFilters(with_count=False), profile_id=subject.profile_id,
+        ),
+        Budget(statements=1, rows=CHANNELS),
+    ),
+    "channel_by_id": (
+        lambda database, subject: ChannelRepository(database, settings()).get_channel_by_id(
+            channel_id=subject.channel_id, profile_id=subject.profile_id,
+        ),
+        Budget(statements=1, rows=1),
+    ),
+    "channel_version": (
+        lambda database, subject: ChannelRepository(database, settings()).get_channel_version(
+            channel_id=subject.channel_id, profile_id=subject.profile_id,
+        ),
+        Budget(statements=1, rows=1),
+    ),
+    "members_page": (
+        lambda database, subject: ChannelRepository(database, settings()).get_members_by_channel_id(
+            channel_id=subject.channel_id, filters=GetChannelMembersInfraFilters(),
+        ),
+        Budget(statements=1, rows=MEMBERS),
+    ),
+    "credentials_by_username": (
+        lambda database, subject: CredentialsRepository(database).find_by_username(username=subject.username),
+        Budget(statements=1, rows=1),
+    ),
+    "profile_by_id": (
+        lambda database, subject: ProfileRepository(database).find_by_id(profile_id=subject.profile_id),
+        Budget(statements=1, rows=1),
+    ),
+}
+
+
+async def seed_subject(database: DatabaseManager) -> Subject:
+    """Add a profile member of `CHANNELS` channels of `MEMBERS` members each, in the current unit of work."""
+    seeded = await seed(database.current(), profiles=MEMBERS, channels=CHANNELS, members=MEMBERS)
+    profile_id = seeded.profile_ids[0]
+    return Subject(profile_id=profile_id, username=f"seed_{profile_id}", channel_id=seeded.channel_ids[0])
+
+
+@pytest.fixture
+def database_config() -> Settings:
+    return settings().model_copy(update={"DB_RAISELOAD": True})
+
+
+@pytest_asyncio.fixture
+async def database(database: DatabaseManager) -> AsyncIterator[DatabaseManager]:
+    # NOTE: repositories reuse the session of the unit of work, so they read the seed that is never committed
+    session = database.begin()
+    try:
+        yield database
+    finally:
+        await session.rollback()
+        await database.end()
+
+
+@pytest.mark.asyncio
+async def test_query_budgets(database) -> None:
+    subject = await seed_subject(database)
+
+    for name, (query, budget) in QUERY_BUDGETS.items():
+        with assert_max_queries(statements=budget.statements, rows=budget.rows) as queries:
+            await query(database, subject)
+        assert queries.statements, name
+
+
+@pytest.mark.asyncio
+async def test_lazy_loads_raise_in_raiseload_mode(database) -> None:
+    subject = await seed_subject(database)
+
+    async with database.session() as session:
+        credentials = await session.scalar(select(CredentialsModel).where(CredentialsModel.username == subject.username))
+
+    with pytest.raises(InvalidRequestError):
+        credentials.profile
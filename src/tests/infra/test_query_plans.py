@@ -0,0 +1,121 @@
+import json
+import pytest
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator
+from uuid import uuid4
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.infra.database import DatabaseManager
+from src.infra.filters.channels import ChannelsCursor, GetAllChannelsInfraFilters, GetChannelMembersInfraFilters
+from src.infra.repositories.channels import ChannelRepository
+from src.infra.repositories.users import CredentialsRepository, ProfileRepository
+from src.settings.config import settings
+from src.tests.infra.conftest import seed
+
+
+pytest_plugin = ("pytest_asyncio")
+
+CURSOR = ChannelsCursor(created_at=datetime.now(timezone.utc), oid=uuid4())
+
+
+async def _consume(iterator: AsyncIterator) -> None:
+	async for _ in iterator:
+		...
+
+
+# Queries issued on every request, each must be answered through indexes
+HOT_QUERIES: dict[str, Callable[[DatabaseManager], Awaitable]] = {
+	"channels_page": lambda database: ChannelRepository(database, settings()).get_all_channels(
+		filters=GetAllChannelsInfraFilters(), profile_id=uuid4(),
+	),
+	"channels_page_by_cursor": lambda database: ChannelRepository(database, settings()).get_all_channels(
+		filters=GetAllChannelsInfraFilters(cursor=CURSOR), profile_id=uuid4(),
+	),
+	"channels_page_without_count": lambda database: ChannelRepository(database, settings()).get_all_channels(
+		filters=GetAllChannelsInfraFilters(with_count=False), profile_id=uuid4(),
+	),
+	"channel_by_id": lambda database: ChannelRepository(database, settings()).get_channel_by_id(
+		channel_id=uuid4(), profile_id=uuid4(),
+	),
+	"channel_access": lambda database: ChannelRepository(database, settings()).get_channel_access(
+		channel_id=uuid4(), profile_id=uuid4(),
+	),
+	"channel_version": lambda database: ChannelRepository(database, settings()).get_channel_version(
+		channel_id=uuid4(), profile_id=uuid4(),
+	),
+	"members_page": lambda database: ChannelRepository(database, settings()).get_members_by_channel_id(
+		channel_id=uuid4(), filters=GetChannelMembersInfraFilters(),
+	),
+	"members_page_by_cursor": lambda database: ChannelRepository(database, settings()).get_members_by_channel_id(
+		channel_id=uuid4(), filters=GetChannelMembersInfraFilters(cursor=CURSOR),
+	),
+	"members_stream": lambda database: _consume(
+		ChannelRepository(database, settings()).stream_members_by_channel_id(channel_id=uuid4()),
+	),
+	"disconnect_from_channel": lambda database: ChannelRepository(database, settings()).disconnect_from_channel(
+		channel_id=uuid4(), profile_id=uuid4(),
+	),
+	"credentials_by_email": lambda database: CredentialsRepository(database).find_by_email(email="plan@test.com"),
+	"credentials_by_username": lambda database: CredentialsRepository(database).find_by_username(username="plan"),
+	"user_exists": lambda database: CredentialsRepository(database).check_user_exists(
+		email="plan@test.com", username="plan",
+	),
+	"profile_by_id": lambda database: ProfileRepository(database).find_by_id(profile_id=uuid4()),
+}
+
+
+@contextmanager
+def capture_statements(engine: AsyncEngine) -> Iterator[list[tuple[str, Any]]]:
+	"""Collect SQL and parameters sent to the database while the block runs."""
+	statements = []
+
+	def before_cursor_execute(connection, cursor, statement, parameters, context, executemany) -> None:
+		statements.append((statement, parameters))
+
+	event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+	try:
+		yield statements
+	finally:
+		event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def plan_nodes(plan: dict) -> Iterator[dict]:
+	yield plan
+	for subplan in plan.get("Plans", ()):
+		yield from plan_nodes(subplan)
+
+
+@pytest.mark.asyncio
+async def test_hot_queries_use_indexes(database) -> None:
+	statements = {}
+	for name, query in HOT_QUERIES.items():
+		with capture_statements(database.engine) as statements[name]:
+			await query(database)
+		assert statements[name], name
+
+	scans = []
+	async with database.engine.connect() as connection:
+		transaction = await connection.begin()
+		try:
+			await seed(connection, profiles=10000, channels=5000, members=10)
+			# NOTE: plans are chosen as for a populated database
+			await connection.execute(text(
+				"ANALYZE credentials, profiles, channels, channel_members, channel_member_count_shards"
+			))
+			for name, captured in statements.items():
+				for statement, parameters in captured:
+					result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+					explained = result.scalar()
+					plan = (json.loads(explained) if isinstance(explained, str) else explained)[0]["Plan"]
+					scans.extend(
+						f"{name}: {node['Relation Name']}"
+						for node in plan_nodes(plan) if node["Node Type"] == "Seq Scan"
+					)
+		finally:
+			await transaction.rollback()
+
+	assert not scans, f"Sequential scans: {scans}"
@@ -0,0 +1,110 @@
+import json
+import logging
+import pytest
+import pytest_asyncio
+
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import UUID, uuid4
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.infra.database import DatabaseManager
+from src.infra.metrics import slow_queries
+from src.infra.metrics.queries import count_queries
+from src.infra.metrics.slow_queries import SLOW_STATEMENT_STARTED_AT, normalize_sql, parameter_shapes
+from src.infra.metrics.timing import request_timings
+from src.infra.repositories.channels import ChannelRepository
+from src.settings.config import Settings, settings
+
+
+pytest_plugin = ("pytest_asyncio")
+
+
+def test_normalize_sql() -> None:
+    assert normalize_sql(
+        """
+        SELECT channels.oid FROM channels
+        WHERE channels.oid IN ($1::UUID, $2::UUID, $3::UUID) AND channels.name = 'it''s' LIMIT 10
+        """
+    ) == "SELECT channels.oid FROM channels WHERE channels.oid IN (?, ...) AND channels.name = ? LIMIT ?"
+    assert normalize_sql("SELECT $1::UUID, t2.c1 FROM t2") == "SELECT ?::UUID, t2.c1 FROM t2"
+
+
+def test_parameter_shapes() -> None:
+    assert parameter_shapes((uuid4(), 10, "name", None), executemany=False) == ["UUID", "int", "str[4]", "NoneType"]
+    assert parameter_shapes([(1,), (2,)], executemany=True) == {"rows": 2, "first": ["int"]}
+
+
+@pytest.fixture
+def database_config(tmp_path: Path) -> Settings:
+    return settings().model_copy(update={
+        "SLOW_QUERY_THRESHOLD_MS": 0.0,
+        "SLOW_QUERY_EXPLAIN_SAMPLE_RATE": 1.0,
+        "SLOW_QUERY_LOG_PATH": str(tmp_path / "slow_queries.log"),
+    })
+
+
+@pytest_asyncio.fixture
+async def database(database: DatabaseManager, database_config: Settings) -> AsyncIterator[DatabaseManager]:
+    yield database
+    logger = logging.getLogger("communet.slow_queries")
+    for handler in list(logger.handlers):
+        if getattr(handler, "baseFilename", None) == database_config.SLOW_QUERY_LOG_PATH:
+            logger.removeHandler(handler)
+            handler.close()
+
+
+def read_log(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged(database, tmp_path: Path) -> None:
+    repository = ChannelRepository(database, settings())
+    await repository.get_channel_by_id(channel_id=uuid4(), profile_id=uuid4())
+    await repository.disconnect_from_channel(channel_id=uuid4(), profile_id=uuid4())
+
+    read, write = read_log(tmp_path / "slow_queries.log")[-2:]
+
+    assert read["caller"] == "ChannelRepository.get_channel_by_id"
+    assert "$1" not in read["sql"] and "?" in read["sql"]
+    assert read["parameters"][-2:] == [UUID.__name__, UUID.__name__]
+    assert any("Buffers" in line or "Execution Time" in line for line in read["plan"])
+
+    assert write["caller"] == "ChannelRepository.disconnect_from_channel"
+    assert "plan" not in write
+
+
+@pytest.mark.asyncio
+async def test_explained_statements_are_not_counted(database, tmp_path: Path) -> None:
+    repository = ChannelRepository(database, settings())
+
+    with request_timings() as timings, count_queries(keep_statements=True) as queries:
+        await repository.get_channel_by_id(channel_id=uuid4(), profile_id=uuid4())
+
+    assert "plan" in read_log(tmp_path / "slow_queries.log")[-1]
+    assert queries.statements == 1, queries.executed
+    assert timings.phases["db"].count == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_are_not_left_started(database) -> None:
+    async with database.engine.connect() as connection:
+        with pytest.raises(SQLAlchemyError):
+            await connection.execute(text("SELECT missing_column FROM channels"))
+        await connection.rollback()
+
+        raw_connection = await connection.get_raw_connection()
+        assert not raw_connection.info[SLOW_STATEMENT_STARTED_AT]
+
+
+
+def test_callers_are_found_without_greenlet(monkeypatch) -> None:
+    monkeypatch.setattr(slow_queries, "greenlet", None)
+    # NOTE: a function of a repository module, the only callers reported
+    repository = {"__name__": "src.infra.repositories.fake", "find_caller": slow_queries.find_caller}
+    exec("def get_channel():\n    return find_caller()", repository)
+
+    assert repository["get_channel"]() == "get_channel"
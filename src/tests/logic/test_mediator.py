@@ -0,0 +1,233 @@
+import asyncio
+import pytest
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from src.logic.commands.base import BaseCommand, CommandHandler
+from src.logic.exceptions.mediator import (
+    CommandHandlersNotRegisteredException,
+    CommandHandlerTimeoutException,
+    MediatorFrozenException,
+)
+from src.logic.init.container import init_mediator
+from src.logic.init.mediator import CommandExecution, CommandPolicy, Mediator
+from src.logic.middlewares.base import MediatorMiddleware
+from src.logic.queries.base import BaseQuery, QueryHandler
+
+
+pytest_plugin = ("pytest_asyncio")
+
+
+@dataclass(frozen=True)
+class EchoCommand(BaseCommand):
+    value: int
+
+
+@dataclass(frozen=True)
+class EchoCommandHandler(CommandHandler[EchoCommand, int]):
+    offset: int = 0
+
+    async def handle(self, command: EchoCommand) -> int:
+        return command.value + self.offset
+
+
+@dataclass(frozen=True)
+class SleepCommandHandler(CommandHandler[EchoCommand, int]):
+    delay: float
+    finished: list[int] = field(default_factory=list)
+
+    async def handle(self, command: EchoCommand) -> int:
+        await asyncio.sleep(self.delay)
+        if command.value < 0:
+            raise ValueError(command.value)
+        self.finished.append(command.value)
+        return command.value
+
+
+def make_sleep_mediator(policy: CommandPolicy, *delays: float) -> tuple[Mediator, list[int]]:
+    finished = []
+    mediator = Mediator()
+    mediator.register_command(
+        command=EchoCommand,
+        command_handlers=[SleepCommandHandler(delay=delay, finished=finished) for delay in delays],
+        policy=policy,
+    )
+    return mediator.freeze(), finished
+
+
+@dataclass(frozen=True)
+class EchoQuery(BaseQuery):
+    value: int
+
+
+@dataclass(frozen=True)
+class EchoQueryHandler(QueryHandler[EchoQuery, int]):
+    async def handle(self, query: EchoQuery) -> int:
+        return query.value
+
+
+@dataclass(frozen=True)
+class SlowEchoQueryHandler(QueryHandler[EchoQuery, list[int]]):
+    calls: list[int] = field(default_factory=list)
+
+    async def handle(self, query: EchoQuery) -> list[int]:
+        self.calls.append(query.value)
+        await asyncio.sleep(0.01)
+        if query.value < 0:
+            raise ValueError(query.value)
+        return [query.value]
+
+
+@dataclass(frozen=True)
+class RecordingMiddleware(MediatorMiddleware):
+    name: str
+    calls: list[str]
+
+    async def __call__(self, request, call_next):
+        self.calls.append(f"{self.name}:{request.__class__.__name__}")
+        return await call_next()
+
+
+@pytest.fixture
+def mediator() -> Mediator:
+    mediator = Mediator()
+    mediator.register_command(command=EchoCommand, command_handlers=[EchoCommandHandler()])
+    mediator.register_command(command=EchoCommand, command_handlers=[EchoCommandHandler(offset=1)])
+    mediator.register_query(query=EchoQuery, query_handler=EchoQueryHandler())
+    return mediator.freeze()
+
+
+@pytest.mark.asyncio
+async def test_handle_command(mediator) -> None:
+    assert await mediator.handle_command(EchoCommand(value=1)) == [1, 2]
+    assert mediator.commands_map[EchoCommand] == (EchoCommandHandler(), EchoCommandHandler(offset=1))
+
+
+@pytest.mark.asyncio
+async def test_handle_query(mediator) -> None:
+    assert await mediator.handle_query(EchoQuery(value=3)) == 3
+
+
+@pytest.mark.asyncio
+async def test_middlewares() -> None:
+    calls = []
+    mediator = Mediator()
+    mediator.add_middleware(RecordingMiddleware(name="outer", calls=calls))
+    mediator.add_middleware(RecordingMiddleware(name="inner", calls=calls))
+    mediator.register_command(command=EchoCommand, command_handlers=[EchoCommandHandler()])
+    mediator.register_query(query=EchoQuery, query_handler=EchoQueryHandler())
+    mediator.freeze()
+
+    assert await mediator.handle_command(EchoCommand(value=1)) == [1]
+    assert await mediator.handle_query(EchoQuery(value=2)) == 2
+    assert calls == ["outer:EchoCommand", "inner:EchoCommand", "outer:EchoQuery", "inner:EchoQuery"]
+
+    with pytest.raises(MediatorFrozenException):
+        mediator.add_middleware(RecordingMiddleware(name="late", calls=calls))
+
+
+@pytest.mark.asyncio
+async def test_unregistered_command(mediator) -> None:
+    @dataclass(frozen=True)
+    class UnknownCommand(BaseCommand):
+        ...
+
+    with pytest.raises(CommandHandlersNotRegisteredException):
+        await mediator.handle_command(UnknownCommand())
+
+
+def test_frozen_mediator(mediator) -> None:
+    with pytest.raises(MediatorFrozenException):
+        mediator.register_query(query=EchoQuery, query_handler=EchoQueryHandler())
+
+    with pytest.raises(TypeError):
+        mediator.commands_map[EchoCommand] = ()
+
+
+def test_mediator_is_built_once() -> None:
+    assert init_mediator() is init_mediator()
+    assert init_mediator().is_frozen
+
+
+@pytest.mark.asyncio
+async def test_concurrent_command_handlers() -> None:
+    mediator, finished = make_sleep_mediator(CommandPolicy(execution=CommandExecution.CONCURRENT), 0.05, 0.05, 0.0)
+    loop = asyncio.get_running_loop()
+
+    started_at = loop.time()
+    assert await mediator.handle_command(EchoCommand(value=1)) == [1, 1, 1]
+    assert loop.time() - started_at < 0.1
+
+    with pytest.raises(ValueError):
+        await mediator.handle_command(EchoCommand(value=-1))
+
+
+@pytest.mark.asyncio
+async def test_command_handler_timeout() -> None:
+    policy = CommandPolicy(execution=CommandExecution.CONCURRENT, timeout=timedelta(milliseconds=10))
+    mediator, finished = make_sleep_mediator(policy, 0.0, 1.0)
+
+    with pytest.raises(CommandHandlerTimeoutException):
+        await mediator.handle_command(EchoCommand(value=1))
+    assert finished == [1]
+
+
+@pytest.mark.asyncio
+async def test_background_command_handlers() -> None:
+    mediator, finished = make_sleep_mediator(CommandPolicy(execution=CommandExecution.BACKGROUND), 0.01, 0.0)
+
+    assert await mediator.handle_command(EchoCommand(value=1)) == []
+    # NOTE: failures don't reach the caller
+    assert await mediator.handle_command(EchoCommand(value=-1)) == []
+    assert finished == []
+
+    await mediator.wait_for_background()
+    assert finished == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_coalesced_queries() -> None:
+    query_handler = SlowEchoQueryHandler()
+    mediator = Mediator()
+    mediator.register_query(query=EchoQuery, query_handler=query_handler, coalesce=True)
+    mediator.freeze()
+
+    results = await asyncio.gather(*(mediator.handle_query(EchoQuery(value=value)) for value in (1, 1, 1, 2)))
+
+    assert results == [[1], [1], [1], [2]]
+    assert results[0] is results[1]
+    assert sorted(query_handler.calls) == [1, 2]
+    assert mediator.coalescing_stats[EchoQuery].calls == 4
+    assert mediator.coalescing_stats[EchoQuery].collapsed == 2
+
+    # NOTE: only concurrent queries are collapsed, results aren't kept
+    await mediator.handle_query(EchoQuery(value=1))
+    assert sorted(query_handler.calls) == [1, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_coalesced_query_errors_reach_every_caller() -> None:
+    query_handler = SlowEchoQueryHandler()
+    mediator = Mediator()
+    mediator.register_query(query=EchoQuery, query_handler=query_handler, coalesce=True)
+
+    results = await asyncio.gather(
+        *(mediator.handle_query(EchoQuery(value=-1)) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert query_handler.calls == [-1]
+
+
+@pytest.mark.asyncio
+async def test_queries_are_not_coalesced_by_default() -> None:
+    query_handler = SlowEchoQueryHandler()
+    mediator = Mediator()
+    mediator.register_query(query=EchoQuery, query_handler=query_handler)
+
+    await asyncio.gather(*(mediator.handle_query(EchoQuery(value=1)) for _ in range(3)))
+
+    assert query_handler.calls == [1, 1, 1]
+    assert mediator.coalescing_stats == {}